@@ -17,8 +17,10 @@ from rich.table import Table
 from rich.text import Text
 from rich.traceback import install
 
-from convergence.ai.text_to_speech import conversation_to_audio
+from convergence.ai.text_to_speech import conversation_to_audio_file
 from convergence.ai.transcript_generator import generate_transcript as generate_transcript_ai
+from convergence.auth.google_sheets import GoogleSheetsClient
+from convergence.auth.key_store import SQLiteKeyStore, sync_key_store
 from convergence.core.generator import ConversationGenerator
 from convergence.core.models import Conversation, ConversationConfig
 from convergence.services.outline import OutlineProcessor
@@ -100,7 +102,13 @@ def show_aesthetic_help():
     options_table.add_row(
         "--generate-transcript", "-gt", "📝 Generate conversation transcript only (JSON output)"
     )
+    options_table.add_row(
+        "--transcript-batch-size", "", "🧱 Dialogue turns per transcript request (default: 1)"
+    )
     options_table.add_row("--env", "-e", "🔐 Path to .env file for API keys")
+    options_table.add_row(
+        "--sync-api-keys", "", "🗃️  Copy API keys from Google Sheets to the local key store"
+    )
     options_table.add_row("--help", "-h", "📖 Show this help message")
 
     help_console.print(options_table)
@@ -125,6 +133,25 @@ def show_aesthetic_help():
     help_console.print("[dim]Made with ❤️  by the Convergence team[/dim]\n")
 
 
+def sync_local_key_store() -> None:
+    """Copy the Google Sheets key table into the local SQLite key store"""
+    console.print("\n🗃️ [bold cyan]SYNCING API KEYS[/bold cyan]")
+
+    source = GoogleSheetsClient()
+    target = SQLiteKeyStore()
+    console.print(f"   Source: Google Sheets {source.sheet_id or '(not configured)'}")
+    console.print(f"   Target: {target.path}")
+
+    synced = sync_key_store(source, target)
+    if synced is None:
+        print_error("Could not read API keys from Google Sheets", "Sync Failed")
+        sys.exit(1)
+
+    print_success(f"Stored {synced} API keys in {target.path}", "🎉 API Keys Synced!")
+    if os.getenv("API_KEY_STORE", "sheets").lower() != "sqlite":
+        print_info("Set API_KEY_STORE=sqlite for the API server to use the local key store")
+
+
 @click.command(context_settings=dict(help_option_names=["-h", "--help"]))
 @click.option(
     "--prompt",
@@ -173,6 +200,16 @@ def show_aesthetic_help():
     is_flag=True,
     help="Generate a conversation transcript and save as JSON (no audio output)",
 )
+@click.option(
+    "--transcript-batch-size",
+    type=click.IntRange(1, 20),
+    help="Dialogue turns requested per chat completion (default: TRANSCRIPT_BATCH_SIZE or 1)",
+)
+@click.option(
+    "--sync-api-keys",
+    is_flag=True,
+    help="Copy API keys from Google Sheets into the local SQLite key store and exit",
+)
 def main(
     prompt: Optional[str],
     duration: int,
@@ -182,6 +219,8 @@ def main(
     outline: Optional[str],
     conversation: Optional[str],
     generate_transcript: bool,
+    transcript_batch_size: Optional[int],
+    sync_api_keys: bool,
 ) -> None:
     """
     🌌 CONVERGENCE - AI-Powered Audio Conversation Generator
@@ -203,6 +242,9 @@ def main(
       # Convert existing conversation to audio
       convergence --conversation saved_transcript.json -o final_podcast.wav
 
+      # Populate the local API key store (API_KEY_STORE=sqlite)
+      convergence --sync-api-keys
+
     For detailed help, run 'convergence' without any arguments.
     """
     # Check if no arguments provided (show help)
@@ -214,6 +256,12 @@ def main(
     print_banner()
 
     try:
+        # Handle API key sync mode
+        if sync_api_keys:
+            load_environment(env)
+            sync_local_key_store()
+            sys.exit(0)
+
         # Validate inputs
         if not prompt and not conversation:
             print_error(
@@ -282,24 +330,21 @@ def main(
             # Ensure output directory exists
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Generate audio using TTS
-            audio_data, error = conversation_to_audio(
-                conversation_obj, conversation_obj.config.openai_api_key or "", "nova"
+            # Generate audio using TTS, streaming each segment to the output file
+            bytes_written, error = conversation_to_audio_file(
+                conversation_obj, output_path, conversation_obj.config.openai_api_key or ""
             )
 
-            if error or not audio_data:
+            if error or not bytes_written:
                 print_error(
                     f"Audio generation failed: {error or 'No audio data returned'}", "TTS Error"
                 )
                 sys.exit(1)
 
-            # Write audio to file
-            output_path.write_bytes(audio_data)
-
             print_success(
                 f"Audio saved to: {output_path.absolute()}", "🎉 Conversation Audio Generated!"
             )
-            console.print(f"   Size: {len(audio_data):,} bytes")
+            console.print(f"   Size: {bytes_written:,} bytes")
 
             sys.exit(0)
 
@@ -317,6 +362,8 @@ def main(
                 outline=None,
                 outline_source=None,
             )
+            if transcript_batch_size:
+                config.transcript_batch_size = transcript_batch_size
 
             console.print(f"   Prompt: {prompt}")
             console.print(f"   Duration: {duration} minutes")
@@ -403,6 +450,8 @@ def main(
             outline_source=outline_source,
             openai_api_key=os.getenv("OPENAI_API_KEY"),
         )
+        if transcript_batch_size:
+            config.transcript_batch_size = transcript_batch_size
 
         # Display configuration
         console.print("\n⚡ [bold cyan]CONFIGURATION[/bold cyan]")
@@ -4,15 +4,28 @@
 """
 
 from convergence.ai.text_to_speech import (
+    assign_voices,
     conversation_to_audio,
+    conversation_to_audio_async,
+    conversation_to_audio_file,
+    conversation_to_audio_file_async,
     get_random_female_voice_id,
     get_random_male_voice_id,
     text_to_audio,
+    text_to_audio_async,
 )
+from convergence.ai.transcript_generator import generate_transcript, generate_transcript_async
 
 __all__ = [
     "text_to_audio",
+    "text_to_audio_async",
     "conversation_to_audio",
+    "conversation_to_audio_async",
+    "conversation_to_audio_file",
+    "conversation_to_audio_file_async",
+    "generate_transcript",
+    "generate_transcript_async",
+    "assign_voices",
     "get_random_female_voice_id",
     "get_random_male_voice_id",
 ]
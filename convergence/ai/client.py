@@ -0,0 +1,219 @@
+"""
+🔌 Shared OpenAI client registry with pooled HTTP connections
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+T = TypeVar("T")
+ClientKey = Tuple[str, Optional[str]]
+
+
+class ConnectionStats:
+    """Request and connection counters for a pooled client"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+    @property
+    def connections_reused(self) -> int:
+        """Requests that were served on an already open keep-alive connection"""
+        return max(self.requests - self.connections_opened, 0)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+        }
+
+
+class OpenAIClientRegistry:
+    """
+    Process-wide registry of OpenAI clients keyed by (api_key, base_url).
+    Async clients are additionally scoped to the event loop that created them,
+    since their connections cannot be shared across loops.
+    """
+
+    def __init__(self) -> None:
+        self.pool_size = int(os.getenv("OPENAI_POOL_SIZE", "20"))
+        self.keepalive_seconds = float(os.getenv("OPENAI_KEEPALIVE_SECONDS", "30"))
+        self._lock = threading.Lock()
+        self._clients: Dict[ClientKey, OpenAI] = {}
+        self._async_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, Dict[ClientKey, AsyncOpenAI]
+        ] = weakref.WeakKeyDictionary()
+        self._stats: Dict[ClientKey, ConnectionStats] = {}
+
+    def _client_key(self, api_key: Optional[str], base_url: Optional[str]) -> ClientKey:
+        return (api_key or "", base_url or os.getenv("OPENAI_BASE_URL"))
+
+    def _get_stats(self, key: ClientKey) -> ConnectionStats:
+        """Stats are shared by the sync and async clients of a key (caller holds the lock)"""
+        if key not in self._stats:
+            self._stats[key] = ConnectionStats()
+        return self._stats[key]
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.pool_size,
+            max_keepalive_connections=self.pool_size,
+            keepalive_expiry=self.keepalive_seconds,
+        )
+
+    def _build_http_client(self, stats: ConnectionStats) -> httpx.Client:
+        """Create a pooled httpx client that reports request and connection counts"""
+
+        def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                stats.record_connection()
+
+        def on_request(request: httpx.Request) -> None:
+            stats.record_request()
+            request.extensions["trace"] = trace
+
+        return httpx.Client(
+            limits=self._limits(),
+            timeout=httpx.Timeout(600.0, connect=5.0),
+            follow_redirects=True,
+            event_hooks={"request": [on_request]},
+        )
+
+    def _build_async_http_client(self, stats: ConnectionStats) -> httpx.AsyncClient:
+        """Async counterpart of _build_http_client"""
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                stats.record_connection()
+
+        async def on_request(request: httpx.Request) -> None:
+            stats.record_request()
+            request.extensions["trace"] = trace
+
+        return httpx.AsyncClient(
+            limits=self._limits(),
+            timeout=httpx.Timeout(600.0, connect=5.0),
+            follow_redirects=True,
+            event_hooks={"request": [on_request]},
+        )
+
+    def get_client(self, api_key: Optional[str], base_url: Optional[str] = None) -> OpenAI:
+        """Get or create the shared client for an API key and base URL"""
+        key = self._client_key(api_key, base_url)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = OpenAI(
+                    api_key=api_key,
+                    base_url=key[1],
+                    http_client=self._build_http_client(self._get_stats(key)),
+                )
+                self._clients[key] = client
+            return client
+
+    def get_async_client(
+        self, api_key: Optional[str], base_url: Optional[str] = None
+    ) -> AsyncOpenAI:
+        """Get or create the shared async client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        key = self._client_key(api_key, base_url)
+        with self._lock:
+            loop_clients = self._async_clients.setdefault(loop, {})
+            client = loop_clients.get(key)
+            if client is None:
+                client = AsyncOpenAI(
+                    api_key=api_key,
+                    base_url=key[1],
+                    http_client=self._build_async_http_client(self._get_stats(key)),
+                )
+                loop_clients[key] = client
+            return client
+
+    async def aclose_loop_clients(self) -> None:
+        """Close the async clients that belong to the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = list(self._async_clients.pop(loop, {}).values())
+        for client in clients:
+            await client.close()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Connection reuse counters per registered client (API keys are masked)"""
+        with self._lock:
+            items = list(self._stats.items())
+        return [
+            {
+                "api_key": f"{api_key[:7]}..." if api_key else None,
+                "base_url": base_url,
+                **stats.to_dict(),
+            }
+            for (api_key, base_url), stats in items
+        ]
+
+    def close(self) -> None:
+        """Close all pooled connections and forget the registered clients"""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._stats.clear()
+        for client in clients:
+            client.close()
+
+
+# Global instance
+_client_registry: Optional[OpenAIClientRegistry] = None
+_client_registry_lock = threading.Lock()
+
+
+def get_client_registry() -> OpenAIClientRegistry:
+    """Get or create the global OpenAI client registry"""
+    global _client_registry
+    if _client_registry is None:
+        # TTS workers may race for the first client
+        with _client_registry_lock:
+            if _client_registry is None:
+                _client_registry = OpenAIClientRegistry()
+    return _client_registry
+
+
+def get_openai_client(api_key: Optional[str], base_url: Optional[str] = None) -> OpenAI:
+    """Get the shared, connection-pooled OpenAI client for an API key"""
+    return get_client_registry().get_client(api_key, base_url)
+
+
+def get_async_openai_client(
+    api_key: Optional[str], base_url: Optional[str] = None
+) -> AsyncOpenAI:
+    """Get the shared, connection-pooled AsyncOpenAI client for an API key"""
+    return get_client_registry().get_async_client(api_key, base_url)
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """
+    Run an async OpenAI workflow from synchronous code (e.g. the CLI).
+    The async clients opened on the temporary event loop are closed before it exits.
+    """
+
+    async def runner() -> T:
+        try:
+            return await coro
+        finally:
+            await get_client_registry().aclose_loop_clients()
+
+    return asyncio.run(runner())
@@ -1,8 +1,8 @@
 from typing import Optional, Tuple
 
-from openai import OpenAI
-
+from convergence.ai.client import get_openai_client
 from convergence.core.models import Conversation
+from convergence.utils.metrics import observe_openai_call
 
 
 def audio_to_transcript(
@@ -13,10 +13,10 @@ def audio_to_transcript(
     """
     try:
         text = ""
-        openai = OpenAI(api_key=conversation.config.openai_api_key)
+        openai = get_openai_client(conversation.config.openai_api_key)
         print(f"Converting audio at {audio_path} to transcript.")
 
-        with open(audio_path, "rb") as f:
+        with open(audio_path, "rb") as f, observe_openai_call("stt"):
             transcription = openai.audio.transcriptions.create(model="gpt-4o-transcribe", file=f)
             text = transcription.text
 
@@ -1,26 +1,35 @@
+import asyncio
 import io
 import random
-from typing import Optional, Tuple
+from collections import deque
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, BinaryIO, Deque, Dict, Optional, Tuple, Union
 
-from openai import OpenAI
+from convergence.ai.client import get_async_openai_client, get_openai_client, run_sync
+from convergence.ai.tts_cache import get_tts_cache
+from convergence.core.models import Conversation, TranscriptItem
+from convergence.core.progress import emit_progress
+from convergence.utils.metrics import observe_openai_call
+from convergence.utils.wav import StreamingWavWriter
 
-from convergence.core.models import Conversation
 
+TTS_RESPONSE_FORMAT = "wav"
 
-def get_random_female_voice_id() -> str:
+
+def get_random_female_voice_id(rng: Optional[random.Random] = None) -> str:
     """
     Get a female-presenting voice ID from the OpenAI API.
     """
     female_voices = ["coral", "fable", "nova", "sage", "shimmer"]
-    return random.choice(female_voices)
+    return (rng or random).choice(female_voices)
 
 
-def get_random_male_voice_id() -> str:
+def get_random_male_voice_id(rng: Optional[random.Random] = None) -> str:
     """
     Get a male-presenting voice ID from the OpenAI API.
     """
     male_voices = ["alloy", "ash", "ballad", "echo", "onyx"]
-    return random.choice(male_voices)
+    return (rng or random).choice(male_voices)
 
 
 def text_to_audio(
@@ -36,106 +45,360 @@ def text_to_audio(
         Tuple[Optional[bytes], Optional[str]]: (audio_buffer, error_message_if_any)
     """
     try:
-        openai = OpenAI(api_key=openai_api_key)
+        cache = get_tts_cache()
+        cache_key = cache.make_key(message, voice_id, model, instructions, TTS_RESPONSE_FORMAT)
+        cached_audio = cache.get(cache_key)
+        if cached_audio is not None:
+            return cached_audio, None
+
+        openai = get_openai_client(openai_api_key)
         audio_buffer = io.BytesIO()
 
-        # Create speech response
-        response = openai.audio.speech.create(
-            model=model, voice=voice_id, input=message, response_format="wav"
-        )
+        with observe_openai_call("tts"):
+            # Create speech response
+            response = openai.audio.speech.create(
+                model=model, voice=voice_id, input=message, response_format=TTS_RESPONSE_FORMAT
+            )
 
-        # Write the response content to buffer
-        for chunk in response.iter_bytes():
-            audio_buffer.write(chunk)
+            # Write the response content to buffer
+            for chunk in response.iter_bytes():
+                audio_buffer.write(chunk)
 
-        audio_buffer.seek(0)
-        return audio_buffer.read(), None
+        audio_data = audio_buffer.getvalue()
+        cache.put(cache_key, audio_data)
+        return audio_data, None
     except Exception as e:
         print(f"Error converting message to audio: {e}")
         return None, str(e)
 
 
-def conversation_to_audio(
-    conversation: Conversation,
+async def text_to_audio_async(
+    message: str,
     openai_api_key: str,
-    voice_id: str,  # Currently unused - voices are assigned randomly per speaker
+    voice_id: str,
     model: str = "tts-1",
     instructions: str = "Speak in a cheerful and positive tone.",
 ) -> Tuple[Optional[bytes], Optional[str]]:
     """
-    Convert a conversation to audio and return the audio buffer.
+    Convert a message to audio using the async OpenAI client.
+    Returns:
+        Tuple[Optional[bytes], Optional[str]]: (audio_buffer, error_message_if_any)
     """
     try:
-        # Use the provided API key, fall back to conversation config if not provided
-        api_key = openai_api_key or conversation.config.openai_api_key or ""
-        transcript = conversation.transcript
-
-        name_to_voice_id = {}
-        audio_segments = []
-
-        for idx, item in enumerate(transcript.items):
-            # Assign a voice ID per speaker
-            if item.name not in name_to_voice_id:
-                if item.gender == "female":
-                    name_to_voice_id[item.name] = get_random_female_voice_id()
-                else:
-                    name_to_voice_id[item.name] = get_random_male_voice_id()
+        cache = get_tts_cache()
+        cache_key = cache.make_key(message, voice_id, model, instructions, TTS_RESPONSE_FORMAT)
+        # Cache file IO runs off the event loop
+        cached_audio = await asyncio.to_thread(cache.get, cache_key)
+        if cached_audio is not None:
+            return cached_audio, None
 
-            assigned_voice_id = name_to_voice_id[item.name]
+        openai = get_async_openai_client(openai_api_key)
+        audio_buffer = io.BytesIO()
 
-            print(f"Converting message to audio for segment {idx} of {len(transcript.items)}.")
-            audio_data, error = text_to_audio(
-                item.message,
-                api_key,
-                voice_id=assigned_voice_id,
-                model=model,
-                instructions=instructions,
+        with observe_openai_call("tts"):
+            # Create speech response
+            response = await openai.audio.speech.create(
+                model=model, voice=voice_id, input=message, response_format=TTS_RESPONSE_FORMAT
             )
 
-            if error:
-                print(f"Error converting message to audio: {error}")
-                return None, error
+            # Write the response content to buffer
+            async for chunk in await response.aiter_bytes():
+                audio_buffer.write(chunk)
+
+        audio_data = audio_buffer.getvalue()
+        await asyncio.to_thread(cache.put, cache_key, audio_data)
+        return audio_data, None
+    except Exception as e:
+        print(f"Error converting message to audio: {e}")
+        return None, str(e)
+
+
+def assign_voice(name_to_voice_id: Dict[str, str], item: TranscriptItem) -> str:
+    """
+    Get the voice ID for an item's speaker, assigning one on first sight.
+    Voices are seeded by speaker name and gender, so re-rendering a conversation picks
+    the same voices and hits the TTS cache.
+    """
+    if item.name not in name_to_voice_id:
+        rng = random.Random(f"{item.name}:{item.gender}")
+        if item.gender == "female":
+            name_to_voice_id[item.name] = get_random_female_voice_id(rng)
+        else:
+            name_to_voice_id[item.name] = get_random_male_voice_id(rng)
+    return name_to_voice_id[item.name]
+
 
-            audio_segments.append((idx, audio_data))
+def assign_voices(conversation: Conversation) -> Dict[str, str]:
+    """
+    Assign a voice ID to every speaker in the conversation.
+    Done up front so that parallel TTS workers all see the same speaker -> voice mapping.
+    """
+    name_to_voice_id: Dict[str, str] = {}
+    for item in conversation.transcript.items:
+        assign_voice(name_to_voice_id, item)
+    return name_to_voice_id
+
+
+async def iter_items_audio(
+    items: AsyncIterable[TranscriptItem],
+    openai_api_key: str,
+    model: str = "tts-1",
+    instructions: str = "Speak in a cheerful and positive tone.",
+    max_concurrency: int = 1,
+    total_items: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Render transcript items as they arrive and yield their audio segments in order.
+    Up to `max_concurrency` segments are in flight at once; at most that many finished
+    segments are held in memory. Items are pulled from `items` only when the window has
+    room, which applies backpressure to the producer.
+    Raises RuntimeError with the TTS error message if a segment fails.
+    """
+    workers = max(1, max_concurrency)
+    total_label = total_items if total_items is not None else "?"
+    name_to_voice_id: Dict[str, str] = {}
 
-        print(f"{len(audio_segments)} audio segments generated.")
+    async def render_segment(
+        idx: int, item: TranscriptItem
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        print(f"Converting message to audio for segment {idx} of {total_label}.")
+        return await text_to_audio_async(
+            item.message,
+            openai_api_key,
+            voice_id=name_to_voice_id[item.name],
+            model=model,
+            instructions=instructions,
+        )
 
-        # Sort by message index (already in order, but explicit)
-        audio_segments.sort(key=lambda x: x[0])
+    source = items.__aiter__()
+    next_item: "Optional[asyncio.Future[TranscriptItem]]" = None
+    exhausted = False
+    next_idx = 0
+    # Sliding window of in-flight requests, consumed in submission order so segments come
+    # back in transcript order regardless of which request finishes first
+    in_flight: Deque["asyncio.Future[Tuple[Optional[bytes], Optional[str]]]"] = deque()
+    done_count = 0
+    try:
+        while True:
+            if not exhausted and next_item is None and len(in_flight) < workers:
+                next_item = asyncio.ensure_future(source.__anext__())
 
-        # Concatenate all audio segments
-        # For WAV files, we need to strip headers from all but the first segment
-        net_audio_buffer = io.BytesIO()
+            waiting = [f for f in (next_item, in_flight[0] if in_flight else None) if f]
+            if not waiting:
+                break
+            # Wake up for whichever comes first: a new item or the head segment
+            await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
 
-        for idx, (_, segment) in enumerate(audio_segments):
-            if segment:
-                if idx == 0:
-                    # Keep the full WAV file for the first segment
-                    net_audio_buffer.write(segment)
+            if next_item is not None and next_item.done():
+                try:
+                    item = next_item.result()
+                except StopAsyncIteration:
+                    exhausted = True
                 else:
-                    # Skip WAV header (44 bytes) for subsequent segments
-                    # Only if it's a WAV file (starts with RIFF)
-                    if segment[:4] == b"RIFF":
-                        net_audio_buffer.write(segment[44:])
-                    else:
-                        net_audio_buffer.write(segment)
-
-        net_audio_buffer.seek(0)
-        audio_bytes = net_audio_buffer.read()
-
-        # Update WAV header with correct file size if it's a WAV file
-        if audio_bytes[:4] == b"RIFF":
-            audio_array = bytearray(audio_bytes)
-            # Update file size (total size - 8)
-            file_size = len(audio_array) - 8
-            audio_array[4:8] = file_size.to_bytes(4, "little")
-            # Update data chunk size (total size - 44)
-            data_size = len(audio_array) - 44
-            audio_array[40:44] = data_size.to_bytes(4, "little")
-            audio_bytes = bytes(audio_array)
-
-        return audio_bytes, None
+                    # Voices are assigned in submission order, so they are stable
+                    assign_voice(name_to_voice_id, item)
+                    in_flight.append(asyncio.ensure_future(render_segment(next_idx, item)))
+                    next_idx += 1
+                next_item = None
+
+            while in_flight and in_flight[0].done():
+                audio_data, error = in_flight.popleft().result()
+                if error:
+                    raise RuntimeError(error)
+                done_count += 1
+                emit_progress("audio_segment", index=done_count, total=total_items)
+                if audio_data:
+                    yield audio_data
+    finally:
+        # Drop segments that are still pending after a failure
+        pending = list(in_flight) + ([next_item] if next_item is not None else [])
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def iter_conversation_audio(
+    conversation: Conversation,
+    openai_api_key: str,
+    model: str = "tts-1",
+    instructions: str = "Speak in a cheerful and positive tone.",
+    max_concurrency: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Render a conversation and yield its audio segments in transcript order.
+    `max_concurrency` defaults to `conversation.config.tts_concurrency`.
+    """
+    # Use the provided API key, fall back to conversation config if not provided
+    api_key = openai_api_key or conversation.config.openai_api_key or ""
+    transcript_items = conversation.transcript.items
+
+    async def items() -> AsyncIterator[TranscriptItem]:
+        for item in transcript_items:
+            yield item
+
+    async for segment in iter_items_audio(
+        items(),
+        api_key,
+        model,
+        instructions,
+        max_concurrency or conversation.config.tts_concurrency,
+        total_items=len(transcript_items),
+    ):
+        yield segment
+
+
+async def write_audio_segments(
+    segments: AsyncIterable[bytes], stream: BinaryIO
+) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Write audio segments into a binary stream as a single WAV, one segment at a time.
+    Returns:
+        Tuple[Optional[int], Optional[str]]: (bytes_written, error_message_if_any)
+    """
+    try:
+        segment_count = 0
+        with StreamingWavWriter(stream) as writer:
+            async for segment in segments:
+                writer.write_segment(segment)
+                segment_count += 1
+                # Flush so readers following the file see the segment right away
+                stream.flush()
+                emit_progress(
+                    "bytes_written", bytes=writer.bytes_written, segments=segment_count
+                )
+
+        print(f"{segment_count} audio segments generated.")
+        return writer.bytes_written, None
 
     except Exception as e:
         print(f"Error converting conversation to audio: {e}")
         return None, str(e)
+
+
+async def write_conversation_audio(
+    conversation: Conversation,
+    stream: BinaryIO,
+    openai_api_key: str,
+    model: str = "tts-1",
+    instructions: str = "Speak in a cheerful and positive tone.",
+    max_concurrency: Optional[int] = None,
+) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Render a conversation into a binary stream as a single WAV, one segment at a time.
+    Returns:
+        Tuple[Optional[int], Optional[str]]: (bytes_written, error_message_if_any)
+    """
+    return await write_audio_segments(
+        iter_conversation_audio(conversation, openai_api_key, model, instructions, max_concurrency),
+        stream,
+    )
+
+
+async def conversation_to_audio_async(
+    conversation: Conversation,
+    openai_api_key: str,
+    voice_id: str,  # Currently unused - voices are assigned randomly per speaker
+    model: str = "tts-1",
+    instructions: str = "Speak in a cheerful and positive tone.",
+    max_concurrency: Optional[int] = None,
+) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    Convert a conversation to audio and return the audio buffer.
+    Prefer conversation_to_audio_file_async for long conversations.
+    """
+    audio_buffer = io.BytesIO()
+    _, error = await write_conversation_audio(
+        conversation, audio_buffer, openai_api_key, model, instructions, max_concurrency
+    )
+    if error:
+        return None, error
+    return audio_buffer.getvalue(), None
+
+
+async def conversation_to_audio_file_async(
+    conversation: Conversation,
+    output_path: Union[str, Path],
+    openai_api_key: str,
+    model: str = "tts-1",
+    instructions: str = "Speak in a cheerful and positive tone.",
+    max_concurrency: Optional[int] = None,
+) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Convert a conversation to audio, streaming each segment into `output_path`.
+    Peak memory is bounded by the in-flight segments, whatever the duration.
+    Returns:
+        Tuple[Optional[int], Optional[str]]: (bytes_written, error_message_if_any)
+    """
+    try:
+        with open(output_path, "wb") as f:
+            emit_progress("audio_started", path=str(output_path))
+            return await write_conversation_audio(
+                conversation, f, openai_api_key, model, instructions, max_concurrency
+            )
+    except Exception as e:
+        print(f"Error writing conversation audio: {e}")
+        return None, str(e)
+
+
+async def transcript_items_to_audio_file_async(
+    items: AsyncIterable[TranscriptItem],
+    output_path: Union[str, Path],
+    openai_api_key: str,
+    model: str = "tts-1",
+    instructions: str = "Speak in a cheerful and positive tone.",
+    max_concurrency: int = 1,
+) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Render transcript items into `output_path` as they are produced, e.g. while the
+    transcript is still being generated.
+    Returns:
+        Tuple[Optional[int], Optional[str]]: (bytes_written, error_message_if_any)
+    """
+    try:
+        with open(output_path, "wb") as f:
+            emit_progress("audio_started", path=str(output_path))
+            return await write_audio_segments(
+                iter_items_audio(items, openai_api_key, model, instructions, max_concurrency),
+                f,
+            )
+    except Exception as e:
+        print(f"Error writing conversation audio: {e}")
+        return None, str(e)
+
+
+def conversation_to_audio(
+    conversation: Conversation,
+    openai_api_key: str,
+    voice_id: str,  # Currently unused - voices are assigned randomly per speaker
+    model: str = "tts-1",
+    instructions: str = "Speak in a cheerful and positive tone.",
+    max_concurrency: Optional[int] = None,
+) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    Convert a conversation to audio and return the audio buffer.
+    Synchronous wrapper around conversation_to_audio_async for the CLI.
+    """
+    return run_sync(
+        conversation_to_audio_async(
+            conversation, openai_api_key, voice_id, model, instructions, max_concurrency
+        )
+    )
+
+
+def conversation_to_audio_file(
+    conversation: Conversation,
+    output_path: Union[str, Path],
+    openai_api_key: str,
+    model: str = "tts-1",
+    instructions: str = "Speak in a cheerful and positive tone.",
+    max_concurrency: Optional[int] = None,
+) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Convert a conversation to audio, streaming each segment into `output_path`.
+    Synchronous wrapper around conversation_to_audio_file_async for the CLI.
+    """
+    return run_sync(
+        conversation_to_audio_file_async(
+            conversation, output_path, openai_api_key, model, instructions, max_concurrency
+        )
+    )
@@ -1,51 +1,55 @@
+import asyncio
+import json
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
-
-from openai import OpenAI
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+from convergence.ai.client import get_async_openai_client, run_sync
+from convergence.core.checkpoint import TranscriptCheckpoint
 from convergence.core.models import ConversationConfig, Transcript, TranscriptItem
+from convergence.core.progress import emit_progress
+from convergence.utils.metrics import RETRIES, observe_openai_call
 
+SYSTEM_PROMPT = (
+    "You are a helpful assistant that generates realistic conversation transcripts in JSON format."
+)
 
-def generate_transcript(
-    config: ConversationConfig, model: str = "gpt-4o-mini"
-) -> Tuple[Optional[Transcript], Optional[str]]:
+
+def _build_segment_prompt(
+    config: ConversationConfig,
+    segment_index: int,
+    block_size: int,
+    total_segments: int,
+    transcript_items: List[TranscriptItem],
+) -> str:
     """
-    Generate a transcript from a conversation.
+    Build the prompt for the next block of `block_size` segments.
+    A block of one asks for a single JSON object, larger blocks ask for an "items" array.
     """
-    try:
-        openai = OpenAI(api_key=config.openai_api_key)
-        vibe = config.vibe
-        prompt = config.prompt
-        # outline = config.outline
-        # outline_source = config.outline_source  # TODO: use this to generate the outline
-        duration = config.duration
-
-        # Generate approximately 2-3 exchanges per minute
-        exchanges_per_minute = 2
-        total_segments = max(duration * exchanges_per_minute, 4)  # At least 4 exchanges
-        start_time = datetime.now()
-        segment_index = 0
-        transcript_items: List[Any] = []
-
-        while segment_index < total_segments:
-            try:
-                # Space out exchanges evenly across the duration
-                seconds_between_exchanges = (duration * 60) / total_segments
-                current_index_timestamp = start_time + timedelta(
-                    seconds=segment_index * seconds_between_exchanges
-                )
-
-                last_five_transcript_items = transcript_items[-5:]
-                last_five_transcript_items_str = "\n".join(
-                    [
-                        f"{item.timestamp} {item.name} {item.message}"
-                        for item in last_five_transcript_items
-                    ]
-                )
-
-                segment_prompt = f"""
-                    Generate a transcript item for the segment {segment_index + 1} of {total_segments}.
-                    Return ONLY a JSON object in the following format:
+    last_five_transcript_items = transcript_items[-5:]
+    last_five_transcript_items_str = "\n".join(
+        [f"{item.timestamp} {item.name} {item.message}" for item in last_five_transcript_items]
+    )
+
+    if block_size == 1:
+        segment_prompt = f"""
+            Generate a transcript item for the segment {segment_index + 1} of {total_segments}.
+            Return ONLY a JSON object in the following format:
+            {{
+                "timestamp": "2025-07-07T09:00:24",
+                "name": "Speaker Name",
+                "gender": "male or female",
+                "role": "Their Role",
+                "message": "What they say in this segment"
+            }}
+            """
+    else:
+        segment_prompt = f"""
+            Generate the transcript items for segments {segment_index + 1} to
+            {segment_index + block_size} of {total_segments} ({block_size} consecutive turns).
+            Return ONLY a JSON object with an "items" array of exactly {block_size} entries,
+            in speaking order, in the following format:
+            {{
+                "items": [
                     {{
                         "timestamp": "2025-07-07T09:00:24",
                         "name": "Speaker Name",
@@ -53,68 +57,207 @@ def generate_transcript(
                         "role": "Their Role",
                         "message": "What they say in this segment"
                     }}
+                ]
+            }}
+            """
+
+    segment_prompt += f"""
+            Context:
+            - Vibe: '{config.vibe}'
+            - Prompt: '{config.prompt}'
+            - This is part of a conversation between two people
+            - Make the dialogue natural and engaging
+
+            Last 5 transcript items:
+            '''
+            {last_five_transcript_items_str}
+            '''
+
+            Generate the next dialogue {"turn" if block_size == 1 else "turns"} as JSON.
+            """
+
+    if segment_index + block_size == total_segments:
+        if block_size == 1:
+            segment_prompt += """
+            The last segment should be the end of the conversation.
+            Make sure the end of the conversation is smooth and not abrupt.
+            The transcript item should be in the following format:
+            {
+                "timestamp": "2025-07-07T09:00:24",
+                "name": "Customer",
+                "gender": "male",
+                "role": "Customer",
+                "message": "What I want is for you to stop wasting my time. This is harassment."
+            }
+            """
+        else:
+            segment_prompt += """
+            The last element of "items" must close the conversation.
+            Make sure the end of the conversation is smooth and not abrupt.
+            Keep the same format:
+            {
+                "items": [
+                    ...,
+                    {
+                        "timestamp": "2025-07-07T09:00:24",
+                        "name": "Customer",
+                        "gender": "male",
+                        "role": "Customer",
+                        "message": "What I want is for you to stop wasting my time."
+                    }
+                ]
+            }
+            """
+    return segment_prompt
+
+
+def _parse_segment_block(content: Optional[str], block_size: int) -> List[TranscriptItem]:
+    """
+    Parse a chat completion into exactly `block_size` transcript items.
+    Raises ValueError if the response does not hold the expected number of valid items.
+    """
+    response_json: Any = json.loads(content) if content else {}
+
+    raw_items: List[Dict[str, Any]]
+    if isinstance(response_json, dict) and isinstance(response_json.get("items"), list):
+        raw_items = response_json["items"]
+    elif isinstance(response_json, list):
+        raw_items = response_json
+    else:
+        raw_items = [response_json]
+
+    if len(raw_items) < block_size:
+        raise ValueError(f"Expected {block_size} transcript items, got {len(raw_items)}")
+
+    return [TranscriptItem(**raw_item) for raw_item in raw_items[:block_size]]
+
+
+def get_total_segments(duration: int) -> int:
+    """Number of dialogue turns generated for a conversation of `duration` minutes"""
+    # Generate approximately 2-3 exchanges per minute
+    exchanges_per_minute = 2
+    return max(duration * exchanges_per_minute, 4)  # At least 4 exchanges
+
 
-                    Context:
-                    - Vibe: '{vibe}'
-                    - Prompt: '{prompt}'
-                    - This is part of a conversation between two people
-                    - Make the dialogue natural and engaging
-
-                    Last 5 transcript items:
-                    '''
-                    {last_five_transcript_items_str}
-                    '''
-
-                    Generate the next dialogue turn as JSON.
-                    """
-
-                if segment_index + 1 == total_segments:
-                    segment_prompt += """
-                        The last segment should be the end of the conversation.
-                        Make sure the end of the conversation is smooth and not abrupt.
-                        The transcript item should be in the following format:
-                        {{
-                            "timestamp": "2025-07-07T09:00:24",
-                            "name": "Customer",
-                            "gender": "male",
-                            "role": "Customer",
-                            "message": "What I want is for you to stop wasting my time. This is harassment.",
-                        }}
-                    """
+async def iter_transcript_items(
+    config: ConversationConfig,
+    model: str = "gpt-4o-mini",
+    checkpoint: Optional[TranscriptCheckpoint] = None,
+) -> AsyncIterator[TranscriptItem]:
+    """
+    Generate a transcript and yield each item as soon as it is available.
+    Turns are requested `config.transcript_batch_size` at a time; a block that fails to
+    parse is retried with half the size, down to a single turn per request. Failed
+    requests and unparseable single turns are retried `config.segment_retries` times with
+    exponential backoff.
+    With a checkpoint, items from a previous attempt are yielded first and generation
+    continues after the last completed turn; every new item is recorded as it is made.
+    Raises RuntimeError with the error message if a turn cannot be generated.
+    """
+    openai = get_async_openai_client(config.openai_api_key)
+    # outline = config.outline
+    # outline_source = config.outline_source  # TODO: use this to generate the outline
+    duration = config.duration
+
+    total_segments = get_total_segments(duration)
+    # Space out exchanges evenly across the duration
+    seconds_between_exchanges = (duration * 60) / total_segments
+    start_time = datetime.now()
+    transcript_items: List[TranscriptItem] = []
+
+    if checkpoint:
+        transcript_items = checkpoint.load()[:total_segments]
+        if transcript_items:
+            print(f"Resuming transcript from checkpoint at segment {len(transcript_items) + 1}.")
+            if transcript_items[0].timestamp:
+                start_time = transcript_items[0].timestamp
+        checkpoint.start(transcript_items)
+        for transcript_item in transcript_items:
+            yield transcript_item
+
+    segment_index = len(transcript_items)
+    block_limit = config.transcript_batch_size
+
+    while segment_index < total_segments:
+        block_size = min(block_limit, total_segments - segment_index)
+        segment_prompt = _build_segment_prompt(
+            config, segment_index, block_size, total_segments, transcript_items
+        )
+
+        block_items: Optional[List[TranscriptItem]] = None
+        for attempt in range(config.segment_retries):
+            error: Exception
+            try:
                 # Use chat completion with structured output
-                response = openai.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a helpful assistant that generates realistic conversation transcripts in JSON format.",
-                        },
-                        {"role": "user", "content": segment_prompt},
-                    ],
-                    response_format={"type": "json_object"},
-                )
-
-                # Parse the JSON response
-                import json
-
-                response_json = (
-                    json.loads(response.choices[0].message.content)
-                    if response.choices[0].message.content
-                    else {}
-                )
-
-                # Create TranscriptItem from the response
-                transcript_item = TranscriptItem(**response_json)
-                transcript_item.timestamp = current_index_timestamp
-                transcript_items.append(transcript_item)
-                segment_index += 1
+                with observe_openai_call("chat"):
+                    response = await openai.chat.completions.create(
+                        model=model,
+                        messages=[
+                            {"role": "system", "content": SYSTEM_PROMPT},
+                            {"role": "user", "content": segment_prompt},
+                        ],
+                        response_format={"type": "json_object"},
+                    )
+                block_items = _parse_segment_block(response.choices[0].message.content, block_size)
+                break
+            except (ValueError, TypeError) as e:
+                if block_size > 1:
+                    # Fall back to smaller blocks for the rest of the transcript
+                    block_limit = max(block_size // 2, 1)
+                    print(
+                        f"Could not parse {block_size}-turn block ({e}), "
+                        f"retrying with {block_limit}."
+                    )
+                    break
+                error = e
             except Exception as e:
-                print(f"Error generating transcript: {e}")
-                return None, str(e)
+                error = e
+            if attempt == config.segment_retries - 1:
+                raise RuntimeError(str(error)) from error
+            print(f"Segment {segment_index + 1} attempt {attempt + 1} failed: {error}")
+            RETRIES.inc(operation="transcript_segment")
+            await asyncio.sleep(2**attempt)  # Exponential backoff
+
+        if block_items is None:
+            continue
 
+        for transcript_item in block_items:
+            transcript_item.timestamp = start_time + timedelta(
+                seconds=segment_index * seconds_between_exchanges
+            )
+            transcript_items.append(transcript_item)
+            if checkpoint:
+                checkpoint.append(transcript_item)
+            segment_index += 1
+            emit_progress("transcript_segment", index=segment_index, total=total_segments)
+            yield transcript_item
+
+
+async def generate_transcript_async(
+    config: ConversationConfig,
+    model: str = "gpt-4o-mini",
+    checkpoint: Optional[TranscriptCheckpoint] = None,
+) -> Tuple[Optional[Transcript], Optional[str]]:
+    """
+    Generate a transcript from a conversation using the async OpenAI client.
+    """
+    try:
+        transcript_items = [
+            item async for item in iter_transcript_items(config, model, checkpoint)
+        ]
         transcript = Transcript(items=transcript_items)
 
         return transcript, None
     except Exception as e:
         print(f"Error generating transcript: {e}")
         return None, str(e)
+
+
+def generate_transcript(
+    config: ConversationConfig, model: str = "gpt-4o-mini"
+) -> Tuple[Optional[Transcript], Optional[str]]:
+    """
+    Generate a transcript from a conversation.
+    Synchronous wrapper around generate_transcript_async for the CLI.
+    """
+    return run_sync(generate_transcript_async(config, model))
@@ -0,0 +1,160 @@
+"""
+🗄️ Content-addressed on-disk cache for text-to-speech segments
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from convergence.utils.metrics import TTS_CACHE_REQUESTS
+
+
+class TTSCache:
+    """
+    Disk cache of rendered TTS segments keyed by a hash of everything that affects the audio.
+    Entries are evicted least-recently-used first once the total size exceeds `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        default_dir = Path.home() / ".cache" / "convergence" / "tts"
+        self.cache_dir = Path(cache_dir or os.getenv("TTS_CACHE_DIR") or default_dir)
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else int(os.getenv("TTS_CACHE_MAX_MB", "512")) * 1024 * 1024
+        )
+        self.enabled = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # key -> size in bytes, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+
+    @staticmethod
+    def make_key(
+        message: str, voice_id: str, model: str, instructions: str, response_format: str
+    ) -> str:
+        """Hash the inputs that determine a segment's audio"""
+        payload = json.dumps(
+            [message, voice_id, model, instructions, response_format], ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.bin"
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU index from the files on disk (caller holds the lock)"""
+        if self._loaded:
+            return
+        entries = []
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*/*.bin"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+        self._loaded = True
+        # The size cap may have been lowered since the entries were written
+        self._evict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached segment for `key`, or None on a miss"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._load_index()
+            if key not in self._index:
+                self.misses += 1
+                TTS_CACHE_REQUESTS.inc(result="miss")
+                return None
+            path = self._path(key)
+            try:
+                data = path.read_bytes()
+                # mtime doubles as the recency marker when the index is rebuilt
+                os.utime(path)
+            except OSError:
+                self._forget(key)
+                self.misses += 1
+                TTS_CACHE_REQUESTS.inc(result="miss")
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+            TTS_CACHE_REQUESTS.inc(result="hit")
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store a segment and evict the least recently used ones beyond the size cap"""
+        if not self.enabled or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self._load_index()
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename, so readers never see a partial segment
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_name, path)
+            except OSError:
+                Path(tmp_name).unlink(missing_ok=True)
+                return
+
+            self._forget(key)
+            self._index[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until under the size cap (caller holds the lock)"""
+        while self._total_bytes > self.max_bytes and self._index:
+            oldest = next(iter(self._index))
+            self._path(oldest).unlink(missing_ok=True)
+            self._forget(oldest)
+            self.evictions += 1
+
+    def _forget(self, key: str) -> None:
+        """Drop a key from the index (caller holds the lock)"""
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._index),
+            "size_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+# Global instance
+_tts_cache: Optional[TTSCache] = None
+_tts_cache_lock = threading.Lock()
+
+
+def get_tts_cache() -> TTSCache:
+    """Get or create the global TTS segment cache"""
+    global _tts_cache
+    if _tts_cache is None:
+        with _tts_cache_lock:
+            if _tts_cache is None:
+                _tts_cache = TTSCache()
+    return _tts_cache
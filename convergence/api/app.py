@@ -8,13 +8,21 @@ from typing import Any, Dict
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from convergence.ai.client import get_client_registry
+from convergence.ai.tts_cache import get_tts_cache
+from convergence.api.jobs import get_job_manager
 from convergence.api.routes import router
+from convergence.auth.api_key import get_api_key_auth
 from convergence.auth.google_sheets import get_sheets_client
+from convergence.auth.key_store import get_key_table, key_store_backend
 from convergence.auth.middleware import APIKeyMiddleware
+from convergence.core.usage import get_usage_meter
+from convergence.services.outline_cache import get_outline_cache
 from convergence.utils.console import console, print_banner, print_warning
 from convergence.utils.env import load_environment, validate_environment
+from convergence.utils.metrics import PROMETHEUS_CONTENT_TYPE, render_metrics
 
 
 @asynccontextmanager
@@ -40,7 +48,12 @@ async def lifespan(app: FastAPI) -> Any:
     auth_enabled = os.getenv("AUTH_ENABLED", "false").lower() == "true"
     console.print(f"   Authentication: {'Enabled' if auth_enabled else 'Disabled'}")
 
-    if auth_enabled:
+    if auth_enabled and key_store_backend() == "sqlite":
+        console.print(
+            "   🔐 [bold green]Authentication configured with the local key store[/bold green]"
+        )
+        get_key_table().start_background_refresh()
+    elif auth_enabled:
         # Check if Google credentials are available
         google_creds = os.getenv("GOOGLE_CREDENTIALS_PATH")
         google_sheet_id = os.getenv("GOOGLE_SHEET_ID")
@@ -52,6 +65,7 @@ async def lifespan(app: FastAPI) -> Any:
                 console.print(
                     "   🔐 [bold green]Authentication configured with Google Sheets[/bold green]"
                 )
+                get_key_table().start_background_refresh()
             else:
                 print_warning(
                     "Failed to initialize Google Sheets client", "⚠️  AUTHENTICATION WARNING"
@@ -73,6 +87,18 @@ async def lifespan(app: FastAPI) -> Any:
             console.print("     - GOOGLE_SHEET_ID: Google Sheet ID containing API keys")
             console.print("     - GOOGLE_SHEET_NAME: Sheet name (default: API_Keys)")
 
+    if auth_enabled:
+        usage_meter = get_usage_meter()
+        usage_meter.start()
+        if usage_meter.enabled:
+            console.print(f"   Usage metering: {type(usage_meter.sink).__name__}")
+
+    job_manager = get_job_manager()
+    console.print(
+        f"   Job workers: {job_manager.workers} "
+        f"(capacity {job_manager.capacity_minutes} min, queue size {job_manager.queue_size})"
+    )
+
     console.print("\n✅ [bold green]API READY[/bold green]")
     console.print("   Listening for requests...\n")
 
@@ -80,6 +106,14 @@ async def lifespan(app: FastAPI) -> Any:
 
     # Shutdown
     console.print("\n👋 [bold yellow]CONVERGENCE API SHUTTING DOWN[/bold yellow]")
+    await get_job_manager().stop()
+    if auth_enabled:
+        # After the jobs, so usage from cancelled work is included
+        await get_usage_meter().stop()
+    await get_key_table().stop_background_refresh()
+    client_registry = get_client_registry()
+    await client_registry.aclose_loop_clients()
+    client_registry.close()
 
 
 def create_app() -> FastAPI:
@@ -112,7 +146,7 @@ def create_app() -> FastAPI:
 
     # Health check endpoint
     @app.get("/health", tags=["Health"])  # type: ignore[misc]
-    async def health_check() -> Dict[str, str]:
+    async def health_check() -> Dict[str, Any]:
         """Check if the API is running"""
         auth_status = "enabled" if auth_enabled else "disabled"
         return {
@@ -120,8 +154,31 @@ def create_app() -> FastAPI:
             "service": "convergence-api",
             "version": "0.1.0",
             "auth": auth_status,
+            "jobs": get_job_manager().stats(),
         }
 
+    # Diagnostics endpoint
+    @app.get("/diagnostics", tags=["Health"])  # type: ignore[misc]
+    async def diagnostics() -> Dict[str, Any]:
+        """Report connection pool usage for upstream clients"""
+        registry = get_client_registry()
+        return {
+            "openai": {
+                "pool_size": registry.pool_size,
+                "keepalive_seconds": registry.keepalive_seconds,
+                "clients": registry.stats(),
+            },
+            "tts_cache": get_tts_cache().stats(),
+            "outline_cache": get_outline_cache().stats(),
+            "jobs": get_job_manager().stats(),
+        }
+
+    # Metrics endpoint
+    @app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)  # type: ignore[misc]
+    async def metrics() -> PlainTextResponse:
+        """Prometheus metrics: phase and upstream call latencies, retries, cache and jobs"""
+        return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
     # Auth status endpoint
     @app.get("/auth/status", tags=["Authentication"])  # type: ignore[misc]
     async def auth_status() -> Dict[str, Any]:
@@ -138,12 +195,20 @@ def create_app() -> FastAPI:
 
         sheets_client = get_sheets_client()
         sheets_initialized = sheets_client._initialized
+        key_table = get_key_table()
 
         return {
             "auth_enabled": True,
+            "key_store": key_store_backend(),
             "google_sheets_configured": google_configured,
             "google_sheets_connected": sheets_initialized,
+            "keys_loaded": key_table.size,
+            "key_table_age_seconds": key_table.age,
+            "key_refresh_interval": key_table.refresh_interval,
+            "key_filter_bytes": key_table.filter_size_bytes,
             "cache_duration": int(os.getenv("API_KEY_CACHE_DURATION", "300")),
+            "key_cache": get_api_key_auth().cache.stats(),
+            "usage": get_usage_meter().stats(),
             "sheet_name": os.getenv("GOOGLE_SHEET_NAME", "API_Keys"),
         }
 
@@ -154,6 +219,7 @@ def create_app() -> FastAPI:
         return JSONResponse(
             status_code=exc.status_code,
             content={"error": exc.detail, "status_code": exc.status_code, "path": str(request.url)},
+            headers=exc.headers,
         )
 
     return app
@@ -0,0 +1,178 @@
+"""
+🔊 Progressive audio streaming for running jobs
+"""
+
+import asyncio
+import hashlib
+import os
+from typing import AsyncIterator, BinaryIO, Optional, Tuple
+
+from convergence.ai.tts_cache import get_tts_cache
+from convergence.api.jobs import Job, JobStatus
+from convergence.utils.console import print_warning
+from convergence.utils.wav import WAV_HEADER_SIZE, build_streaming_wav_header, parse_wav
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _read_at(handle: BinaryIO, offset: int, size: int) -> bytes:
+    handle.seek(offset)
+    return handle.read(size)
+
+
+def _open(path: str) -> Optional[BinaryIO]:
+    try:
+        return open(path, "rb")
+    except OSError:
+        return None
+
+
+def _file_id(handle: BinaryIO) -> Tuple[int, int]:
+    """Device and inode: unchanged when a file is renamed"""
+    stat = os.fstat(handle.fileno())
+    return stat.st_dev, stat.st_ino
+
+
+def _digest_range(handle: BinaryIO, offset: int, size: int, chunk_size: int) -> bytes:
+    digest = hashlib.sha256()
+    handle.seek(offset)
+    while size > 0:
+        chunk = handle.read(min(chunk_size, size))
+        if not chunk:
+            break
+        digest.update(chunk)
+        size -= len(chunk)
+    return digest.digest()
+
+
+class AudioStreamError(RuntimeError):
+    """Raised when a restarted render cannot be joined to the audio already sent"""
+
+
+class _AudioFollower:
+    """Reads a job's audio file as it grows and remembers how much has been sent"""
+
+    def __init__(self, chunk_size: int):
+        self.chunk_size = chunk_size
+        self.handle: Optional[BinaryIO] = None
+        self.header_sent = False
+        # Audio bytes sent after the header, across attempts, and their checksum
+        self.sent = 0
+        self.sent_digest = hashlib.sha256()
+        # Position in the current file, known once its header has been read
+        self.position: Optional[int] = None
+        # Whether the current file must be checked against the audio already sent
+        self.verify = False
+        self._file_id: Optional[Tuple[int, int]] = None
+
+    async def switch(self, path: str, renamed: bool = False) -> None:
+        """
+        Follow a new file. Each time rendering (re)starts, the file is checked against the
+        audio already sent, even at the same path: a retry truncates and rewrites it in
+        place. `renamed` marks the partial file moved to its final name, which needs no
+        check while it is the same file.
+        """
+        self.close()
+        # A check still pending from a restart carries over to the renamed file
+        restarted = self.sent > 0 and (not renamed or self.verify)
+        if restarted and not get_tts_cache().enabled:
+            # Without the TTS cache a restarted render is new audio, not a replay
+            raise AudioStreamError("Audio rendering restarted and the TTS cache is disabled")
+        self.handle = await asyncio.to_thread(_open, path)
+        self.position = None
+        if self.handle is None:
+            self.verify = restarted
+            return
+        file_id = _file_id(self.handle)
+        self.verify = restarted or (self.sent > 0 and file_id != self._file_id)
+        self._file_id = file_id
+
+    async def read_until(self, available: int) -> AsyncIterator[bytes]:
+        """Yield the new bytes of the current file up to `available`"""
+        if self.handle is None:
+            return
+        handle = self.handle
+
+        if self.position is None:
+            head = await asyncio.to_thread(_read_at, handle, 0, WAV_HEADER_SIZE)
+            if len(head) < 4:
+                return
+            payload_start = 0
+            header: Optional[bytes] = None
+            if head[:4] == b"RIFF":
+                if len(head) < WAV_HEADER_SIZE:
+                    return
+                wav_format, _ = parse_wav(head)
+                header = build_streaming_wav_header(wav_format)
+                payload_start = WAV_HEADER_SIZE
+            if self.verify:
+                # Wait until the restarted render has caught up with what was sent
+                if available < payload_start + self.sent:
+                    return
+                # Cached segments replay byte for byte; anything else would be a splice
+                digest = await asyncio.to_thread(
+                    _digest_range, handle, payload_start, self.sent, self.chunk_size
+                )
+                if digest != self.sent_digest.digest():
+                    raise AudioStreamError(
+                        "Restarted audio rendering does not match the audio already sent"
+                    )
+                self.verify = False
+            if header is not None and not self.header_sent:
+                yield header
+            self.header_sent = True
+            self.position = payload_start + self.sent
+
+        while self.position < available:
+            size = min(self.chunk_size, available - self.position)
+            chunk = await asyncio.to_thread(_read_at, handle, self.position, size)
+            if not chunk:
+                break
+            self.position += len(chunk)
+            self.sent += len(chunk)
+            self.sent_digest.update(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+
+async def iter_job_audio(job: Job, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Yield a job's audio while it is being rendered.
+
+    A WAV header with an open-ended length is sent as soon as the first segment has been
+    written, followed by PCM data as each segment is appended to the job's partial file.
+    The job's `audio_started` and `bytes_written` progress events say where and how far
+    to read. Once the job completes, anything not yet sent is read from the output file.
+
+    If rendering restarts after audio has been sent, the stream resumes only once the new
+    file is known to begin with exactly the bytes already sent, which holds when every
+    sent segment is replayed from the TTS cache. Otherwise the response is aborted with
+    AudioStreamError rather than splicing two different renders together.
+    """
+    follower = _AudioFollower(chunk_size)
+    try:
+        async for event in job.events.subscribe():
+            if event.event == "audio_started":
+                await follower.switch(event.data["path"])
+            elif event.event == "bytes_written":
+                async for chunk in follower.read_until(event.data["bytes"]):
+                    yield chunk
+
+        # The partial file may have been renamed before we caught up
+        if job.status == JobStatus.COMPLETED and job.output_path:
+            await follower.switch(job.output_path, renamed=True)
+            if follower.handle is not None:
+                size = os.fstat(follower.handle.fileno()).st_size
+                async for chunk in follower.read_until(size):
+                    yield chunk
+                if follower.verify:
+                    raise AudioStreamError("Finished audio is shorter than the audio already sent")
+    except AudioStreamError as e:
+        print_warning(f"Audio stream for job {job.job_id} ended early: {str(e)}")
+        raise
+    finally:
+        follower.close()
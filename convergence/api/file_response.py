@@ -0,0 +1,175 @@
+"""
+📦 File responses with validators, conditional requests and byte ranges
+"""
+
+import email.utils
+import os
+import stat
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+FILE_CHUNK_SIZE = 256 * 1024
+
+
+def make_etag(stat_result: os.stat_result) -> str:
+    """
+    Strong ETag from file metadata. Outputs are only ever replaced atomically (os.replace),
+    never modified in place, so a new file always changes the inode or mtime.
+    """
+    return f'"{stat_result.st_ino:x}-{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def _parse_etags(header: str) -> List[str]:
+    """Split an If-None-Match / If-Range list into opaque tags, without W/ prefixes"""
+    tags = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag:
+            tags.append(tag)
+    return tags
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed is None:
+        return None
+    return int(parsed.timestamp())
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into inclusive (start, end) offsets.
+
+    Returns None when the header should be ignored (not a byte range, malformed, or
+    several ranges: serving the whole file is a valid answer to those). Raises ValueError
+    when the range cannot be satisfied for a file of `size` bytes.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = (part.strip() for part in spec.partition("-"))
+    if not sep or not (first or last):
+        return None
+    if (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+
+    if first:
+        start = int(first)
+        end = int(last) if last else size - 1
+        if last and end < start:
+            return None
+    else:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        start = max(size - length, 0)
+        end = size - 1
+
+    if start >= size:
+        raise ValueError("Range starts beyond the end of the file")
+    return start, min(end, size - 1)
+
+
+def _iter_file(path: Path, start: int, end: int) -> Iterator[bytes]:
+    """Read bytes start..end (inclusive) of a file in chunks"""
+    remaining = end - start + 1
+    with open(path, "rb") as f:
+        f.seek(start)
+        while remaining > 0:
+            chunk = f.read(min(FILE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _is_not_modified(request: Request, etag: str, mtime: int) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 7232 section 6)
+        tags = _parse_etags(if_none_match)
+        return "*" in tags or etag in tags
+    since = _parse_http_date(request.headers.get("if-modified-since"))
+    return since is not None and mtime <= since
+
+
+def _if_range_matches(request: Request, etag: str, mtime: int) -> bool:
+    """A Range is only honoured if If-Range (when present) still matches the file"""
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"'):
+        # Strong comparison: weak tags never match
+        return if_range == etag
+    since = _parse_http_date(if_range)
+    return since is not None and mtime == since
+
+
+def file_response(
+    request: Request, path: Path, media_type: str, filename: Optional[str] = None
+) -> Response:
+    """
+    Serve a file with ETag and Last-Modified validators.
+
+    Answers 304 to matching If-None-Match / If-Modified-Since requests, 206 to a single
+    byte range (honouring If-Range) and 416 to unsatisfiable ranges. HEAD requests get
+    the same headers without a body.
+    """
+    stat_result = path.stat()
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise FileNotFoundError(str(path))
+    size = stat_result.st_size
+    mtime = int(stat_result.st_mtime)
+    etag = make_etag(stat_result)
+
+    headers = {
+        "ETag": etag,
+        "Last-Modified": email.utils.formatdate(mtime, usegmt=True),
+        "Accept-Ranges": "bytes",
+    }
+    if filename:
+        quoted = quote(filename)
+        if quoted != filename:
+            headers["Content-Disposition"] = f"attachment; filename*=utf-8''{quoted}"
+        else:
+            headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    if _is_not_modified(request, etag, mtime):
+        return Response(status_code=304, headers=headers)
+
+    status_code = 200
+    start, end = 0, size - 1
+    range_header = request.headers.get("range")
+    if range_header and size > 0 and _if_range_matches(request, etag, mtime):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+        if byte_range is not None:
+            start, end = byte_range
+            status_code = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    headers["Content-Length"] = str(max(end - start + 1, 0))
+    if request.method == "HEAD" or size == 0:
+        return Response(status_code=status_code, headers=headers, media_type=media_type)
+    return StreamingResponse(
+        _iter_file(path, start, end),
+        status_code=status_code,
+        headers=headers,
+        media_type=media_type,
+    )
@@ -0,0 +1,331 @@
+"""
+📬 Background job queue for audio generation
+"""
+
+import asyncio
+import math
+import os
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Set
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from convergence.core.generator import ConversationGenerator
+from convergence.core.models import ConversationConfig, ConversationResult
+from convergence.core.progress import ProgressBus, emit_progress, progress_scope
+from convergence.core.usage import UsageKey, current_usage_key, usage_scope
+from convergence.services.outline import OutlineProcessor
+from convergence.utils.console import console, print_warning
+from convergence.utils.metrics import JOBS_FINISHED, JOBS_IN_FLIGHT, JOBS_QUEUED, PHASE_DURATION
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a generation job"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+# Rough share of the total work done by the start of each phase
+PHASE_PROGRESS = {
+    "queued": 0.0,
+    "outline": 0.05,
+    "transcript": 0.1,
+    "audio": 0.5,
+    "saving": 0.95,
+}
+
+
+class Job(BaseModel):
+    """A queued or running audio generation"""
+
+    job_id: str = Field(..., description="Job identifier")
+    status: JobStatus = Field(JobStatus.QUEUED, description="Job status")
+    phase: str = Field("queued", description="Current generation phase")
+    progress: float = Field(0.0, ge=0.0, le=1.0, description="Approximate completion (0-1)")
+    created_at: datetime = Field(default_factory=datetime.now, description="Submission time")
+    started_at: Optional[datetime] = Field(None, description="Time a worker picked the job up")
+    finished_at: Optional[datetime] = Field(None, description="Completion time")
+    output_path: Optional[str] = Field(None, description="Path to the generated file")
+    download_url: Optional[str] = Field(None, description="Download URL for the generated file")
+    duration_seconds: Optional[int] = Field(None, description="Generation time in seconds")
+    error: Optional[str] = Field(None, description="Error message if failed")
+
+    _config: ConversationConfig = PrivateAttr()
+    _outline_url: Optional[str] = PrivateAttr(default=None)
+    _usage_key: Optional[UsageKey] = PrivateAttr(default=None)
+    _result: Optional[ConversationResult] = PrivateAttr(default=None)
+    _done: asyncio.Event = PrivateAttr(default_factory=asyncio.Event)
+    _events: Optional[ProgressBus] = PrivateAttr(default=None)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.COMPLETED, JobStatus.FAILED)
+
+    @property
+    def result(self) -> Optional[ConversationResult]:
+        return self._result
+
+    @property
+    def events(self) -> ProgressBus:
+        """Progress events of this job"""
+        assert self._events is not None
+        return self._events
+
+    def publish_status(self) -> None:
+        self.events.publish("status", **self.model_dump(mode="json"))
+
+    def set_phase(self, phase: str) -> None:
+        self.phase = phase
+        self.progress = PHASE_PROGRESS.get(phase, self.progress)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "job_id": "5b0f6c1e9a7d4c1f8f8a3e2d1c0b9a87",
+                "status": "running",
+                "phase": "audio",
+                "progress": 0.5,
+                "created_at": "2024-01-01T12:00:00",
+                "started_at": "2024-01-01T12:00:01",
+                "finished_at": None,
+                "output_path": None,
+                "download_url": None,
+                "duration_seconds": None,
+                "error": None,
+            }
+        }
+
+
+class JobQueueFullError(Exception):
+    """Raised when the job queue has no room for another submission"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        # Estimated seconds until capacity frees up
+        self.retry_after = retry_after
+
+
+class JobManager:
+    """
+    Admission control for generation jobs.
+
+    Each job is charged its conversation duration in minutes. Jobs start while fewer than
+    `workers` are running and their cost fits in `capacity_minutes`; a job larger than
+    the whole capacity may still run on its own. Others wait in FIFO order in a queue
+    bounded by job count and queued minutes, and submissions beyond that are refused.
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue_size: Optional[int] = None):
+        self.workers = workers or int(os.getenv("JOB_WORKERS", "2"))
+        self.queue_size = queue_size or int(os.getenv("JOB_QUEUE_SIZE", "16"))
+        self.capacity_minutes = int(os.getenv("JOB_CAPACITY_MINUTES", "120"))
+        self.queue_minutes = int(os.getenv("JOB_QUEUE_MINUTES", "480"))
+        self.retention_seconds = int(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+        self._pending: Deque[Job] = deque()
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._jobs: Dict[str, Job] = {}
+        self._running_minutes = 0
+        self._queued_minutes = 0
+        # Generation seconds per minute of audio, refined as jobs complete
+        self._seconds_per_minute = 10.0
+        # Shared so outline fetches reuse connections
+        self._outline_processor = OutlineProcessor()
+        JOBS_IN_FLIGHT.set_function(lambda: len(self._tasks))
+        JOBS_QUEUED.set_function(lambda: len(self._pending))
+
+    async def stop(self) -> None:
+        """Cancel running jobs; they and any queued jobs are marked as failed"""
+        # Drop the queue first so finishing jobs do not start new ones
+        self._pending.clear()
+        self._queued_minutes = 0
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self._jobs.values():
+            if not job.is_finished:
+                self._finish(job, error="Server shutting down")
+        await self._outline_processor.aclose()
+
+    def submit(self, config: ConversationConfig, outline_url: Optional[str] = None) -> Job:
+        """Start or queue a generation and return its job right away"""
+        self._prune()
+        cost = self._cost(config)
+
+        starts_now = not self._pending and self._can_start(cost)
+        if not starts_now and (
+            len(self._pending) >= self.queue_size
+            or self._queued_minutes + cost > self.queue_minutes
+        ):
+            raise JobQueueFullError(
+                f"Server is at capacity ({len(self._tasks)} jobs running, "
+                f"{len(self._pending)} queued), try again later",
+                retry_after=self._estimate_retry_after(cost),
+            )
+
+        job = Job(job_id=uuid.uuid4().hex)
+        job._config = config
+        job._outline_url = outline_url
+        # Jobs start from other tasks, so the submitting request's key is kept explicitly
+        job._usage_key = current_usage_key()
+        job._events = ProgressBus()
+        self._jobs[job.job_id] = job
+        job.publish_status()
+
+        if starts_now:
+            self._start(job)
+        else:
+            self._pending.append(job)
+            self._queued_minutes += cost
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: Job) -> Job:
+        """Wait until a job has finished"""
+        await job._done.wait()
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running": len(self._tasks),
+            "queued": len(self._pending),
+            "queue_size": self.queue_size,
+            "running_minutes": self._running_minutes,
+            "queued_minutes": self._queued_minutes,
+            "capacity_minutes": self.capacity_minutes,
+            "queue_minutes": self.queue_minutes,
+        }
+
+    @staticmethod
+    def _cost(config: ConversationConfig) -> int:
+        return max(config.duration, 1)
+
+    def _can_start(self, cost: int) -> bool:
+        if len(self._tasks) >= self.workers:
+            return False
+        # An oversized job can still run alone rather than waiting forever
+        return self._running_minutes + cost <= self.capacity_minutes or not self._tasks
+
+    def _estimate_retry_after(self, cost: int) -> int:
+        """Rough time for the work ahead of a new job to drain, in seconds"""
+        backlog_minutes = self._queued_minutes + self._running_minutes + cost
+        seconds = backlog_minutes * self._seconds_per_minute / max(self.workers, 1)
+        return int(min(max(math.ceil(seconds), 1), 3600))
+
+    def _start(self, job: Job) -> None:
+        self._running_minutes += self._cost(job._config)
+        task = asyncio.ensure_future(self._execute(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_job_done)
+
+    def _on_job_done(self, task: "asyncio.Task[None]") -> None:
+        self._tasks.discard(task)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Start queued jobs, in order, while there is capacity"""
+        while self._pending and self._can_start(self._cost(self._pending[0]._config)):
+            job = self._pending.popleft()
+            self._queued_minutes -= self._cost(job._config)
+            self._start(job)
+
+    def _prune(self) -> None:
+        """Forget finished jobs past their retention period"""
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at and job.finished_at.timestamp() < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def _execute(self, job: Job) -> None:
+        cost = self._cost(job._config)
+        started = time.time()
+        try:
+            with progress_scope(job.events), usage_scope(job._usage_key):
+                await self._run(job)
+        except Exception as e:
+            self._finish(job, error=f"Unexpected error: {str(e)}")
+        finally:
+            self._running_minutes -= cost
+            if job.status == JobStatus.COMPLETED:
+                observed = (time.time() - started) / cost
+                self._seconds_per_minute = 0.8 * self._seconds_per_minute + 0.2 * observed
+
+    async def _run(self, job: Job) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now()
+        config = job._config
+        console.print(f"\n📬 [bold blue]JOB {job.job_id} STARTED[/bold blue]")
+        job.publish_status()
+
+        # Process outline if provided
+        if job._outline_url:
+            job.set_phase("outline")
+            emit_progress("phase", phase="outline")
+            outline_started = time.time()
+            console.print("\n📋 Processing outline from URL...")
+            outline_content, outline_error = await self._outline_processor.aprocess_outline(
+                job._outline_url
+            )
+
+            if outline_error:
+                print_warning(f"Outline processing failed: {outline_error}")
+                print_warning("Continuing without outline")
+            else:
+                config.outline = outline_content
+                config.outline_source = job._outline_url
+                console.print("   ✅ Outline processed successfully")
+            outline_seconds = time.time() - outline_started
+            PHASE_DURATION.observe(outline_seconds, phase="outline")
+            emit_progress("phase_complete", phase="outline", seconds=round(outline_seconds, 3))
+
+        generator = ConversationGenerator(config, on_phase=job.set_phase)
+        result = await generator.generate()
+        job._result = result
+
+        if result.success:
+            job.output_path = str(result.output_path)
+            if result.output_path:
+                job.download_url = f"/convergence/download/{Path(result.output_path).name}"
+            job.duration_seconds = result.duration_seconds
+            self._finish(job)
+        else:
+            self._finish(job, error=result.error or "Failed to generate audio conversation")
+
+    def _finish(self, job: Job, error: Optional[str] = None) -> None:
+        job.status = JobStatus.FAILED if error else JobStatus.COMPLETED
+        job.error = error or (job._result.error if job._result else None)
+        job.finished_at = datetime.now()
+        JOBS_FINISHED.inc(status=job.status.value)
+        if not error:
+            job.set_phase("completed")
+            job.progress = 1.0
+        job.publish_status()
+        job.events.close()
+        job._done.set()
+
+
+# Global instance
+_job_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Get or create the global job manager"""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager()
+    return _job_manager
@@ -2,18 +2,22 @@
 🛣️ API Routes for Convergence
 """
 
+import asyncio
+import json
 import os
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, field_validator
 
-from convergence.core.generator import ConversationGenerator
-from convergence.core.models import ConversationConfig, ConversationResult
-from convergence.services.outline import OutlineProcessor
-from convergence.utils.console import console, print_warning
+from convergence.api.audio_stream import iter_job_audio
+from convergence.api.file_response import file_response
+from convergence.api.jobs import Job, JobQueueFullError, JobStatus, get_job_manager
+from convergence.core.models import ConversationConfig
+from convergence.core.progress import ProgressEvent
+from convergence.utils.console import console
 
 router = APIRouter()
 
@@ -29,6 +33,12 @@ class GenerateAudioRequest(BaseModel):
     outline_url: Optional[str] = Field(
         None, description="URL to outline document (API only accepts URLs, not file paths)"
     )
+    transcript_batch_size: Optional[int] = Field(
+        None,
+        ge=1,
+        le=20,
+        description="Dialogue turns requested per chat completion (default: TRANSCRIPT_BATCH_SIZE)",
+    )
 
     @field_validator("outline_url")
     @classmethod
@@ -69,6 +79,38 @@ class GenerateAudioResponse(BaseModel):
         }
 
 
+def _build_config(request: GenerateAudioRequest, pipelined: bool = False) -> ConversationConfig:
+    """Create the generation settings for an API request"""
+    config = ConversationConfig(
+        prompt=request.prompt,
+        duration=request.duration,
+        vibe=request.vibe,
+        output_path=None,
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        pipelined=pipelined,
+    )
+    if request.transcript_batch_size is not None:
+        config.transcript_batch_size = request.transcript_batch_size
+    return config
+
+
+def _submit_job(request: GenerateAudioRequest, pipelined: bool = False) -> Job:
+    """Queue a generation job, mapping a full queue to 503"""
+    console.print("\n📡 [bold blue]API REQUEST[/bold blue]")
+    console.print(f"   Prompt: {request.prompt}")
+    console.print(f"   Duration: {request.duration} minutes")
+    console.print(f"   Vibe: {request.vibe}")
+    if request.outline_url:
+        console.print(f"   Outline URL: {request.outline_url}")
+
+    try:
+        return get_job_manager().submit(_build_config(request, pipelined), request.outline_url)
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)}
+        )
+
+
 @router.post(
     "/convergence/generate-audio",
     response_model=GenerateAudioResponse,
@@ -76,85 +118,196 @@ class GenerateAudioResponse(BaseModel):
     summary="Generate an audio conversation",
     description="Generate an AI-powered audio conversation based on the provided prompt and parameters",
 )
-async def generate_audio(
-    request: GenerateAudioRequest, background_tasks: BackgroundTasks
-) -> Dict[str, Any]:
+async def generate_audio(request: GenerateAudioRequest) -> Dict[str, Any]:
     """
     Generate an audio conversation
 
     This endpoint creates an AI-generated conversation between two personas
-    based on the provided prompt, duration, and vibe.
+    based on the provided prompt, duration, and vibe. The connection is held open
+    until the audio is ready; use POST /convergence/jobs for long conversations.
     """
-    console.print("\n📡 [bold blue]API REQUEST[/bold blue]")
-    console.print(f"   Prompt: {request.prompt}")
-    console.print(f"   Duration: {request.duration} minutes")
-    console.print(f"   Vibe: {request.vibe}")
-    if request.outline_url:
-        console.print(f"   Outline URL: {request.outline_url}")
+    job = _submit_job(request)
+    await get_job_manager().wait(job)
 
-    try:
-        # Process outline if provided
-        outline_content = None
-        outline_source = None
-        if request.outline_url:
-            console.print("\n📋 Processing outline from URL...")
-            outline_processor = OutlineProcessor()
-            outline_content, outline_error = outline_processor.process_outline(request.outline_url)
-
-            if outline_error:
-                print_warning(f"Outline processing failed: {outline_error}")
-                print_warning("Continuing without outline")
-            else:
-                outline_source = request.outline_url
-                console.print("   ✅ Outline processed successfully")
-
-        # Create configuration
-        config = ConversationConfig(
-            prompt=request.prompt,
-            duration=request.duration,
-            vibe=request.vibe,
-            outline=outline_content,
-            outline_source=outline_source,
-            output_path=None,
-            openai_api_key=os.getenv("OPENAI_API_KEY"),
-        )
+    if job.status == JobStatus.COMPLETED:
+        console.print("\n✅ [bold green]REQUEST COMPLETED[/bold green]")
+        return {
+            "success": True,
+            "output_path": job.output_path,
+            "duration_seconds": job.duration_seconds or 0,
+            "message": "Audio conversation generated successfully",
+        }
 
-        # Generate conversation
-        generator = ConversationGenerator(config)
-        result: ConversationResult = await generator.generate()
+    console.print("\n❌ [bold red]REQUEST FAILED[/bold red]")
+    raise HTTPException(
+        status_code=500, detail=job.error or "Failed to generate audio conversation"
+    )
 
-        if result.success:
-            console.print("\n✅ [bold green]REQUEST COMPLETED[/bold green]")
-            return {
-                "success": True,
-                "output_path": str(result.output_path),
-                "duration_seconds": result.duration_seconds or 0,
-                "message": "Audio conversation generated successfully",
-            }
-        else:
-            console.print("\n❌ [bold red]REQUEST FAILED[/bold red]")
-            raise HTTPException(
-                status_code=500, detail=result.error or "Failed to generate audio conversation"
-            )
 
-    except Exception as e:
-        console.print("\n❌ [bold red]REQUEST ERROR[/bold red]")
-        console.print(f"   Error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+@router.post(
+    "/convergence/jobs",
+    response_model=Job,
+    status_code=202,
+    tags=["Convergence"],
+    summary="Submit an audio generation job",
+    description="Queue an audio conversation for generation and return its job ID immediately",
+)
+async def submit_job(request: GenerateAudioRequest) -> Job:
+    """
+    Submit an audio generation job
+
+    Poll GET /convergence/jobs/{job_id} for its phase and progress. Returns 503 when
+    the job queue is full.
+    """
+    return _submit_job(request)
+
+
+@router.get(
+    "/convergence/jobs/{job_id}",
+    response_model=Job,
+    tags=["Convergence"],
+    summary="Get audio generation job status",
+    description="Report the status, phase, progress and result of a generation job",
+)
+async def get_job(job_id: str) -> Job:
+    """
+    Get a generation job
+
+    Completed jobs include the output path and a download URL. Finished jobs are
+    kept for JOB_RETENTION_SECONDS.
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+
+def _format_sse(event: ProgressEvent) -> str:
+    """Encode a progress event as a Server-Sent Events message"""
+    payload = json.dumps({"timestamp": event.timestamp, **event.data})
+    return f"id: {event.seq}\nevent: {event.event}\ndata: {payload}\n\n"
+
+
+@router.get(
+    "/convergence/jobs/{job_id}/events",
+    tags=["Convergence"],
+    summary="Stream audio generation progress",
+    description="Server-Sent Events stream of a job's progress until it finishes",
+)
+async def stream_job_events(
+    job_id: str, last_event_id: Optional[int] = Header(None)
+) -> StreamingResponse:
+    """
+    Stream the progress events of a generation job
+
+    Events already emitted are replayed first, so subscribing late loses nothing;
+    reconnecting clients send Last-Event-ID to skip the ones they have seen. Event types:
+    `status`, `phase`, `phase_complete`, `transcript_segment`, `audio_segment` and
+    `bytes_written`. The stream ends after the final `status` event.
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+    keepalive_seconds = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+
+    async def event_stream() -> AsyncIterator[str]:
+        events = job.events.subscribe()
+        next_event: "Optional[asyncio.Future[ProgressEvent]]" = None
+        try:
+            while True:
+                if next_event is None:
+                    next_event = asyncio.ensure_future(events.__anext__())
+                done, _ = await asyncio.wait({next_event}, timeout=keepalive_seconds)
+                if not done:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                try:
+                    event = next_event.result()
+                except StopAsyncIteration:
+                    return
+                next_event = None
+                if last_event_id is None or event.seq > last_event_id:
+                    yield _format_sse(event)
+        finally:
+            if next_event is not None:
+                next_event.cancel()
+                await asyncio.gather(next_event, return_exceptions=True)
+            await events.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _stream_job_audio(job: Job) -> StreamingResponse:
+    """Stream a job's audio as it is rendered"""
+    return StreamingResponse(
+        iter_job_audio(job),
+        media_type="audio/wav",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Job-ID": job.job_id},
+    )
+
+
+@router.post(
+    "/convergence/stream-audio",
+    tags=["Convergence"],
+    summary="Generate an audio conversation and stream it",
+    description="Generate an audio conversation and stream the audio while it is being rendered",
+    response_class=StreamingResponse,
+)
+async def stream_audio(request: GenerateAudioRequest) -> StreamingResponse:
+    """
+    Generate an audio conversation and stream it
+
+    The transcript and audio are generated together, and audio is sent as soon as the
+    first segment is rendered. The job ID is returned in the X-Job-ID header; the finished
+    file can be downloaded later from the job's download URL.
+    """
+    return _stream_job_audio(_submit_job(request, pipelined=True))
 
 
 @router.get(
+    "/convergence/jobs/{job_id}/audio",
+    tags=["Convergence"],
+    summary="Stream a job's audio",
+    description="Stream the audio of a generation job, starting before the job has finished",
+    response_class=StreamingResponse,
+)
+async def stream_job_audio(job_id: str, request: Request) -> Any:
+    """
+    Stream a job's audio
+
+    Audio rendered so far is sent right away and the rest follows as it is produced.
+    Completed jobs are served from the finished file.
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(status_code=409, detail=job.error or f"Job failed: {job_id}")
+    if job.status == JobStatus.COMPLETED and job.output_path:
+        return file_response(request, Path(job.output_path), media_type="audio/wav")
+    return _stream_job_audio(job)
+
+
+@router.api_route(
     "/convergence/download/{filename}",
+    methods=["GET", "HEAD"],
     tags=["Convergence"],
     summary="Download generated audio file",
     description="Download a previously generated audio conversation file",
 )
-async def download_audio(filename: str) -> FileResponse:
+async def download_audio(filename: str, request: Request) -> Response:
     """
     Download a generated audio file
 
     Provide the filename returned from the generate-audio endpoint
-    to download the audio file.
+    to download the audio file. Supports HEAD, byte ranges (for seeking and resuming)
+    and conditional requests with the returned ETag / Last-Modified.
     """
     file_path = Path("output") / filename
 
@@ -170,4 +323,7 @@ async def download_audio(filename: str) -> FileResponse:
     except ValueError:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    return FileResponse(path=file_path, media_type="audio/wav", filename=filename)
+    try:
+        return file_response(request, file_path, media_type="audio/wav", filename=filename)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"File not found: {filename}")
@@ -2,71 +2,158 @@
 🔑 API Key authentication handler
 """
 
+import asyncio
 import os
-from datetime import datetime, timedelta
-from functools import lru_cache
-from typing import Dict, Optional, cast
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
 
-from convergence.auth.google_sheets import get_sheets_client
+from convergence.auth.key_store import get_key_table, hash_api_key
 from convergence.auth.models import APIKey
 from convergence.utils.console import console
+from convergence.utils.metrics import API_KEYS_SHED
+
+
+class APIKeyCache:
+    """
+    Bounded TTL cache of validation results. Valid and unknown keys get separate TTLs,
+    and the least recently used entry is evicted once `max_entries` is reached.
+    Expiry uses monotonic seconds, so a lookup is a dict access and one clock read.
+    """
+
+    def __init__(self, positive_ttl: float, negative_ttl: float, max_entries: int):
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # api key -> (APIKey or None, expires at), least recently used first
+        self._entries: "OrderedDict[str, Tuple[Optional[APIKey], float]]" = OrderedDict()
+
+    def get(self, api_key: str) -> Tuple[bool, Optional[APIKey]]:
+        """Return (hit, api_key_obj); expired entries count as misses"""
+        entry = self._entries.get(api_key)
+        if entry is not None:
+            if entry[1] > time.monotonic():
+                self._entries.move_to_end(api_key)
+                self.hits += 1
+                return True, entry[0]
+            del self._entries[api_key]
+        self.misses += 1
+        return False, None
+
+    def set(self, api_key: str, api_key_obj: Optional[APIKey]) -> None:
+        ttl = self.positive_ttl if api_key_obj is not None else self.negative_ttl
+        if api_key_obj is not None and api_key_obj.expires_at is not None:
+            # Hits skip is_valid(), so a key must leave the cache when it expires
+            now = datetime.now(api_key_obj.expires_at.tzinfo)
+            ttl = min(ttl, (api_key_obj.expires_at - now).total_seconds())
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        self._entries[api_key] = (api_key_obj, time.monotonic() + ttl)
+        self._entries.move_to_end(api_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, api_key: Optional[str] = None) -> None:
+        """Drop one key, or every key when none is given"""
+        if api_key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(api_key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "positive_ttl": self.positive_ttl,
+            "negative_ttl": self.negative_ttl,
+        }
 
 
 class APIKeyAuth:
     """API Key authentication handler with caching"""
 
     def __init__(self) -> None:
-        self.sheets_client = get_sheets_client()
+        self.key_table = get_key_table()
         self.cache_duration = int(os.getenv("API_KEY_CACHE_DURATION", "300"))  # 5 minutes
-        self._cache: Dict[str, Dict] = {}
-
-    def _get_cache_key(self, api_key: str) -> str:
-        """Generate cache key for API key"""
-        return f"api_key:{api_key}"
-
-    def _is_cache_valid(self, cache_entry: Dict) -> bool:
-        """Check if cache entry is still valid"""
-        if "expires_at" not in cache_entry:
-            return False
-        return bool(datetime.now() < cache_entry["expires_at"])
+        self.cache = APIKeyCache(
+            positive_ttl=self.cache_duration,
+            negative_ttl=int(os.getenv("API_KEY_NEGATIVE_CACHE_DURATION", "60")),
+            max_entries=int(os.getenv("API_KEY_CACHE_SIZE", "1024")),
+        )
+        # Validations in progress, so concurrent requests with one key share a lookup
+        self._pending: Dict[str, "asyncio.Future[Optional[APIKey]]"] = {}
 
-    @lru_cache(maxsize=128)
     def validate_api_key(self, api_key: str) -> Optional[APIKey]:
         """
         Validate API key with caching
         Returns the APIKey object if valid, None otherwise
         """
+        if self._is_unknown(api_key):
+            return None
+
         # Check cache first
-        cache_key = self._get_cache_key(api_key)
+        cached, cached_obj = self.cache.get(api_key)
+        if cached:
+            return cached_obj
+
+        # Look up in the key table
+        console.print("   📊 Validating API key against the key table", style="dim")
+
+        return self._store(api_key, self.key_table.get(hash_api_key(api_key)))
+
+    async def avalidate_api_key(self, api_key: str) -> Optional[APIKey]:
+        """
+        Validate API key without blocking the event loop.
+        Concurrent cache misses for the same key are coalesced into one lookup.
+        """
+        if self._is_unknown(api_key):
+            return None
 
-        if cache_key in self._cache:
-            cache_entry = self._cache[cache_key]
-            if self._is_cache_valid(cache_entry):
-                console.print("   🚀 API key validated from cache", style="dim green")
-                return cast(Optional[APIKey], cache_entry.get("api_key_obj"))
+        cached, cached_obj = self.cache.get(api_key)
+        if cached:
+            return cached_obj
 
-        # Fetch from Google Sheets
-        console.print("   📊 Validating API key from Google Sheets", style="dim")
+        pending = self._pending.get(api_key)
+        if pending is None:
+            console.print("   📊 Validating API key against the key table", style="dim")
+            pending = asyncio.ensure_future(self._lookup(api_key))
+            self._pending[api_key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(api_key, None))
+        return await asyncio.shield(pending)
+
+    def _is_unknown(self, api_key: str) -> bool:
+        """
+        Shed keys the key filter rules out. They are not cached, so a scan with random
+        keys cannot evict real keys from the cache.
+        """
+        if self.key_table.might_exist(hash_api_key(api_key)):
+            return False
+        API_KEYS_SHED.inc()
+        return True
 
-        api_key_obj = self.sheets_client.get_api_key(api_key)
+    async def _lookup(self, api_key: str) -> Optional[APIKey]:
+        return self._store(api_key, await self.key_table.aget(hash_api_key(api_key)))
 
+    def _store(self, api_key: str, api_key_obj: Optional[APIKey]) -> Optional[APIKey]:
+        """Cache a lookup result and return the key if it is valid"""
         if api_key_obj and api_key_obj.is_valid():
-            # Cache the result
-            self._cache[cache_key] = {
-                "api_key_obj": api_key_obj,
-                "expires_at": datetime.now() + timedelta(seconds=self.cache_duration),
-            }
+            self.cache.set(api_key, api_key_obj)
             console.print(
                 f"   ✅ API key validated for: {api_key_obj.client_name}", style="dim green"
             )
             return api_key_obj
 
         # Cache negative result too (to avoid repeated lookups)
-        self._cache[cache_key] = {
-            "api_key_obj": None,
-            "expires_at": datetime.now() + timedelta(seconds=60),  # Cache failures for 1 minute
-        }
-
+        self.cache.set(api_key, None)
         return None
 
     def extract_api_key(self, authorization: Optional[str]) -> Optional[str]:
@@ -87,13 +174,7 @@ class APIKeyAuth:
 
     def clear_cache(self, api_key: Optional[str] = None) -> None:
         """Clear cache for a specific API key or all keys"""
-        if api_key:
-            cache_key = self._get_cache_key(api_key)
-            self._cache.pop(cache_key, None)
-            self.validate_api_key.cache_clear()
-        else:
-            self._cache.clear()
-            self.validate_api_key.cache_clear()
+        self.cache.invalidate(api_key)
 
     def get_rate_limit(self, api_key: str) -> Optional[int]:
         """Get rate limit for an API key"""
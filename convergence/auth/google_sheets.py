@@ -2,29 +2,34 @@
 📊 Google Sheets integration for API key management
 """
 
-import json
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import List, Optional
 
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from convergence.auth.key_store import KeyStore, KeyTable, get_key_table, hash_api_key
 from convergence.auth.models import APIKey
 from convergence.utils.console import console, print_error, print_success, print_warning
+from convergence.utils.metrics import API_KEY_LOOKUP_DURATION
 
 
-class GoogleSheetsClient:
+class GoogleSheetsClient(KeyStore):
     """Client for interacting with Google Sheets API"""
 
+    name = "google_sheets"
+
     def __init__(self, credentials_path: Optional[str] = None, sheet_id: Optional[str] = None):
         self.credentials_path = credentials_path or os.getenv("GOOGLE_CREDENTIALS_PATH")
         self.sheet_id = sheet_id or os.getenv("GOOGLE_SHEET_ID")
         self.sheet_name = os.getenv("GOOGLE_SHEET_NAME", "API_Keys")
         self.service = None
         self._initialized = False
+        # Key table behind get_api_key(), created on first use
+        self._key_table: Optional[KeyTable] = None
 
     def initialize(self) -> bool:
         """Initialize the Google Sheets client"""
@@ -67,9 +72,13 @@ class GoogleSheetsClient:
 
     def fetch_api_keys(self) -> List[APIKey]:
         """Fetch all API keys from Google Sheets"""
+        return self.load_api_keys() or []
+
+    def load_api_keys(self) -> Optional[List[APIKey]]:
+        """Fetch all API keys, or None if the sheet could not be read"""
         if not self._initialized:
             if not self.initialize():
-                return []
+                return None
 
         try:
             # Define the range to read (assuming headers in row 1)
@@ -77,14 +86,15 @@ class GoogleSheetsClient:
 
             # Execute the request
             if not self.service:
-                return []
-
-            result = (
-                self.service.spreadsheets()
-                .values()
-                .get(spreadsheetId=self.sheet_id, range=range_name)
-                .execute()
-            )
+                return None
+
+            with API_KEY_LOOKUP_DURATION.time(source="google_sheets"):
+                result = (
+                    self.service.spreadsheets()
+                    .values()
+                    .get(spreadsheetId=self.sheet_id, range=range_name)
+                    .execute()
+                )
 
             values = result.get("values", [])
             api_keys = []
@@ -112,18 +122,18 @@ class GoogleSheetsClient:
 
         except HttpError as e:
             print_error(f"Google Sheets API error: {str(e)}", "Authentication Error")
-            return []
+            return None
         except Exception as e:
             print_error(f"Failed to fetch API keys: {str(e)}", "Authentication Error")
-            return []
+            return None
 
     def get_api_key(self, api_key: str) -> Optional[APIKey]:
-        """Get a specific API key"""
-        api_keys = self.fetch_api_keys()
-        for key in api_keys:
-            if key.api_key == api_key:
-                return key
-        return None
+        """Get a specific API key from the in-memory key table"""
+        if self._key_table is None:
+            # Share the server's table when it is loaded from this sheet
+            key_table = get_key_table()
+            self._key_table = key_table if key_table.store is self else KeyTable(self)
+        return self._key_table.get(hash_api_key(api_key))
 
     def validate_api_key(self, api_key: str) -> bool:
         """Validate if an API key exists and is valid"""
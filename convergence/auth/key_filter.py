@@ -0,0 +1,41 @@
+"""
+🧮 Bloom filter for rejecting unknown API keys
+"""
+
+import hashlib
+import math
+from typing import Iterable, Sequence
+
+
+class KeyFilter:
+    """
+    Bloom filter over the known API keys. `might_contain` never returns False for a key
+    the filter was built from, and returns True for an unknown key with probability close
+    to `false_positive_rate`. Immutable: build a new one when the key table changes.
+    """
+
+    def __init__(self, keys: Sequence[str], false_positive_rate: float = 0.01):
+        count = max(len(keys), 1)
+        rate = min(max(false_positive_rate, 1e-9), 0.5)
+        self.size = max(int(math.ceil(-count * math.log(rate) / math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / count * math.log(2))), 1)
+        self.key_count = len(keys)
+        self._bits = bytearray((self.size + 7) // 8)
+        for key in keys:
+            for position in self._positions(key):
+                self._bits[position >> 3] |= 1 << (position & 7)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def might_contain(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
@@ -0,0 +1,277 @@
+"""
+🗃️ API key stores and the in-memory key table served from them
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from convergence.auth.key_filter import KeyFilter
+from convergence.auth.models import APIKey
+from convergence.utils.console import console, print_warning
+from convergence.utils.metrics import API_KEY_LOOKUP_DURATION
+
+
+def hash_api_key(api_key: str) -> str:
+    """Hex SHA-256 of an API key: what the key table is indexed on"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+class KeyStore(ABC):
+    """Source of the API key table"""
+
+    name = ""
+
+    @abstractmethod
+    def load_api_keys(self) -> Optional[List[APIKey]]:
+        """Fetch all API keys, or None if the store could not be read"""
+
+
+class SQLiteKeyStore(KeyStore):
+    """
+    Local key table in SQLite, populated from another store by `convergence --sync-api-keys`.
+    Keys are stored only as SHA-256 hashes, so loaded APIKey objects carry the hash in
+    `api_key`.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Optional[str] = None):
+        default_path = Path.home() / ".cache" / "convergence" / "api_keys.sqlite3"
+        self.path = Path(path or os.getenv("API_KEY_SQLITE_PATH") or default_path).expanduser()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema on first use (caller holds the lock)"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS api_keys (
+                    key_hash TEXT PRIMARY KEY,
+                    client_name TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    expires_at TEXT,
+                    is_active INTEGER NOT NULL,
+                    rate_limit INTEGER
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def load_api_keys(self) -> Optional[List[APIKey]]:
+        try:
+            with self._lock, API_KEY_LOOKUP_DURATION.time(source="sqlite"):
+                rows = (
+                    self._connect()
+                    .execute(
+                        "SELECT key_hash, client_name, created_at, expires_at, is_active, "
+                        "rate_limit FROM api_keys"
+                    )
+                    .fetchall()
+                )
+        except sqlite3.Error as e:
+            print_warning(f"Failed to read API keys from {self.path}: {str(e)}")
+            return None
+
+        return [
+            APIKey(
+                api_key=row[0],
+                client_name=row[1],
+                created_at=datetime.fromisoformat(row[2]),
+                expires_at=datetime.fromisoformat(row[3]) if row[3] else None,
+                is_active=bool(row[4]),
+                rate_limit=row[5],
+            )
+            for row in rows
+        ]
+
+    def replace_all(self, api_keys: Iterable[APIKey]) -> int:
+        """Replace the stored table with `api_keys` in one transaction; returns the row count"""
+        rows = [
+            (
+                hash_api_key(key.api_key),
+                key.client_name,
+                key.created_at.isoformat(),
+                key.expires_at.isoformat() if key.expires_at else None,
+                int(key.is_active),
+                key.rate_limit,
+            )
+            for key in api_keys
+        ]
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM api_keys")
+                conn.executemany("INSERT OR REPLACE INTO api_keys VALUES (?, ?, ?, ?, ?, ?)", rows)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+
+class KeyTable:
+    """
+    In-memory index of a key store, keyed by key hash and replaced wholesale on each
+    refresh. A Bloom filter over the same hashes lets unknown keys be rejected outright.
+    """
+
+    def __init__(self, store: KeyStore, hashed: bool = False):
+        self.store = store
+        # Whether the store's APIKey.api_key already holds the key hash
+        self.hashed = hashed
+        self.refresh_interval = int(os.getenv("API_KEY_REFRESH_SECONDS", "300"))
+        self.filter_false_positive_rate = float(os.getenv("API_KEY_FILTER_FP_RATE", "0.01"))
+        self._index: Dict[str, APIKey] = {}
+        self._filter: Optional[KeyFilter] = None
+        self._loaded_at: Optional[float] = None
+        self._refresh_lock = threading.Lock()
+        self._refresh_task: Optional["asyncio.Task[None]"] = None
+        self._initial_load: Optional["asyncio.Future[bool]"] = None
+
+    def refresh(self, wait: bool = False) -> bool:
+        """
+        Reload the key table and swap in a new index.
+        On failure the previous index is kept (stale-while-revalidate). If another refresh
+        is already running, returns False right away unless `wait` is set.
+        """
+        if not self._refresh_lock.acquire(blocking=wait):
+            return False
+        try:
+            api_keys = self.store.load_api_keys()
+            if api_keys is None:
+                if self._loaded_at is not None:
+                    print_warning("Key refresh failed, serving the previous key table")
+                return False
+            if self.hashed:
+                index = {key.api_key: key for key in api_keys}
+            else:
+                index = {hash_api_key(key.api_key): key for key in api_keys}
+            self._filter = KeyFilter(list(index), self.filter_false_positive_rate)
+            self._index = index
+            self._loaded_at = time.monotonic()
+            console.print(
+                f"   🗃️  Key table loaded from {self.store.name}: {len(index)} keys", style="dim"
+            )
+            return True
+        finally:
+            self._refresh_lock.release()
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the key table was last loaded, None if it never was"""
+        if self._loaded_at is None:
+            return None
+        return time.monotonic() - self._loaded_at
+
+    @property
+    def size(self) -> int:
+        return len(self._index)
+
+    @property
+    def filter_size_bytes(self) -> int:
+        return self._filter.size_bytes if self._filter is not None else 0
+
+    def might_exist(self, key_hash: str) -> bool:
+        """
+        False only if the key is definitely not in the loaded key table.
+        Always True before the first load, since nothing is known yet.
+        """
+        key_filter = self._filter
+        return key_filter is None or key_filter.might_contain(key_hash)
+
+    def get(self, key_hash: str) -> Optional[APIKey]:
+        """Look up a key by hash, loading the table first if it never was"""
+        if self._loaded_at is None:
+            # Nothing loaded yet (e.g. CLI use without the refresh loop)
+            self.refresh(wait=True)
+        else:
+            self._revalidate_if_stale()
+        return self._index.get(key_hash)
+
+    async def aget(self, key_hash: str) -> Optional[APIKey]:
+        """
+        Look up a key by hash without blocking the event loop.
+        If the table has not been loaded yet, concurrent callers share a single load that
+        runs in a worker thread.
+        """
+        if self._loaded_at is None:
+            if self._initial_load is None or self._initial_load.done():
+                self._initial_load = asyncio.ensure_future(asyncio.to_thread(self.refresh, True))
+            # Shielded so a cancelled request does not cancel the load for everyone else
+            await asyncio.shield(self._initial_load)
+        else:
+            self._revalidate_if_stale()
+        return self._index.get(key_hash)
+
+    def _revalidate_if_stale(self) -> None:
+        """Start a background reload if the table is older than the refresh interval"""
+        age = self.age
+        if age is not None and age > self.refresh_interval and not self._refresh_lock.locked():
+            # Serve the current table and revalidate off the request path
+            threading.Thread(target=self.refresh, daemon=True).start()
+
+    def start_background_refresh(self) -> None:
+        """Keep the key table fresh from a task on the running event loop"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh_loop())
+
+    async def stop_background_refresh(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            # Stores are blocking, so loads run in a worker thread
+            await asyncio.to_thread(self.refresh, True)
+            await asyncio.sleep(self.refresh_interval)
+
+
+def key_store_backend() -> str:
+    """Configured key store: `sheets` (default) or `sqlite`"""
+    backend = os.getenv("API_KEY_STORE", "sheets").lower()
+    if backend not in ("sheets", "sqlite"):
+        raise ValueError(f"Unknown API_KEY_STORE: {backend}")
+    return backend
+
+
+def sync_key_store(source: KeyStore, target: SQLiteKeyStore) -> Optional[int]:
+    """Copy every key from `source` into the local store; None if the source was unreadable"""
+    api_keys = source.load_api_keys()
+    if api_keys is None:
+        return None
+    return target.replace_all(api_keys)
+
+
+# Global instance
+_key_table: Optional[KeyTable] = None
+
+
+def get_key_table() -> KeyTable:
+    """Get or create the global key table for the configured store"""
+    global _key_table
+    if _key_table is None:
+        if key_store_backend() == "sqlite":
+            _key_table = KeyTable(SQLiteKeyStore(), hashed=True)
+        else:
+            from convergence.auth.google_sheets import get_sheets_client
+
+            _key_table = KeyTable(get_sheets_client())
+    return _key_table
@@ -2,61 +2,93 @@
 🛡️ Authentication middleware for FastAPI
 """
 
-from typing import Any, Callable
+from typing import Dict, NamedTuple, Optional, Union
 
-from fastapi import Request
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from convergence.auth.api_key import get_api_key_auth
+from convergence.auth.key_store import hash_api_key
+from convergence.auth.models import APIKey
+from convergence.auth.rate_limit import get_rate_limiter
+from convergence.core.usage import UsageKey, get_usage_meter, usage_scope
 from convergence.utils.console import console
 
 
-class APIKeyMiddleware(BaseHTTPMiddleware):
-    """Middleware to validate API keys on protected endpoints"""
+class AuthResult(NamedTuple):
+    """An authenticated request: the key, and headers to add to its response"""
+
+    api_key: APIKey
+    usage_key: UsageKey
+    response_headers: Dict[str, str]
+
+
+class APIKeyMiddleware:
+    """
+    Middleware to validate API keys on protected endpoints.
+    Plain ASGI, so responses (including streamed downloads) pass through untouched apart
+    from the added headers.
+    """
 
     def __init__(self, app: ASGIApp, auth_enabled: bool = True):
-        super().__init__(app)
+        self.app = app
         self.auth_enabled = auth_enabled
         self.api_key_auth = get_api_key_auth()
+        self.rate_limiter = get_rate_limiter()
+        self.usage_meter = get_usage_meter()
 
         # Endpoints that don't require authentication
-        self.public_endpoints = {"/health", "/docs", "/openapi.json", "/redoc", "/favicon.ico"}
+        self.public_endpoints = frozenset(
+            {"/health", "/docs", "/openapi.json", "/redoc", "/favicon.ico"}
+        )
 
-        # Endpoints that require authentication
-        self.protected_prefixes = ["/convergence/"]
+        # Endpoints that require authentication, as a tuple for a single startswith()
+        self.protected_prefixes = ("/convergence/",)
 
     def _is_protected_endpoint(self, path: str) -> bool:
         """Check if an endpoint requires authentication"""
-        # Public endpoints don't need auth
-        if path in self.public_endpoints:
-            return False
-
-        # Check if path starts with any protected prefix
-        for prefix in self.protected_prefixes:
-            if path.startswith(prefix):
-                return True
-
-        return False
-
-    async def dispatch(self, request: Request, call_next: Callable[..., Any]) -> Any:
-        """Process the request and validate API key if needed"""
-
-        # Skip auth if disabled
-        if not self.auth_enabled:
-            return await call_next(request)
-
-        # Check if endpoint needs protection
-        if not self._is_protected_endpoint(request.url.path):
-            return await call_next(request)
+        return path not in self.public_endpoints and path.startswith(self.protected_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Validate the API key of protected HTTP requests, then pass them on"""
+        if (
+            not self.auth_enabled
+            or scope["type"] != "http"
+            or not self._is_protected_endpoint(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        result = await self.authenticate(Headers(scope=scope), scope["path"])
+        if isinstance(result, JSONResponse):
+            await result(scope, receive, send)
+            return
 
+        # Add API key info to request state
+        state = scope.setdefault("state", {})
+        state["api_key"] = result.api_key
+        state["client_name"] = result.api_key.client_name
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in result.response_headers.items():
+                    headers[name] = value
+            await send(message)
+
+        # Bill work the request starts to the same key
+        with usage_scope(result.usage_key):
+            await self.app(scope, receive, send_with_headers)
+
+    async def authenticate(self, headers: Headers, path: str) -> Union[AuthResult, JSONResponse]:
+        """Validate a request's API key and rate limit; returns the error response on failure"""
         # Extract API key from header
-        authorization = request.headers.get("Authorization")
+        authorization: Optional[str] = headers.get("authorization")
         api_key = self.api_key_auth.extract_api_key(authorization)
 
         if not api_key:
-            console.print(f"   ❌ Missing API key for: {request.url.path}", style="red dim")
+            console.print(f"   ❌ Missing API key for: {path}", style="red dim")
             return JSONResponse(
                 status_code=401,
                 content={
@@ -67,7 +99,7 @@ class APIKeyMiddleware(BaseHTTPMiddleware):
             )
 
         # Validate API key
-        api_key_obj = self.api_key_auth.validate_api_key(api_key)
+        api_key_obj = await self.api_key_auth.avalidate_api_key(api_key)
 
         if not api_key_obj:
             console.print(f"   ❌ Invalid API key attempted: {api_key[:10]}...", style="red dim")
@@ -79,19 +111,29 @@ class APIKeyMiddleware(BaseHTTPMiddleware):
                 },
             )
 
-        # Add API key info to request state
-        request.state.api_key = api_key_obj
-        request.state.client_name = api_key_obj.client_name
-
-        # Log successful auth
-        console.print(
-            f"   🔐 Authenticated request from: {api_key_obj.client_name}", style="green dim"
-        )
+        # Enforce the key's request limit
+        rate_limit = await self.rate_limiter.hit(api_key, api_key_obj.rate_limit)
+        if rate_limit and not rate_limit.allowed:
+            console.print(
+                f"   ⏱️  Rate limit exceeded for: {api_key_obj.client_name}", style="yellow dim"
+            )
+            return JSONResponse(
+                status_code=429,
+                content={
+                    "error": "Rate limit exceeded",
+                    "detail": f"Limit of {rate_limit.limit} requests per "
+                    f"{self.rate_limiter.window_seconds} seconds reached",
+                },
+                headers=self.rate_limiter.headers(rate_limit),
+            )
 
-        # Continue with the request
-        response = await call_next(request)
+        # Meter the request
+        usage_key = UsageKey(hash_api_key(api_key), api_key_obj.client_name)
+        self.usage_meter.record(usage_key.key_hash, usage_key.client_name, requests=1)
 
         # Add client info to response headers
-        response.headers["X-Client-Name"] = api_key_obj.client_name
+        response_headers = {"X-Client-Name": api_key_obj.client_name}
+        if rate_limit:
+            response_headers.update(self.rate_limiter.headers(rate_limit))
 
-        return response
+        return AuthResult(api_key_obj, usage_key, response_headers)
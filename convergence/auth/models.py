@@ -16,7 +16,9 @@ class APIKey(BaseModel):
     created_at: datetime = Field(..., description="Creation date")
     expires_at: Optional[datetime] = Field(None, description="Expiration date")
     is_active: bool = Field(True, description="Whether the key is active")
-    rate_limit: Optional[int] = Field(None, description="Requests per hour limit")
+    rate_limit: Optional[int] = Field(
+        None, description="Requests allowed per rate limit window (one minute by default)"
+    )
 
     def is_valid(self) -> bool:
         """Check if the API key is currently valid"""
@@ -0,0 +1,222 @@
+"""
+⏱️ Per-API-key rate limiting
+"""
+
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from convergence.auth.key_store import hash_api_key
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of counting one request against a limit"""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    # Seconds until the current window ends
+    reset_seconds: int
+    # Seconds to wait before a retry can succeed (0 when allowed)
+    retry_after: int
+
+
+def _sliding_window(
+    state: Tuple[int, int, int], limit: int, window: int, now: float
+) -> Tuple[Tuple[int, int, int], RateLimitResult]:
+    """
+    Sliding window counter: the previous fixed window's count is weighted by how much of
+    it still overlaps the sliding window ending now. `state` is
+    (window_start, current_count, previous_count); returns the new state and the result.
+    """
+    window_start, current, previous = state
+    current_start = int(now // window) * window
+    if window_start != current_start:
+        # Roll over: the old current window becomes the previous one if it is adjacent
+        previous = current if window_start == current_start - window else 0
+        current = 0
+        window_start = current_start
+
+    elapsed = (now - current_start) / window
+    estimated = previous * (1 - elapsed) + current
+    reset_seconds = max(int(math.ceil(current_start + window - now)), 1)
+
+    if estimated + 1 > limit:
+        if previous and current + 1 <= limit:
+            # Wait until enough of the previous window has slid out
+            needed = 1 - (limit - current - 1) / previous
+            retry_after = max(int(math.ceil(current_start + needed * window - now)), 1)
+        else:
+            # The current window is full: once it becomes the previous one, wait until
+            # enough of it has slid out as well
+            needed = max(1 - (limit - 1) / current, 0) if current else 0
+            retry_after = reset_seconds + int(math.ceil(needed * window))
+        result = RateLimitResult(False, limit, 0, reset_seconds, retry_after)
+        return (window_start, current, previous), result
+
+    current += 1
+    remaining = max(int(limit - estimated - 1), 0)
+    return (window_start, current, previous), RateLimitResult(
+        True, limit, remaining, reset_seconds, 0
+    )
+
+
+class RateLimitStore(ABC):
+    """Storage for per-key window counters"""
+
+    # Whether hit() may block on IO and should run off the event loop
+    blocking = False
+
+    @abstractmethod
+    def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        """Count a request for `key` and report whether it is within `limit` per `window`"""
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    In-process counters: three integers per key. Keys idle for more than a window are
+    dropped during periodic cleanup. Counters are not shared between worker processes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._state: Dict[str, Tuple[int, int, int]] = {}
+        self._next_cleanup = 0.0
+
+    def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        now = time.time()
+        with self._lock:
+            if now >= self._next_cleanup:
+                self._cleanup(now, window)
+                self._next_cleanup = now + window
+            state, result = _sliding_window(self._state.get(key, (0, 0, 0)), limit, window, now)
+            self._state[key] = state
+            return result
+
+    def _cleanup(self, now: float, window: int) -> None:
+        """Forget keys whose counters can no longer affect a decision (caller holds the lock)"""
+        oldest_useful = int(now // window) * window - window
+        stale = [key for key, state in self._state.items() if state[0] < oldest_useful]
+        for key in stale:
+            del self._state[key]
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """
+    Counters in a local SQLite database, shared by every worker process on the host.
+    Each hit is a short IMMEDIATE transaction, so concurrent workers never double-count.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                key TEXT PRIMARY KEY,
+                window_start INTEGER NOT NULL,
+                current_count INTEGER NOT NULL,
+                previous_count INTEGER NOT NULL
+            )
+            """
+        )
+        self._next_cleanup = 0.0
+
+    def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if now >= self._next_cleanup:
+                    oldest_useful = int(now // window) * window - window
+                    self._conn.execute(
+                        "DELETE FROM rate_limits WHERE window_start < ?", (oldest_useful,)
+                    )
+                    self._next_cleanup = now + window
+                row = self._conn.execute(
+                    "SELECT window_start, current_count, previous_count "
+                    "FROM rate_limits WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                stored = (row[0], row[1], row[2]) if row else (0, 0, 0)
+                state, result = _sliding_window(stored, limit, window, now)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_limits "
+                    "(key, window_start, current_count, previous_count) VALUES (?, ?, ?, ?)",
+                    (key, *state),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return result
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RateLimiter:
+    """Sliding-window request limiter keyed by API key"""
+
+    def __init__(self, store: Optional[RateLimitStore] = None):
+        self.window_seconds = int(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "60"))
+        self.store = store or self._create_store()
+
+    @staticmethod
+    def _create_store() -> RateLimitStore:
+        backend = os.getenv("RATE_LIMIT_STORE", "memory").lower()
+        if backend == "sqlite":
+            default_path = Path.home() / ".cache" / "convergence" / "rate_limits.sqlite3"
+            return SQLiteRateLimitStore(os.getenv("RATE_LIMIT_SQLITE_PATH") or str(default_path))
+        if backend != "memory":
+            raise ValueError(f"Unknown RATE_LIMIT_STORE: {backend}")
+        return MemoryRateLimitStore()
+
+    async def hit(self, key: str, limit: Optional[int]) -> Optional[RateLimitResult]:
+        """Count a request; returns None for keys without a limit"""
+        if not limit or limit <= 0:
+            return None
+        # Stores never see the raw API key
+        store_key = hash_api_key(key)
+        if self.store.blocking:
+            return await asyncio.to_thread(self.store.hit, store_key, limit, self.window_seconds)
+        return self.store.hit(store_key, limit, self.window_seconds)
+
+    @staticmethod
+    def headers(result: RateLimitResult) -> Dict[str, str]:
+        """Standard X-RateLimit-* response headers"""
+        headers = {
+            "X-RateLimit-Limit": str(result.limit),
+            "X-RateLimit-Remaining": str(result.remaining),
+            "X-RateLimit-Reset": str(result.reset_seconds),
+        }
+        if not result.allowed:
+            headers["Retry-After"] = str(result.retry_after)
+        return headers
+
+
+# Global instance
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get or create the global rate limiter"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+    return _rate_limiter
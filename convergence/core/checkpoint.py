@@ -0,0 +1,100 @@
+"""
+💾 Transcript checkpoints for resumable generation
+"""
+
+import hashlib
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Collection, Dict, List
+
+from convergence.core.models import ConversationConfig, TranscriptItem
+
+
+def config_fingerprint(config: ConversationConfig) -> Dict[str, Any]:
+    """The settings that shape a transcript: equal fingerprints can share a checkpoint"""
+    return {
+        "prompt": config.prompt,
+        "vibe": config.vibe,
+        "duration": config.duration,
+        "outline": config.outline,
+    }
+
+
+def workspace_key(config: ConversationConfig) -> str:
+    """Stable name for a generation's workspace, the same on every attempt"""
+    payload = json.dumps(config_fingerprint(config), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def prune_workspaces(root: Path, max_age_seconds: float, keep: Collection[Path] = ()) -> int:
+    """
+    Remove workspaces under `root` untouched for `max_age_seconds`, apart from those in
+    `keep`. Also removes `*.work` directories next to `root` left by the old per-output
+    layout. Returns the number removed.
+    """
+    cutoff = time.time() - max_age_seconds
+    candidates = list(root.iterdir()) if root.is_dir() else []
+    if root.parent.is_dir():
+        candidates += root.parent.glob("*.work")
+    removed = 0
+    for path in candidates:
+        try:
+            if path in keep or not path.is_dir() or path.stat().st_mtime > cutoff:
+                continue
+        except OSError:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        removed += 1
+    return removed
+
+
+class TranscriptCheckpoint:
+    """
+    Append-only JSONL record of completed transcript items.
+
+    The first line fingerprints the settings that shape the transcript; a checkpoint
+    written for different settings is ignored and overwritten.
+    """
+
+    def __init__(self, path: Path, config: ConversationConfig):
+        self.path = path
+        self.fingerprint = config_fingerprint(config)
+
+    def load(self) -> List[TranscriptItem]:
+        """Return the items completed by a previous attempt, if any"""
+        if not self.path.exists():
+            return []
+
+        items: List[TranscriptItem] = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                header = f.readline()
+                if not header or json.loads(header) != self.fingerprint:
+                    return []
+                for line in f:
+                    if not line.strip():
+                        continue
+                    items.append(TranscriptItem.model_validate_json(line))
+        except (OSError, ValueError):
+            # A torn last line from a crash: keep everything before it
+            pass
+        return items
+
+    def start(self, items: List[TranscriptItem]) -> None:
+        """Rewrite the checkpoint with the header and the items that are being kept"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self.fingerprint) + "\n")
+            for item in items:
+                f.write(item.model_dump_json() + "\n")
+
+    def append(self, item: TranscriptItem) -> None:
+        """Record a completed item"""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(item.model_dump_json() + "\n")
+
+    def clear(self) -> None:
+        """Remove the checkpoint once the job no longer needs it"""
+        self.path.unlink(missing_ok=True)
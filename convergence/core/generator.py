@@ -3,21 +3,75 @@
 """
 
 import asyncio
+import os
+import shutil
+import threading
 import time
+import uuid
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Callable, List, Optional, Set, Tuple
 
-from convergence.core.models import ConversationConfig, ConversationResult, Conversation
-from convergence.ai.transcript_generator import generate_transcript as generate_transcript_ai
-from convergence.ai.text_to_speech import conversation_to_audio
+from convergence.core.models import (
+    ConversationConfig,
+    ConversationResult,
+    Conversation,
+    Transcript,
+    TranscriptItem,
+)
+from convergence.core.checkpoint import TranscriptCheckpoint, prune_workspaces, workspace_key
+from convergence.core.progress import emit_progress
+from convergence.core.usage import record_usage
+from convergence.ai.transcript_generator import generate_transcript_async, iter_transcript_items
+from convergence.ai.text_to_speech import (
+    conversation_to_audio_file_async,
+    transcript_items_to_audio_file_async,
+)
 from convergence.utils.console import print_error, print_info, print_success, print_warning
+from convergence.utils.metrics import PHASE_DURATION, RETRIES, TRANSCRIPT_FALLBACKS
+from convergence.utils.wav import wav_duration_seconds
+
+# Directory, next to the outputs, that holds one workspace per conversation
+WORKSPACE_DIRNAME = ".work"
 
 
 class ConversationGenerator:
     """Main generator for creating AI-powered audio conversations"""
 
-    def __init__(self, config: ConversationConfig):
+    # Workspaces in use by generators in this process
+    _active_workspaces: Set[Path] = set()
+    _workspace_lock = threading.Lock()
+
+    def __init__(
+        self,
+        config: ConversationConfig,
+        on_phase: Optional[Callable[[str], None]] = None,
+    ):
         self.config = config
+        # Called with "transcript", "audio" or "saving" as each phase starts
+        self.on_phase = on_phase
+        self._phase: Optional[str] = None
+        self._phase_started = 0.0
+        self.workspace_retention = float(os.getenv("WORKSPACE_RETENTION_SECONDS", "604800"))
+        self._workspace_dir: Optional[Path] = None
+
+    def _set_phase(self, phase: str) -> None:
+        if phase == self._phase:
+            return
+        self._end_phase()
+        self._phase = phase
+        self._phase_started = time.time()
+        emit_progress("phase", phase=phase)
+        if self.on_phase:
+            self.on_phase(phase)
+
+    def _end_phase(self) -> None:
+        """Report how long the current phase took"""
+        if self._phase is None:
+            return
+        seconds = time.time() - self._phase_started
+        PHASE_DURATION.observe(seconds, phase=self._phase)
+        emit_progress("phase_complete", phase=self._phase, seconds=round(seconds, 3))
+        self._phase = None
 
     async def generate(self) -> ConversationResult:
         """
@@ -26,31 +80,53 @@ class ConversationGenerator:
         start_time = time.time()
 
         try:
-            # Step 1: Generate transcript
-            print_info("🧬 Generating conversation transcript...", "Phase 1")
-            transcript = await self._generate_transcript_with_retry()
+            transcript: Optional[Transcript] = None
+            partial_path: Optional[Path] = None
+
+            # Pipelined mode: render audio while the transcript is being generated.
+            # Whatever it does not finish is retried by the phased steps below.
+            if self.config.pipelined:
+                print_info("🧬 Generating transcript and audio together...", "Phase 1+2")
+                self._set_phase("transcript")
+                transcript, partial_path = await self._generate_pipelined()
 
             if not transcript:
-                return ConversationResult(
-                    success=False, error="Failed to generate transcript after retries"
-                )
+                # Step 1: Generate transcript
+                print_info("🧬 Generating conversation transcript...", "Phase 1")
+                self._set_phase("transcript")
+                transcript = await self._generate_transcript_with_retry()
+
+                if not transcript:
+                    return ConversationResult(
+                        success=False, error="Failed to generate transcript after retries"
+                    )
 
-            # Step 2: Convert to audio
-            print_info("🎵 Converting transcript to audio...", "Phase 2")
-            audio_data = await self._convert_to_audio_with_retry(transcript)
+            if not partial_path:
+                # Step 2: Convert to audio, streaming segments into a partial file
+                print_info("🎵 Converting transcript to audio...", "Phase 2")
+                self._set_phase("audio")
+                partial_path = await self._convert_to_audio_with_retry(transcript)
 
-            if not audio_data:
-                # Fallback: Save transcript only
-                print_warning("Audio generation failed, saving transcript only")
-                return self._save_transcript_fallback(transcript)
+                if not partial_path:
+                    # Fallback: Save transcript only
+                    print_warning("Audio generation failed, saving transcript only")
+                    TRANSCRIPT_FALLBACKS.inc()
+                    result = self._save_transcript_fallback(transcript)
+                    if result.success:
+                        self._clear_workspace()
+                    return result
 
             # Step 3: Save audio file
             print_info("💾 Writing audio to file...", "Phase 3")
-            output_path = await self._save_audio_with_retry(audio_data)
+            self._set_phase("saving")
+            output_path = await self._save_audio_with_retry(partial_path)
 
             if not output_path:
                 return ConversationResult(success=False, error="Failed to save audio file")
 
+            self._clear_workspace()
+            self._record_usage(transcript, output_path)
+
             # Calculate duration
             duration_seconds = int(time.time() - start_time)
 
@@ -68,14 +144,27 @@ class ConversationGenerator:
         except Exception as e:
             print_error(f"Unexpected error: {str(e)}", "Generation Failed")
             return ConversationResult(success=False, error=f"Unexpected error: {str(e)}")
+        finally:
+            self._end_phase()
+            self._release_workspace()
+
+    def _record_usage(self, transcript: Transcript, output_path: Path) -> None:
+        """Bill the generated audio to the API key the generation runs for"""
+        audio_seconds = wav_duration_seconds(output_path)
+        minutes = audio_seconds / 60 if audio_seconds is not None else float(self.config.duration)
+        record_usage(
+            minutes=minutes,
+            tts_characters=sum(len(item.message) for item in transcript.items),
+        )
 
     async def _generate_transcript_with_retry(self, max_retries: int = 3):
         """Generate transcript with retry logic"""
         for attempt in range(max_retries):
             try:
                 # Use the real AI transcript generator
-                transcript, error = await asyncio.to_thread(
-                    generate_transcript_ai, self.config
+                # Resumes after the last turn checkpointed by a previous attempt
+                transcript, error = await generate_transcript_async(
+                    self.config, checkpoint=self._get_checkpoint()
                 )
                 if error:
                     raise Exception(error)
@@ -84,13 +173,148 @@ class ConversationGenerator:
             except Exception as e:
                 print_warning(f"Attempt {attempt + 1} failed: {str(e)}")
                 if attempt < max_retries - 1:
+                    RETRIES.inc(operation="transcript")
                     await asyncio.sleep(2**attempt)  # Exponential backoff
         return None
 
+    async def _generate_pipelined(self) -> Tuple[Optional[Transcript], Optional[Path]]:
+        """
+        Generate the transcript and its audio concurrently.
+        Items flow from the transcript generator to the TTS workers through a bounded queue,
+        so audio rendering starts with the first turn.
+        Returns (transcript, partial_path) for whichever parts completed: a failed transcript
+        returns (None, None), a failed audio render still returns the finished transcript.
+        """
+        partial_path = self._get_partial_path()
+        queue: "asyncio.Queue[Optional[TranscriptItem]]" = asyncio.Queue(
+            maxsize=self.config.tts_concurrency * 2
+        )
+        transcript_items: List[TranscriptItem] = []
+        transcript_errors: List[str] = []
+        consumed_all = False
+
+        async def produce() -> None:
+            try:
+                async for item in iter_transcript_items(
+                    self.config, checkpoint=self._get_checkpoint()
+                ):
+                    transcript_items.append(item)
+                    await queue.put(item)
+            except Exception as e:
+                transcript_errors.append(str(e))
+            finally:
+                # End-of-transcript marker
+                await queue.put(None)
+
+        async def queued_items() -> AsyncIterator[TranscriptItem]:
+            nonlocal consumed_all
+            while True:
+                item = await queue.get()
+                if item is None:
+                    consumed_all = True
+                    if transcript_errors:
+                        raise RuntimeError(transcript_errors[0])
+                    return
+                # Audio starts with the first turn; the transcript carries on alongside it
+                self._set_phase("audio")
+                yield item
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            bytes_written, audio_error = await transcript_items_to_audio_file_async(
+                queued_items(),
+                partial_path,
+                self.config.openai_api_key or "",
+                max_concurrency=self.config.tts_concurrency,
+            )
+
+            # If audio failed first, keep taking items so the transcript can finish
+            while not consumed_all:
+                consumed_all = await queue.get() is None
+            await producer
+        finally:
+            producer.cancel()
+
+        if transcript_errors:
+            print_warning(f"Pipelined transcript generation failed: {transcript_errors[0]}")
+            partial_path.unlink(missing_ok=True)
+            return None, None
+
+        transcript = Transcript(items=transcript_items)
+        if audio_error or not bytes_written:
+            print_warning(f"Pipelined audio conversion failed: {audio_error}")
+            partial_path.unlink(missing_ok=True)
+            return transcript, None
+
+        return transcript, partial_path
+
+    def _get_workspace_dir(self) -> Path:
+        """
+        Workspace for intermediate files, named after the conversation's settings rather
+        than its output path, so a retried or resubmitted job finds its checkpoint.
+        It survives failed runs; workspaces left untouched for `workspace_retention`
+        seconds are removed when a new one is claimed.
+        """
+        if self._workspace_dir is None:
+            root = self._get_output_path().parent / WORKSPACE_DIRNAME
+            key = workspace_key(self.config)
+            cls = type(self)
+            with cls._workspace_lock:
+                prune_workspaces(root, self.workspace_retention, keep=cls._active_workspaces)
+                # Identical conversations running at the same time get separate workspaces
+                workspace_dir = root / key
+                copy = 1
+                while workspace_dir in cls._active_workspaces:
+                    copy += 1
+                    workspace_dir = root / f"{key}-{copy}"
+                cls._active_workspaces.add(workspace_dir)
+            workspace_dir.mkdir(parents=True, exist_ok=True)
+            # Mark it as recently used for pruning
+            os.utime(workspace_dir)
+            self._workspace_dir = workspace_dir
+        return self._workspace_dir
+
+    def _release_workspace(self) -> None:
+        """Let other generators claim this workspace"""
+        if self._workspace_dir is not None:
+            with self._workspace_lock:
+                self._active_workspaces.discard(self._workspace_dir)
+            self._workspace_dir = None
+
+    def _get_checkpoint(self) -> TranscriptCheckpoint:
+        """Checkpoint of completed transcript items in the workspace"""
+        return TranscriptCheckpoint(self._get_workspace_dir() / "transcript.jsonl", self.config)
+
+    def _clear_workspace(self) -> None:
+        """Remove the workspace once the result has been saved"""
+        shutil.rmtree(self._get_workspace_dir(), ignore_errors=True)
+        self._release_workspace()
+
+    def _get_partial_path(self) -> Path:
+        """Path that audio is rendered into before being moved to the output path"""
+        return self._get_workspace_dir() / "audio.wav.part"
+
+    def _get_output_path(self) -> Path:
+        """Resolve the output path, generating a default one if not provided"""
+        if not self.config.output_path:
+            from datetime import datetime
+
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Concurrent jobs can start within the same second
+            suffix = uuid.uuid4().hex[:6]
+            self.config.output_path = Path(f"output/convergence_audio_{timestamp}_{suffix}.wav")
+        return self.config.output_path
+
     async def _convert_to_audio_with_retry(
         self, transcript, max_retries: int = 2
-    ) -> Optional[bytes]:
-        """Convert transcript to audio with retry logic"""
+    ) -> Optional[Path]:
+        """
+        Convert transcript to audio with retry logic.
+        Segments are streamed into a partial file next to the output path, which is
+        returned on success and removed on failure.
+        """
+        partial_path = self._get_partial_path()
+
         for attempt in range(max_retries):
             try:
                 # Create a Conversation object from the transcript
@@ -98,61 +322,49 @@ class ConversationGenerator:
                     transcript=transcript,
                     config=self.config
                 )
-                
+
                 # Use the real TTS service
-                audio_data, error = await asyncio.to_thread(
-                    conversation_to_audio,
+                bytes_written, error = await conversation_to_audio_file_async(
                     conversation,
+                    partial_path,
                     self.config.openai_api_key or "",
-                    "nova"  # Default voice
                 )
-                
+
                 if error:
                     raise Exception(error)
-                if audio_data:
-                    return audio_data
+                if bytes_written:
+                    return partial_path
             except Exception as e:
                 print_warning(f"Audio conversion attempt {attempt + 1} failed: {str(e)}")
                 if attempt < max_retries - 1:
+                    RETRIES.inc(operation="audio")
                     await asyncio.sleep(2**attempt)
+
+        partial_path.unlink(missing_ok=True)
         return None
 
     async def _save_audio_with_retry(
-        self, audio_data: bytes, max_retries: int = 2
+        self, partial_path: Path, max_retries: int = 2
     ) -> Optional[Path]:
-        """Save audio to file with retry logic"""
-        # Generate default path if not provided
-        if not self.config.output_path:
-            from datetime import datetime
-
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self.config.output_path = Path(f"output/convergence_audio_{timestamp}.wav")
-
-        # Ensure output directory exists
-        self.config.output_path.parent.mkdir(parents=True, exist_ok=True)
+        """Move the rendered audio into place with retry logic"""
+        output_path = self._get_output_path()
 
         for attempt in range(max_retries):
             try:
-                # Write the audio data directly
-                self.config.output_path.write_bytes(audio_data)
-                return self.config.output_path
+                # Atomic rename, so readers never see a half-written file
+                os.replace(partial_path, output_path)
+                return output_path
             except Exception as e:
                 print_warning(f"Save attempt {attempt + 1} failed: {str(e)}")
                 if attempt < max_retries - 1:
+                    RETRIES.inc(operation="save")
                     await asyncio.sleep(1)
         return None
 
     def _save_transcript_fallback(self, transcript) -> ConversationResult:
         """Fallback to save transcript as JSON file"""
         try:
-            # Generate default path if not provided
-            if not self.config.output_path:
-                from datetime import datetime
-
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                self.config.output_path = Path(f"output/convergence_audio_{timestamp}.wav")
-
-            transcript_path = self.config.output_path.with_suffix(".json")
+            transcript_path = self._get_output_path().with_suffix(".json")
             transcript_path.parent.mkdir(parents=True, exist_ok=True)
             
             # Save as JSON
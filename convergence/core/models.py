@@ -2,6 +2,7 @@
 📊 Data models for Convergence
 """
 
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
@@ -19,6 +20,22 @@ class ConversationConfig(BaseModel):
     openai_api_key: Optional[str] = Field(None, description="OpenAI API key")
     outline: Optional[str] = Field(None, description="Outline content to guide the conversation")
     outline_source: Optional[str] = Field(None, description="Source of the outline (file/url)")
+    tts_concurrency: int = Field(
+        4, ge=1, le=32, description="Maximum number of text-to-speech requests in flight"
+    )
+    transcript_batch_size: int = Field(
+        default_factory=lambda: int(os.getenv("TRANSCRIPT_BATCH_SIZE", "1")),
+        ge=1,
+        le=20,
+        validate_default=True,
+        description="Number of dialogue turns requested per chat completion",
+    )
+    segment_retries: int = Field(
+        3, ge=1, le=10, description="Attempts per transcript block before giving up"
+    )
+    pipelined: bool = Field(
+        False, description="Start rendering audio as soon as each transcript turn is generated"
+    )
 
     @field_validator("output_path", mode="before")
     @classmethod
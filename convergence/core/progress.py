@@ -0,0 +1,131 @@
+"""
+📡 Structured progress events for running generations
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProgressEvent(BaseModel):
+    """A single progress update"""
+
+    event: str = Field(..., description="Event type, e.g. phase, audio_segment, bytes_written")
+    seq: int = Field(..., description="Sequence number within the generation")
+    timestamp: float = Field(..., description="Unix time the event was emitted")
+    data: Dict[str, Any] = Field(default_factory=dict, description="Event payload")
+
+
+class ProgressBus:
+    """
+    Fan-out of the progress events of one generation.
+
+    Recent events are kept so late subscribers can replay them. Events may be
+    published from any thread; subscribers are served on the loop that created the bus.
+    A subscriber that falls `max_pending` events behind misses the overflow rather than
+    holding up the generation.
+    """
+
+    def __init__(self, history_size: int = 1000, max_pending: int = 1000):
+        self._loop = asyncio.get_running_loop()
+        self._lock = threading.Lock()
+        self._history: Deque[ProgressEvent] = deque(maxlen=history_size)
+        self._subscribers: List["asyncio.Queue[Optional[ProgressEvent]]"] = []
+        self._max_pending = max_pending
+        self._seq = 0
+        self.closed = False
+
+    def publish(self, event: str, **data: Any) -> None:
+        """Record an event and deliver it to current subscribers"""
+        with self._lock:
+            if self.closed:
+                return
+            self._seq += 1
+            progress_event = ProgressEvent(
+                event=event, seq=self._seq, timestamp=time.time(), data=data
+            )
+            self._history.append(progress_event)
+        self._dispatch(progress_event)
+
+    def close(self) -> None:
+        """Mark the generation as finished and end all subscriptions"""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+        self._dispatch(None)
+
+    def _dispatch(self, progress_event: Optional[ProgressEvent]) -> None:
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._deliver(progress_event)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._deliver, progress_event)
+
+    def _deliver(self, progress_event: Optional[ProgressEvent]) -> None:
+        for queue in list(self._subscribers):
+            if progress_event is None:
+                # The end marker always gets through, even to a full queue
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+            elif not queue.full():
+                queue.put_nowait(progress_event)
+
+    async def subscribe(self) -> AsyncIterator[ProgressEvent]:
+        """Yield the recorded events, then live ones until the bus is closed"""
+        queue: "asyncio.Queue[Optional[ProgressEvent]]" = asyncio.Queue(
+            maxsize=self._max_pending
+        )
+        with self._lock:
+            history = list(self._history)
+            closed = self.closed
+            if not closed:
+                self._subscribers.append(queue)
+        try:
+            for progress_event in history:
+                yield progress_event
+            if closed:
+                return
+            last_seq = history[-1].seq if history else 0
+            while True:
+                progress_event = await queue.get()
+                if progress_event is None:
+                    return
+                # Skip events already replayed from the history
+                if progress_event.seq > last_seq:
+                    yield progress_event
+        finally:
+            if queue in self._subscribers:
+                self._subscribers.remove(queue)
+
+
+_current_bus: "contextvars.ContextVar[Optional[ProgressBus]]" = contextvars.ContextVar(
+    "convergence_progress_bus", default=None
+)
+
+
+@contextmanager
+def progress_scope(bus: ProgressBus) -> Iterator[ProgressBus]:
+    """Route `emit_progress` calls made within this context (and its tasks) to `bus`"""
+    token = _current_bus.set(bus)
+    try:
+        yield bus
+    finally:
+        _current_bus.reset(token)
+
+
+def emit_progress(event: str, **data: Any) -> None:
+    """Publish a progress event to the current generation's bus, if any"""
+    bus = _current_bus.get()
+    if bus is not None:
+        bus.publish(event, **data)
@@ -0,0 +1,298 @@
+"""
+🧾 Per-API-key usage metering with write-behind flushing
+"""
+
+import asyncio
+import contextvars
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from pydantic import BaseModel, Field
+
+from convergence.utils.console import print_warning
+
+
+class UsageRecord(BaseModel):
+    """Usage of one API key over one flush period"""
+
+    key_hash: str = Field(..., description="SHA-256 of the API key")
+    client_name: str = Field(..., description="Name of the client")
+    period_start: datetime = Field(..., description="Start of the aggregation period (UTC)")
+    period_end: datetime = Field(..., description="End of the aggregation period (UTC)")
+    requests: int = Field(0, description="Authenticated requests")
+    minutes: float = Field(0.0, description="Minutes of audio generated")
+    tts_characters: int = Field(0, description="Characters of transcript rendered to speech")
+
+
+class UsageSink(ABC):
+    """Destination for flushed usage records"""
+
+    @abstractmethod
+    def write(self, records: List[UsageRecord]) -> None:
+        """Persist a batch; raising leaves the batch in memory for the next flush"""
+
+
+class SQLiteUsageSink(UsageSink):
+    """Daily totals per key in a local SQLite database, added to on every flush"""
+
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS usage (
+                key_hash TEXT NOT NULL,
+                day TEXT NOT NULL,
+                client_name TEXT NOT NULL,
+                requests INTEGER NOT NULL,
+                minutes REAL NOT NULL,
+                tts_characters INTEGER NOT NULL,
+                PRIMARY KEY (key_hash, day)
+            )
+            """
+        )
+
+    def write(self, records: List[UsageRecord]) -> None:
+        rows = [
+            (
+                record.key_hash,
+                record.period_end.date().isoformat(),
+                record.client_name,
+                record.requests,
+                record.minutes,
+                record.tts_characters,
+            )
+            for record in records
+        ]
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(
+                """
+                INSERT INTO usage VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (key_hash, day) DO UPDATE SET
+                    client_name = excluded.client_name,
+                    requests = requests + excluded.requests,
+                    minutes = minutes + excluded.minutes,
+                    tts_characters = tts_characters + excluded.tts_characters
+                """,
+                rows,
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+
+class JSONLUsageSink(UsageSink):
+    """One JSON line per key and flush period, appended to a file"""
+
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, records: List[UsageRecord]) -> None:
+        lines = "".join(record.model_dump_json() + "\n" for record in records)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class _Totals:
+    """Mutable counters for one key between flushes"""
+
+    __slots__ = ("client_name", "requests", "minutes", "tts_characters")
+
+    def __init__(self, client_name: str):
+        self.client_name = client_name
+        self.requests = 0
+        self.minutes = 0.0
+        self.tts_characters = 0
+
+
+class UsageMeter:
+    """
+    Aggregates usage in memory and writes it to a sink in batches from a background task.
+    Recording is a dict update under a lock, so callers never wait on the sink. A failed
+    write is merged back and retried on the next flush; stop() performs a final flush.
+    """
+
+    def __init__(self, sink: Optional[UsageSink] = None):
+        self.flush_interval = float(os.getenv("USAGE_FLUSH_SECONDS", "30"))
+        self.sink = sink if sink is not None else self._create_sink()
+        self._lock = threading.Lock()
+        self._totals: Dict[str, _Totals] = {}
+        self._period_start = datetime.now(timezone.utc)
+        # Serialises flushes so batches reach the sink in order
+        self._flush_lock = threading.Lock()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.flushed_records = 0
+        self.failed_flushes = 0
+
+    @staticmethod
+    def _create_sink() -> Optional[UsageSink]:
+        backend = os.getenv("USAGE_SINK", "sqlite").lower()
+        default_dir = Path.home() / ".cache" / "convergence"
+        if backend == "sqlite":
+            return SQLiteUsageSink(
+                os.getenv("USAGE_SQLITE_PATH") or str(default_dir / "usage.sqlite3")
+            )
+        if backend == "jsonl":
+            return JSONLUsageSink(os.getenv("USAGE_JSONL_PATH") or str(default_dir / "usage.jsonl"))
+        if backend != "none":
+            raise ValueError(f"Unknown USAGE_SINK: {backend}")
+        return None
+
+    @property
+    def enabled(self) -> bool:
+        return self.sink is not None
+
+    def record(
+        self,
+        key_hash: str,
+        client_name: str,
+        requests: int = 0,
+        minutes: float = 0.0,
+        tts_characters: int = 0,
+    ) -> None:
+        """Add usage for a key"""
+        if self.sink is None:
+            return
+        with self._lock:
+            totals = self._totals.get(key_hash)
+            if totals is None:
+                totals = self._totals[key_hash] = _Totals(client_name)
+            totals.requests += requests
+            totals.minutes += minutes
+            totals.tts_characters += tts_characters
+
+    def flush(self) -> int:
+        """Write everything recorded so far to the sink; returns the number of records"""
+        if self.sink is None:
+            return 0
+        with self._flush_lock:
+            period_end = datetime.now(timezone.utc)
+            with self._lock:
+                totals, self._totals = self._totals, {}
+                period_start, self._period_start = self._period_start, period_end
+            if not totals:
+                return 0
+
+            records = [
+                UsageRecord(
+                    key_hash=key_hash,
+                    client_name=entry.client_name,
+                    period_start=period_start,
+                    period_end=period_end,
+                    requests=entry.requests,
+                    minutes=round(entry.minutes, 4),
+                    tts_characters=entry.tts_characters,
+                )
+                for key_hash, entry in totals.items()
+            ]
+            try:
+                self.sink.write(records)
+            except Exception as e:
+                self.failed_flushes += 1
+                print_warning(f"Usage flush failed, keeping {len(records)} records: {str(e)}")
+                self._merge_back(totals, period_start)
+                return 0
+            self.flushed_records += len(records)
+            return len(records)
+
+    def _merge_back(self, totals: Dict[str, _Totals], period_start: datetime) -> None:
+        """Return an unwritten batch to the live counters"""
+        with self._lock:
+            for key_hash, entry in totals.items():
+                current = self._totals.get(key_hash)
+                if current is None:
+                    self._totals[key_hash] = entry
+                    continue
+                current.requests += entry.requests
+                current.minutes += entry.minutes
+                current.tts_characters += entry.tts_characters
+            self._period_start = min(self._period_start, period_start)
+
+    def start(self) -> None:
+        """Flush periodically from a task on the running event loop"""
+        if self.sink is not None and (self._task is None or self._task.done()):
+            self._task = asyncio.ensure_future(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write out whatever is left"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await asyncio.to_thread(self.flush)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._totals)
+        return {
+            "sink": type(self.sink).__name__ if self.sink is not None else None,
+            "flush_interval": self.flush_interval,
+            "pending_keys": pending,
+            "flushed_records": self.flushed_records,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+class UsageKey(NamedTuple):
+    """Who the current request or job is billed to"""
+
+    key_hash: str
+    client_name: str
+
+
+_current_key: "contextvars.ContextVar[Optional[UsageKey]]" = contextvars.ContextVar(
+    "convergence_usage_key", default=None
+)
+
+
+@contextmanager
+def usage_scope(key: Optional[UsageKey]) -> Iterator[Optional[UsageKey]]:
+    """Bill `record_usage` calls made within this context (and its tasks) to `key`"""
+    token = _current_key.set(key)
+    try:
+        yield key
+    finally:
+        _current_key.reset(token)
+
+
+def current_usage_key() -> Optional[UsageKey]:
+    return _current_key.get()
+
+
+def record_usage(requests: int = 0, minutes: float = 0.0, tts_characters: int = 0) -> None:
+    """Add usage for the current key, if any (CLI runs and unauthenticated servers have none)"""
+    key = _current_key.get()
+    if key is not None:
+        get_usage_meter().record(key.key_hash, key.client_name, requests, minutes, tts_characters)
+
+
+# Global instance
+_usage_meter: Optional[UsageMeter] = None
+
+
+def get_usage_meter() -> UsageMeter:
+    """Get or create the global usage meter"""
+    global _usage_meter
+    if _usage_meter is None:
+        _usage_meter = UsageMeter()
+    return _usage_meter
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Optional
 
 from convergence.utils.console import console
+from convergence.utils.wav import WAVE_FORMAT_PCM, WavFormat, build_wav_header
 
 
 class AudioService:
@@ -30,68 +31,19 @@ class AudioService:
         await asyncio.sleep(random.uniform(0.5, 1.0))
 
         # Generate dummy audio data (WAV header + silence)
-        # This is a minimal valid WAV file structure
-        wav_header = bytearray(
-            [
-                0x52,
-                0x49,
-                0x46,
-                0x46,  # "RIFF"
-                0x00,
-                0x00,
-                0x00,
-                0x00,  # File size (placeholder)
-                0x57,
-                0x41,
-                0x56,
-                0x45,  # "WAVE"
-                0x66,
-                0x6D,
-                0x74,
-                0x20,  # "fmt "
-                0x10,
-                0x00,
-                0x00,
-                0x00,  # Subchunk size (16)
-                0x01,
-                0x00,  # Audio format (1 = PCM)
-                0x02,
-                0x00,  # Number of channels (2 = stereo)
-                0x44,
-                0xAC,
-                0x00,
-                0x00,  # Sample rate (44100)
-                0x10,
-                0xB1,
-                0x02,
-                0x00,  # Byte rate
-                0x04,
-                0x00,  # Block align
-                0x10,
-                0x00,  # Bits per sample (16)
-                0x64,
-                0x61,
-                0x74,
-                0x61,  # "data"
-                0x00,
-                0x00,
-                0x00,
-                0x00,  # Data size (placeholder)
-            ]
+        # 16-bit stereo PCM at 44.1 kHz
+        wav_format = WavFormat(
+            audio_format=WAVE_FORMAT_PCM, channels=2, sample_rate=44100, bits_per_sample=16
         )
 
         # Add some dummy audio data (silence)
         audio_length = min(len(transcript) * 10, 10000)  # Proportional to transcript
         audio_data = bytes(audio_length)
-
-        # Update file size fields
-        total_size = len(wav_header) + len(audio_data) - 8
-        wav_header[4:8] = total_size.to_bytes(4, "little")
-        wav_header[40:44] = len(audio_data).to_bytes(4, "little")
+        wav_header = build_wav_header(wav_format, len(audio_data))
 
         console.print(f"   ✅ Generated {len(audio_data)} bytes of audio", style="dim green")
 
-        return bytes(wav_header) + audio_data
+        return wav_header + audio_data
 
     async def save(self, audio_data: bytes, output_path: Path) -> bool:
         """
@@ -2,15 +2,35 @@
 📝 Outline processing service
 """
 
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlparse
 
+import httpx
 import requests
 
 from convergence.services.md import convert_to_md
+from convergence.services.outline_cache import get_outline_cache
 from convergence.utils.console import console, print_error, print_warning
+from convergence.utils.metrics import OUTLINE_DURATION
+
+OUTLINE_FETCH_TIMEOUT = 30
+# Outlines are limited to 50KB
+MAX_OUTLINE_CHARS = 50000
+
+# Worker pool for file reads and conversions, kept off the event loop
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        workers = int(os.getenv("OUTLINE_WORKERS", "2"))
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="outline")
+    return _executor
 
 
 class OutlineProcessor:
@@ -19,6 +39,8 @@ class OutlineProcessor:
     def __init__(self) -> None:
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "Convergence/0.1.0"})
+        # Created on first async fetch
+        self._async_client: Optional[httpx.AsyncClient] = None
 
     def is_url(self, source: str) -> bool:
         """Check if the source is a URL"""
@@ -33,8 +55,9 @@ class OutlineProcessor:
         try:
             console.print(f"   🌐 Fetching outline from URL: {url}", style="dim")
 
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
+            with OUTLINE_DURATION.time(step="fetch"):
+                response = self.session.get(url, timeout=OUTLINE_FETCH_TIMEOUT)
+                response.raise_for_status()
 
             content = response.text
             console.print(f"   ✅ Fetched {len(content)} characters", style="dim green")
@@ -50,6 +73,88 @@ class OutlineProcessor:
             print_error(error_msg, "Outline Error")
             return "", error_msg
 
+    async def _aget(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[Optional[httpx.Response], Optional[str]]:
+        """
+        GET a URL; a 304 answer to conditional `headers` counts as success.
+        On an HTTP error status the response is returned along with the error, so callers
+        can tell a missing document from an unreachable server.
+        """
+        try:
+            console.print(f"   🌐 Fetching outline from URL: {url}", style="dim")
+
+            if self._async_client is None:
+                self._async_client = httpx.AsyncClient(
+                    headers={"User-Agent": "Convergence/0.1.0"},
+                    timeout=OUTLINE_FETCH_TIMEOUT,
+                    follow_redirects=True,
+                )
+            with OUTLINE_DURATION.time(step="fetch"):
+                response = await self._async_client.get(url, headers=headers)
+                if response.status_code != 304:
+                    response.raise_for_status()
+
+            if response.status_code == 304:
+                console.print("   ✅ Outline unchanged since last fetch", style="dim green")
+            else:
+                console.print(f"   ✅ Fetched {len(response.text)} characters", style="dim green")
+
+            return response, None
+
+        except httpx.HTTPStatusError as e:
+            error_msg = f"Failed to fetch URL: {str(e)}"
+            print_error(error_msg, "Outline Fetch Error")
+            return e.response, error_msg
+        except httpx.HTTPError as e:
+            error_msg = f"Failed to fetch URL: {str(e)}"
+            print_error(error_msg, "Outline Fetch Error")
+            return None, error_msg
+        except Exception as e:
+            error_msg = f"Unexpected error fetching URL: {str(e)}"
+            print_error(error_msg, "Outline Error")
+            return None, error_msg
+
+    async def _aprocess_url(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Fetch and process an outline URL through the shared outline cache.
+        Fresh entries are served without a request and stale ones are revalidated. A stale
+        entry is still served if the server cannot be reached or fails (5xx), and dropped
+        if the document is gone (404/410).
+        """
+        cache = get_outline_cache()
+        entry, fresh = cache.lookup(url)
+        if entry is not None and fresh:
+            console.print("   🗂️  Outline served from cache", style="dim green")
+            return entry.content, None
+
+        response, error = await self._aget(url, cache.conditional_headers(entry))
+        if response is None or error is not None:
+            status_code = response.status_code if response is not None else None
+            if status_code in (404, 410):
+                cache.evict(url)
+            elif entry is not None and (status_code is None or status_code >= 500):
+                print_warning("Outline fetch failed, using the cached copy")
+                return entry.content, None
+            return None, error
+
+        if response.status_code == 304 and entry is not None:
+            cache.revalidated(
+                url, response.headers.get("etag"), response.headers.get("last-modified")
+            )
+            return entry.content, None
+
+        loop = asyncio.get_running_loop()
+        content = await loop.run_in_executor(_get_executor(), self._clean_outline, response.text)
+        cache.put(url, content, response.headers.get("etag"), response.headers.get("last-modified"))
+        return content, None
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
     def read_from_file(self, file_path: str) -> Tuple[str, Optional[str]]:
         """Read content from a file"""
         try:
@@ -76,7 +181,8 @@ class OutlineProcessor:
             else:
                 # Try to convert to markdown
                 console.print(f"   🔄 Converting {path.suffix} to markdown...", style="dim")
-                content, error = convert_to_md(str(path))
+                with OUTLINE_DURATION.time(step="convert"):
+                    content, error = convert_to_md(str(path))
 
                 if error:
                     print_warning(f"Conversion warning: {error}")
@@ -114,17 +220,43 @@ class OutlineProcessor:
         if error:
             return None, error
 
-        # Clean and validate content
+        return self._clean_outline(content), None
+
+    async def aprocess_outline(self, source: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Process an outline without blocking the event loop: URLs are fetched with an async
+        client through the outline cache, file reads, conversions and formatting run in a
+        worker pool.
+        Returns: (content, error)
+        """
+        if not source:
+            return None, None
+
+        source = source.strip()
+        loop = asyncio.get_running_loop()
+
+        if self.is_url(source):
+            return await self._aprocess_url(source)
+
+        content, error = await loop.run_in_executor(_get_executor(), self.read_from_file, source)
+
+        if error:
+            return None, error
+
+        return await loop.run_in_executor(_get_executor(), self._clean_outline, content), None
+
+    def _clean_outline(self, content: str) -> str:
+        """Clean and validate content"""
         if content:
             content = content.strip()
-            if len(content) > 50000:  # Limit outline size to 50KB
+            if len(content) > MAX_OUTLINE_CHARS:
                 print_warning("Outline truncated to 50,000 characters")
-                content = content[:50000]
+                content = content[:MAX_OUTLINE_CHARS]
 
             # Add some formatting
             content = self._format_outline(content)
 
-        return content, None
+        return content
 
     def _format_outline(self, content: str) -> str:
         """Format the outline content for better processing"""
@@ -0,0 +1,132 @@
+"""
+🗂️ In-memory cache of processed outlines fetched from URLs
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from convergence.utils.metrics import OUTLINE_CACHE_REQUESTS
+
+
+class OutlineCacheEntry(NamedTuple):
+    """A processed outline and the validators of the response it came from"""
+
+    content: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    # Monotonic time the content was last confirmed current by the server
+    validated_at: float
+
+
+class OutlineCache:
+    """
+    LRU cache of processed outlines keyed by URL.
+    Entries younger than `fresh_seconds` are served without contacting the server; older
+    ones are revalidated with If-None-Match / If-Modified-Since, so an unchanged outline
+    costs a 304 instead of a download and reformat.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, fresh_seconds: Optional[float] = None):
+        self.max_entries = (
+            max_entries if max_entries is not None else int(os.getenv("OUTLINE_CACHE_SIZE", "128"))
+        )
+        self.fresh_seconds = (
+            fresh_seconds
+            if fresh_seconds is not None
+            else float(os.getenv("OUTLINE_CACHE_FRESH_SECONDS", "300"))
+        )
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, OutlineCacheEntry]" = OrderedDict()
+
+    def lookup(self, url: str) -> Tuple[Optional[OutlineCacheEntry], bool]:
+        """Return (entry, fresh); a fresh entry can be used without asking the server"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None, False
+            self._entries.move_to_end(url)
+            fresh = time.monotonic() - entry.validated_at < self.fresh_seconds
+            if fresh:
+                self.hits += 1
+                OUTLINE_CACHE_REQUESTS.inc(result="hit")
+            return entry, fresh
+
+    @staticmethod
+    def conditional_headers(entry: Optional[OutlineCacheEntry]) -> Dict[str, str]:
+        """Request headers that let the server answer 304 if the outline is unchanged"""
+        headers: Dict[str, str] = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def put(
+        self, url: str, content: str, etag: Optional[str], last_modified: Optional[str]
+    ) -> None:
+        """Store a freshly downloaded outline"""
+        with self._lock:
+            self.misses += 1
+            OUTLINE_CACHE_REQUESTS.inc(result="miss")
+            if self.max_entries <= 0:
+                return
+            self._entries[url] = OutlineCacheEntry(content, etag, last_modified, time.monotonic())
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def revalidated(
+        self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+    ) -> None:
+        """
+        The server confirmed the cached outline is current (304). Validators sent with the
+        304 replace the stored ones.
+        """
+        with self._lock:
+            self.revalidations += 1
+            OUTLINE_CACHE_REQUESTS.inc(result="revalidated")
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries[url] = entry._replace(
+                    etag=etag or entry.etag,
+                    last_modified=last_modified or entry.last_modified,
+                    validated_at=time.monotonic(),
+                )
+
+    def evict(self, url: str) -> None:
+        """Drop an outline the server no longer has"""
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/revalidation/miss counters and current size"""
+        return {
+            "hits": self.hits,
+            "revalidations": self.revalidations,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "fresh_seconds": self.fresh_seconds,
+        }
+
+
+# Global instance
+_outline_cache: Optional[OutlineCache] = None
+
+
+def get_outline_cache() -> OutlineCache:
+    """Get or create the global outline cache"""
+    global _outline_cache
+    if _outline_cache is None:
+        _outline_cache = OutlineCache()
+    return _outline_cache
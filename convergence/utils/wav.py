@@ -0,0 +1,188 @@
+"""
+🎼 WAV parsing and streaming assembly
+"""
+
+import os
+import struct
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, NamedTuple, Optional, Tuple, Type, Union
+
+WAV_HEADER_SIZE = 44
+WAVE_FORMAT_PCM = 1
+# Size written by streaming encoders when the length is not known up front
+STREAMING_CHUNK_SIZE = 0xFFFFFFFF
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+class WavFormatError(ValueError):
+    """Raised for malformed WAV data or segments whose formats cannot be combined"""
+
+
+class WavFormat(NamedTuple):
+    """Sample format from a WAV `fmt ` chunk"""
+
+    audio_format: int
+    channels: int
+    sample_rate: int
+    bits_per_sample: int
+
+    @property
+    def block_align(self) -> int:
+        return self.channels * self.bits_per_sample // 8
+
+    @property
+    def byte_rate(self) -> int:
+        return self.sample_rate * self.block_align
+
+
+def parse_wav(data: BytesLike) -> Tuple[WavFormat, memoryview]:
+    """
+    Parse a RIFF/WAVE buffer and return its format and PCM payload.
+    The payload is a memoryview slice of `data`, so no audio bytes are copied.
+    Chunks other than `fmt ` and `data` (LIST, fact, ...) are skipped. A data chunk size
+    larger than the buffer (as sent by streaming encoders) is clamped to the buffer.
+    """
+    view = memoryview(data)
+    if len(view) < 12 or view[:4] != b"RIFF" or view[8:12] != b"WAVE":
+        raise WavFormatError("Not a RIFF/WAVE buffer")
+
+    wav_format: Optional[WavFormat] = None
+    offset = 12
+    while offset + 8 <= len(view):
+        chunk_id = view[offset : offset + 4].tobytes()
+        chunk_size = int.from_bytes(view[offset + 4 : offset + 8], "little")
+        body = offset + 8
+
+        if chunk_id == b"fmt ":
+            if chunk_size < 16 or body + 16 > len(view):
+                raise WavFormatError("Truncated fmt chunk")
+            audio_format, channels, sample_rate, _, _, bits_per_sample = struct.unpack_from(
+                "<HHIIHH", view, body
+            )
+            wav_format = WavFormat(audio_format, channels, sample_rate, bits_per_sample)
+        elif chunk_id == b"data":
+            if wav_format is None:
+                raise WavFormatError("data chunk before fmt chunk")
+            return wav_format, view[body : min(body + chunk_size, len(view))]
+
+        # Chunks are word aligned
+        offset = body + chunk_size + (chunk_size & 1)
+
+    raise WavFormatError("No data chunk found")
+
+
+def build_wav_header(wav_format: WavFormat, data_size: int) -> bytes:
+    """Build a canonical 44-byte header for `data_size` bytes of audio"""
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        WAV_HEADER_SIZE - 8 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        wav_format.audio_format,
+        wav_format.channels,
+        wav_format.sample_rate,
+        wav_format.byte_rate,
+        wav_format.block_align,
+        wav_format.bits_per_sample,
+        b"data",
+        data_size,
+    )
+
+
+def build_streaming_wav_header(wav_format: WavFormat) -> bytes:
+    """
+    Build a header for a stream of unknown length. The RIFF and data chunk sizes are
+    set to the maximum, which players treat as "read until the end of the stream".
+    """
+    header = bytearray(build_wav_header(wav_format, 0))
+    struct.pack_into("<I", header, 4, STREAMING_CHUNK_SIZE)
+    struct.pack_into("<I", header, WAV_HEADER_SIZE - 4, STREAMING_CHUNK_SIZE)
+    return bytes(header)
+
+
+def wav_duration_seconds(path: Path) -> Optional[float]:
+    """Duration of a WAV file from its header and size, None if it is not a WAV file"""
+    try:
+        with open(path, "rb") as f:
+            wav_format, _ = parse_wav(f.read(WAV_HEADER_SIZE))
+            size = os.fstat(f.fileno()).st_size
+    except (OSError, WavFormatError):
+        return None
+    if not wav_format.byte_rate:
+        return None
+    return max(size - WAV_HEADER_SIZE, 0) / wav_format.byte_rate
+
+
+class StreamingWavWriter:
+    """
+    Append WAV segments to a binary stream as they arrive.
+
+    A canonical header is written from the first segment's format, every segment
+    contributes only its PCM payload, and the RIFF and data chunk sizes are patched on
+    close. Memory use is bounded by the segment being written, not by the length of the
+    conversation. Segments in a different format are refused with WavFormatError.
+    Sizes can only be patched on seekable streams.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self._header_offset = stream.tell() if stream.seekable() else None
+        self.bytes_written = 0
+        self.wav_format: Optional[WavFormat] = None
+        self._is_wav = False
+        self._data_size = 0
+
+    def write_segment(self, segment: Optional[BytesLike]) -> None:
+        """Append one audio segment"""
+        if not segment:
+            return
+
+        is_wav = segment[:4] == b"RIFF"
+        if self.bytes_written == 0:
+            self._is_wav = is_wav
+        elif is_wav != self._is_wav:
+            raise WavFormatError("Cannot mix WAV and raw audio segments")
+
+        if not is_wav:
+            self._write(segment)
+            return
+
+        wav_format, payload = parse_wav(segment)
+        if self.wav_format is None:
+            self.wav_format = wav_format
+            self._write(build_wav_header(wav_format, 0))
+        elif wav_format != self.wav_format:
+            raise WavFormatError(
+                f"Segment format {wav_format} does not match stream format {self.wav_format}"
+            )
+
+        self._write(payload)
+        self._data_size += len(payload)
+
+    def _write(self, data: BytesLike) -> None:
+        self.stream.write(data)
+        self.bytes_written += len(data)
+
+    def close(self) -> None:
+        """Patch the RIFF and data chunk sizes to match what was written"""
+        if not self._is_wav or self.wav_format is None or self._header_offset is None:
+            return
+        end = self.stream.tell()
+        self.stream.seek(self._header_offset)
+        self.stream.write(build_wav_header(self.wav_format, self._data_size))
+        self.stream.seek(end)
+
+    def __enter__(self) -> "StreamingWavWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
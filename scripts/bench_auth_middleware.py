@@ -0,0 +1,147 @@
+"""
+⏱️ Microbenchmark: per-request overhead of the API key middleware
+
+Drives the ASGI stack directly (no server, no sockets) with authenticated requests and
+compares the pure-ASGI APIKeyMiddleware with the same authentication wrapped in
+Starlette's BaseHTTPMiddleware, which is how the middleware used to be built.
+Keys come from a temporary SQLite key store, so no Google credentials are needed.
+
+    python scripts/bench_auth_middleware.py --requests 20000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+API_KEY = "sk-convergence-bench"
+BODY_CHUNKS = 16
+
+
+def configure_environment(directory: str) -> None:
+    """Local key store, no usage sink, quiet console"""
+    os.environ["API_KEY_STORE"] = "sqlite"
+    os.environ["API_KEY_SQLITE_PATH"] = os.path.join(directory, "api_keys.sqlite3")
+    os.environ["USAGE_SINK"] = "none"
+    os.environ["RATE_LIMIT_STORE"] = "memory"
+
+
+def build_apps() -> List[Any]:
+    from starlette.middleware.base import BaseHTTPMiddleware
+
+    from convergence.auth.key_store import SQLiteKeyStore
+    from convergence.auth.middleware import APIKeyMiddleware, AuthResult
+    from convergence.auth.models import APIKey
+    from convergence.core.usage import usage_scope
+    from convergence.utils.console import console
+
+    console.quiet = True
+    SQLiteKeyStore().replace_all(
+        [APIKey(api_key=API_KEY, client_name="Bench", created_at=datetime(2024, 1, 1))]
+    )
+
+    async def endpoint(scope: Any, receive: Any, send: Any) -> None:
+        """Streams a small body in chunks, like a file download"""
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/octet-stream")],
+            }
+        )
+        for i in range(BODY_CHUNKS):
+            more_body = i < BODY_CHUNKS - 1
+            await send({"type": "http.response.body", "body": b"x" * 1024, "more_body": more_body})
+
+    asgi = APIKeyMiddleware(endpoint)
+
+    class BaseHTTPAuth(BaseHTTPMiddleware):
+        """The same checks inside BaseHTTPMiddleware, as the middleware used to be"""
+
+        async def dispatch(self, request: Any, call_next: Callable[..., Awaitable[Any]]) -> Any:
+            result = await asgi.authenticate(request.headers, request.url.path)
+            if not isinstance(result, AuthResult):
+                return result
+            request.state.api_key = result.api_key
+            with usage_scope(result.usage_key):
+                response = await call_next(request)
+            response.headers.update(result.response_headers)
+            return response
+
+    return [
+        ("no middleware", endpoint),
+        ("pure ASGI", asgi),
+        ("BaseHTTPMiddleware", BaseHTTPAuth(endpoint)),
+    ]
+
+
+async def run_requests(app: Any, count: int) -> List[float]:
+    """Send `count` authenticated GETs through `app`; returns per-request seconds"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/convergence/download/bench.wav",
+        "raw_path": b"/convergence/download/bench.wav",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"authorization", f"Bearer {API_KEY}".encode())],
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 8000),
+    }
+
+    async def receive() -> Any:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Any) -> None:
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"Unexpected status {message['status']}")
+
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        await app(dict(scope, state={}), receive, send)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def main(count: int, warmup: int) -> None:
+    apps = build_apps()
+    results = {}
+    for name, app in apps:
+        await run_requests(app, warmup)
+        timings = await run_requests(app, count)
+        results[name] = timings
+
+    baseline = statistics.median(results["no middleware"])
+    print(f"{count} requests, {BODY_CHUNKS} body chunks each\n")
+    print(f"{'stack':<20} {'median us':>10} {'p99 us':>10} {'overhead us':>12}")
+    for name, timings in results.items():
+        timings.sort()
+        median = statistics.median(timings)
+        p99 = timings[int(len(timings) * 0.99) - 1]
+        print(
+            f"{name:<20} {median * 1e6:>10.1f} {p99 * 1e6:>10.1f} "
+            f"{(median - baseline) * 1e6:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--warmup", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(tmp)
+        asyncio.run(main(args.requests, args.warmup))
@@ -0,0 +1,50 @@
+"""
+🧪 Shared test helpers
+"""
+
+import struct
+from typing import Callable, Optional, Sequence, Tuple
+
+import pytest
+
+Chunk = Tuple[bytes, bytes]
+
+
+def build_wav(
+    payload: bytes,
+    sample_rate: int = 24000,
+    channels: int = 1,
+    bits_per_sample: int = 16,
+    before_fmt: Sequence[Chunk] = (),
+    before_data: Sequence[Chunk] = (),
+    fmt_extra: bytes = b"",
+    data_size: Optional[int] = None,
+) -> bytes:
+    """A RIFF/WAVE buffer with optional extra chunks around `fmt ` and `data`"""
+
+    def chunk(chunk_id: bytes, body: bytes, size: Optional[int] = None) -> bytes:
+        header = chunk_id + struct.pack("<I", len(body) if size is None else size)
+        # Chunks are word aligned: odd sizes get a pad byte
+        return header + body + (b"\0" if len(body) & 1 else b"")
+
+    block_align = channels * bits_per_sample // 8
+    fmt = struct.pack(
+        "<HHIIHH",
+        1,
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        bits_per_sample,
+    )
+    body = b"WAVE"
+    body += b"".join(chunk(chunk_id, data) for chunk_id, data in before_fmt)
+    body += chunk(b"fmt ", fmt + fmt_extra)
+    body += b"".join(chunk(chunk_id, data) for chunk_id, data in before_data)
+    body += chunk(b"data", payload, data_size)
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+@pytest.fixture
+def make_wav() -> Callable[..., bytes]:
+    return build_wav
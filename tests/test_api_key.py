@@ -0,0 +1,171 @@
+"""
+🧪 Tests for API key validation and its cache
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+import pytest
+
+from convergence.auth import api_key as api_key_module
+from convergence.auth.api_key import APIKeyAuth, APIKeyCache
+from convergence.auth.key_store import hash_api_key
+from convergence.auth.models import APIKey
+
+
+def _key(api_key: str = "sk-test", **fields: object) -> APIKey:
+    return APIKey(api_key=api_key, client_name="Acme", created_at=datetime(2024, 1, 1), **fields)
+
+
+class FakeKeyTable:
+    """Key table whose async lookups wait until the test releases them"""
+
+    def __init__(self, *api_keys: APIKey):
+        self.index: Dict[str, APIKey] = {hash_api_key(key.api_key): key for key in api_keys}
+        self.lookups = 0
+        self.release = asyncio.Event()
+
+    def might_exist(self, key_hash: str) -> bool:
+        return True
+
+    def get(self, key_hash: str) -> Optional[APIKey]:
+        self.lookups += 1
+        return self.index.get(key_hash)
+
+    async def aget(self, key_hash: str) -> Optional[APIKey]:
+        self.lookups += 1
+        await self.release.wait()
+        return self.index.get(key_hash)
+
+
+def _auth(monkeypatch: pytest.MonkeyPatch, table: FakeKeyTable) -> APIKeyAuth:
+    monkeypatch.setattr(api_key_module, "get_key_table", lambda: table)
+    return APIKeyAuth()
+
+
+def test_concurrent_validations_share_one_lookup(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def scenario() -> None:
+        table = FakeKeyTable(_key())
+        auth = _auth(monkeypatch, table)
+        pending = [asyncio.ensure_future(auth.avalidate_api_key("sk-test")) for _ in range(5)]
+        await asyncio.sleep(0)
+        table.release.set()
+        results = await asyncio.gather(*pending)
+        assert all(result is not None and result.client_name == "Acme" for result in results)
+        assert table.lookups == 1
+        # Later calls are served from the cache
+        assert await auth.avalidate_api_key("sk-test") is results[0]
+        assert table.lookups == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_lookup(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def scenario() -> None:
+        table = FakeKeyTable(_key())
+        auth = _auth(monkeypatch, table)
+        first = asyncio.ensure_future(auth.avalidate_api_key("sk-test"))
+        second = asyncio.ensure_future(auth.avalidate_api_key("sk-test"))
+        await asyncio.sleep(0)
+        first.cancel()
+        table.release.set()
+        assert await second is not None
+        assert table.lookups == 1
+
+    asyncio.run(scenario())
+
+
+def test_unknown_and_inactive_keys_are_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def scenario() -> None:
+        table = FakeKeyTable(_key("sk-off", is_active=False))
+        table.release.set()
+        auth = _auth(monkeypatch, table)
+        assert await auth.avalidate_api_key("sk-missing") is None
+        assert await auth.avalidate_api_key("sk-off") is None
+        # Negative results are cached too
+        assert await auth.avalidate_api_key("sk-missing") is None
+        assert table.lookups == 2
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("Bearer sk-test", "sk-test"),
+        ("ApiKey sk-test", "sk-test"),
+        ("Basic sk-test", None),
+        ("sk-test", None),
+        (None, None),
+    ],
+)
+def test_extract_api_key(
+    monkeypatch: pytest.MonkeyPatch, header: Optional[str], expected: Optional[str]
+) -> None:
+    assert _auth(monkeypatch, FakeKeyTable()).extract_api_key(header) == expected
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(api_key_module, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+class TestAPIKeyCache:
+    def test_valid_and_unknown_keys_have_separate_ttls(self, clock: Clock) -> None:
+        cache = APIKeyCache(positive_ttl=300, negative_ttl=60, max_entries=10)
+        key = _key()
+        cache.set("valid", key)
+        cache.set("unknown", None)
+        assert cache.get("valid") == (True, key)
+        assert cache.get("unknown") == (True, None)
+
+        clock.now += 61
+        assert cache.get("unknown") == (False, None)
+        assert cache.get("valid") == (True, key)
+
+        clock.now += 240
+        assert cache.get("valid") == (False, None)
+        assert cache.stats()["entries"] == 0
+
+    def test_least_recently_used_entry_is_evicted(self, clock: Clock) -> None:
+        cache = APIKeyCache(positive_ttl=300, negative_ttl=60, max_entries=2)
+        cache.set("a", None)
+        cache.set("b", None)
+        cache.get("a")
+        cache.set("c", None)
+        assert cache.get("b") == (False, None)
+        assert cache.get("a")[0] and cache.get("c")[0]
+        assert cache.evictions == 1
+
+    def test_entries_expire_with_the_key(self, clock: Clock) -> None:
+        cache = APIKeyCache(positive_ttl=300, negative_ttl=60, max_entries=10)
+        cache.set("soon", _key(expires_at=datetime.now() + timedelta(seconds=30)))
+        clock.now += 31
+        assert cache.get("soon") == (False, None)
+
+        # An already expired key is never cached
+        cache.set("expired", _key(expires_at=datetime.now() - timedelta(seconds=1)))
+        assert cache.stats()["entries"] == 0
+
+    def test_invalidate(self, clock: Clock) -> None:
+        cache = APIKeyCache(positive_ttl=300, negative_ttl=60, max_entries=10)
+        cache.set("a", None)
+        cache.set("b", None)
+        cache.invalidate("a")
+        assert cache.get("a") == (False, None)
+        cache.invalidate()
+        assert cache.stats()["entries"] == 0
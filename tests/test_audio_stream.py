@@ -0,0 +1,169 @@
+"""
+🧪 Tests for following a job's audio while it is rendered
+"""
+
+import asyncio
+import os
+from pathlib import Path
+from typing import Callable, List, Sequence
+
+import pytest
+
+from convergence.ai.tts_cache import TTSCache, get_tts_cache
+from convergence.api.audio_stream import AudioStreamError, _AudioFollower, iter_job_audio
+from convergence.api.jobs import JobStatus
+from convergence.core.progress import ProgressBus
+from convergence.utils.wav import WAV_HEADER_SIZE, StreamingWavWriter
+
+FIRST = b"\x01\x01" * 100
+SECOND = b"\x02\x02" * 50
+OTHER = b"\x03\x03" * 100
+
+Render = Callable[[Path, Sequence[bytes]], int]
+
+
+@pytest.fixture
+def tts_cache(monkeypatch: pytest.MonkeyPatch) -> TTSCache:
+    cache = get_tts_cache()
+    monkeypatch.setattr(cache, "enabled", True)
+    return cache
+
+
+@pytest.fixture
+def render(make_wav: Callable[..., bytes]) -> Render:
+    def render(path: Path, payloads: Sequence[bytes]) -> int:
+        """Write segments the way a render attempt does, truncating any earlier attempt"""
+        with open(path, "wb") as f, StreamingWavWriter(f) as writer:
+            for payload in payloads:
+                writer.write_segment(make_wav(payload))
+        return os.path.getsize(path)
+
+    return render
+
+
+async def _follow(follower: _AudioFollower, path: Path, available: int, **switch: bool) -> bytes:
+    await follower.switch(str(path), **switch)
+    return b"".join([chunk async for chunk in follower.read_until(available)])
+
+
+class TestAudioFollower:
+    def test_restart_replaying_the_same_audio_resumes(
+        self, tmp_path: Path, tts_cache: TTSCache, render: Render
+    ) -> None:
+        partial = tmp_path / "audio.wav.part"
+
+        async def scenario() -> bytes:
+            follower = _AudioFollower(64)
+            sent = await _follow(follower, partial, render(partial, [FIRST]))
+            # A retry rewrites the same path, so only the content tells the renders apart
+            return sent + await _follow(follower, partial, render(partial, [FIRST, SECOND]))
+
+        streamed = asyncio.run(scenario())
+        assert len(streamed) == WAV_HEADER_SIZE + len(FIRST) + len(SECOND)
+        assert streamed[WAV_HEADER_SIZE:] == FIRST + SECOND
+
+    def test_restart_with_different_audio_aborts(
+        self, tmp_path: Path, tts_cache: TTSCache, render: Render
+    ) -> None:
+        partial = tmp_path / "audio.wav.part"
+
+        async def scenario() -> None:
+            follower = _AudioFollower(64)
+            await _follow(follower, partial, render(partial, [FIRST]))
+            await _follow(follower, partial, render(partial, [OTHER, SECOND]))
+
+        with pytest.raises(AudioStreamError):
+            asyncio.run(scenario())
+
+    def test_restart_waits_until_the_sent_audio_is_rewritten(
+        self, tmp_path: Path, tts_cache: TTSCache, render: Render
+    ) -> None:
+        partial = tmp_path / "audio.wav.part"
+
+        async def scenario() -> bytes:
+            follower = _AudioFollower(64)
+            await _follow(follower, partial, render(partial, [FIRST, SECOND]))
+            resumed = await _follow(follower, partial, render(partial, [FIRST]))
+            assert follower.verify
+            return resumed
+
+        assert asyncio.run(scenario()) == b""
+
+    def test_restart_with_cache_disabled_aborts(
+        self, tmp_path: Path, tts_cache: TTSCache, render: Render
+    ) -> None:
+        tts_cache.enabled = False
+        partial = tmp_path / "audio.wav.part"
+
+        async def scenario() -> None:
+            follower = _AudioFollower(64)
+            await _follow(follower, partial, render(partial, [FIRST]))
+            # Same path, same inode and even the same audio: still a new render
+            await _follow(follower, partial, render(partial, [FIRST, SECOND]))
+
+        with pytest.raises(AudioStreamError):
+            asyncio.run(scenario())
+
+    def test_renamed_partial_file_is_not_checked(
+        self, tmp_path: Path, tts_cache: TTSCache, render: Render
+    ) -> None:
+        tts_cache.enabled = False
+        partial = tmp_path / "audio.wav.part"
+        output = tmp_path / "audio.wav"
+
+        async def scenario() -> bytes:
+            follower = _AudioFollower(64)
+            render(partial, [FIRST, SECOND])
+            sent = await _follow(follower, partial, WAV_HEADER_SIZE + len(FIRST))
+            os.replace(partial, output)
+            rest = await _follow(follower, output, os.path.getsize(output), renamed=True)
+            assert not follower.verify
+            return sent + rest
+
+        assert asyncio.run(scenario())[WAV_HEADER_SIZE:] == FIRST + SECOND
+
+
+class _Job:
+    def __init__(self, events: ProgressBus, output_path: Path):
+        self.job_id = "job"
+        self.events = events
+        self.status = JobStatus.RUNNING
+        self.output_path = str(output_path)
+
+
+def test_job_stream_aborts_on_an_uncached_retry(
+    tmp_path: Path, tts_cache: TTSCache, render: Render
+) -> None:
+    tts_cache.enabled = False
+    partial = tmp_path / "audio.wav.part"
+    output = tmp_path / "audio.wav"
+
+    async def settle() -> None:
+        for _ in range(20):
+            await asyncio.sleep(0.005)
+
+    async def scenario() -> List[bytes]:
+        bus = ProgressBus()
+        job = _Job(bus, output)
+        streamed: List[bytes] = []
+
+        async def consume() -> None:
+            async for chunk in iter_job_audio(job, chunk_size=64):  # type: ignore[arg-type]
+                streamed.append(chunk)
+
+        consumer = asyncio.ensure_future(consume())
+        bus.publish("audio_started", path=str(partial))
+        bus.publish("bytes_written", bytes=render(partial, [FIRST]))
+        await settle()
+        # The retry reuses the partial path, truncating it in place
+        bus.publish("audio_started", path=str(partial))
+        bus.publish("bytes_written", bytes=render(partial, [OTHER, SECOND]))
+        os.replace(partial, output)
+        job.status = JobStatus.COMPLETED
+        bus.close()
+        with pytest.raises(AudioStreamError):
+            await consumer
+        return streamed
+
+    streamed = b"".join(asyncio.run(scenario()))
+    assert streamed[WAV_HEADER_SIZE:] == FIRST
@@ -0,0 +1,128 @@
+"""
+🧪 Tests for transcript checkpoints and generation workspaces
+"""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+from convergence.ai import transcript_generator
+from convergence.ai.transcript_generator import iter_transcript_items
+from convergence.core.checkpoint import TranscriptCheckpoint, prune_workspaces, workspace_key
+from convergence.core.generator import ConversationGenerator
+from convergence.core.models import ConversationConfig, TranscriptItem
+
+
+def _config(**overrides: Any) -> ConversationConfig:
+    values = {"prompt": "Two friends discussing jazz", "duration": 2, "transcript_batch_size": 1}
+    values.update(overrides)
+    return ConversationConfig(**values)
+
+
+def _item(index: int) -> TranscriptItem:
+    return TranscriptItem(name="Alice", gender="female", role="Host", message=f"turn {index}")
+
+
+class TestTranscriptCheckpoint:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        checkpoint = TranscriptCheckpoint(tmp_path / "transcript.jsonl", _config())
+        checkpoint.start([_item(0)])
+        checkpoint.append(_item(1))
+        assert [item.message for item in checkpoint.load()] == ["turn 0", "turn 1"]
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        assert TranscriptCheckpoint(tmp_path / "none.jsonl", _config()).load() == []
+
+    def test_header_mismatch_is_ignored_and_overwritten(self, tmp_path: Path) -> None:
+        path = tmp_path / "transcript.jsonl"
+        TranscriptCheckpoint(path, _config()).start([_item(0), _item(1)])
+
+        other = TranscriptCheckpoint(path, _config(vibe="Somber"))
+        assert other.load() == []
+        other.start([])
+        assert json.loads(path.read_text().splitlines()[0])["vibe"] == "Somber"
+        assert TranscriptCheckpoint(path, _config()).load() == []
+
+    def test_truncated_last_line_keeps_earlier_items(self, tmp_path: Path) -> None:
+        path = tmp_path / "transcript.jsonl"
+        checkpoint = TranscriptCheckpoint(path, _config())
+        checkpoint.start([_item(0), _item(1)])
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(_item(2).model_dump_json()[:20])
+        assert [item.message for item in checkpoint.load()] == ["turn 0", "turn 1"]
+
+    def test_resume_skips_completed_turns(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        prompts: List[str] = []
+
+        async def create(messages: List[dict], **kwargs: Any) -> Any:
+            prompts.append(messages[-1]["content"])
+            content = json.dumps(
+                {"name": "Bob", "gender": "male", "role": "Guest", "message": "new"}
+            )
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+            )
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        monkeypatch.setattr(transcript_generator, "get_async_openai_client", lambda key: client)
+
+        checkpoint = TranscriptCheckpoint(tmp_path / "transcript.jsonl", _config())
+        checkpoint.start([_item(0), _item(1)])
+
+        async def collect() -> List[TranscriptItem]:
+            return [item async for item in iter_transcript_items(_config(), checkpoint=checkpoint)]
+
+        items = asyncio.run(collect())
+        # Two minutes is four turns: two restored, two generated
+        assert [item.message for item in items] == ["turn 0", "turn 1", "new", "new"]
+        assert len(prompts) == 2
+        assert "segment 3 of 4" in prompts[0]
+        assert len(checkpoint.load()) == 4
+
+
+class TestWorkspaces:
+    def test_workspace_does_not_depend_on_the_output_path(self, tmp_path: Path) -> None:
+        first = ConversationGenerator(_config(output_path=str(tmp_path / "a_001.wav")))
+        second = ConversationGenerator(_config(output_path=str(tmp_path / "a_002.wav")))
+        workspace = first._get_workspace_dir()
+        first._release_workspace()
+        assert second._get_workspace_dir() == workspace
+        assert workspace.name == workspace_key(_config())
+        second._release_workspace()
+
+    def test_different_settings_get_different_workspaces(self) -> None:
+        assert workspace_key(_config()) != workspace_key(_config(duration=3))
+        # Settings that do not shape the transcript share one
+        assert workspace_key(_config()) == workspace_key(_config(tts_concurrency=8))
+
+    def test_concurrent_identical_jobs_do_not_share(self, tmp_path: Path) -> None:
+        first = ConversationGenerator(_config(output_path=str(tmp_path / "a.wav")))
+        second = ConversationGenerator(_config(output_path=str(tmp_path / "b.wav")))
+        try:
+            assert first._get_workspace_dir() != second._get_workspace_dir()
+        finally:
+            first._release_workspace()
+            second._release_workspace()
+
+    def test_prune_removes_only_stale_workspaces(self, tmp_path: Path) -> None:
+        root = tmp_path / ".work"
+        stale, fresh, active = root / "stale", root / "fresh", root / "active"
+        legacy = tmp_path / "convergence_audio_1.wav.work"
+        for path in (stale, fresh, active, legacy):
+            path.mkdir(parents=True)
+            (path / "transcript.jsonl").write_text("{}\n")
+        old = time.time() - 3600
+        for path in (stale, active, legacy):
+            os.utime(path, (old, old))
+
+        assert prune_workspaces(root, 600, keep={active}) == 2
+        assert sorted(p.name for p in root.iterdir()) == ["active", "fresh"]
+        assert not legacy.exists()
@@ -0,0 +1,66 @@
+"""
+🧪 Tests for byte range parsing
+"""
+
+import pytest
+
+from convergence.api.file_response import parse_range
+
+SIZE = 1000
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=500-999", (500, 999)),
+        ("bytes=0-0", (0, 0)),
+        # An end past the file is clamped
+        ("bytes=900-5000", (900, 999)),
+        # Open-ended
+        ("bytes=500-", (500, 999)),
+        ("bytes=0-", (0, 999)),
+        # Suffix: the last N bytes
+        ("bytes=-100", (900, 999)),
+        ("bytes=-1", (999, 999)),
+        ("bytes=-5000", (0, 999)),
+        # Whitespace and unit case are tolerated
+        ("Bytes= 10 - 19", (10, 19)),
+    ],
+)
+def test_satisfiable_ranges(header: str, expected: tuple) -> None:
+    assert parse_range(header, SIZE) == expected
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        # Multiple ranges: the whole file is served instead
+        "bytes=0-99,200-299",
+        "bytes=-100, 0-10",
+        # Other units and malformed specs are ignored
+        "items=0-10",
+        "bytes=",
+        "bytes=-",
+        "bytes=10",
+        "bytes=a-b",
+        "bytes=-1-2",
+        # Last before first
+        "bytes=100-50",
+    ],
+)
+def test_ignored_ranges(header: str) -> None:
+    assert parse_range(header, SIZE) is None
+
+
+@pytest.mark.parametrize(
+    "header", ["bytes=1000-", "bytes=1000-1999", "bytes=5000-6000", "bytes=-0"]
+)
+def test_unsatisfiable_ranges(header: str) -> None:
+    with pytest.raises(ValueError):
+        parse_range(header, SIZE)
+
+
+def test_empty_file_cannot_satisfy_a_range() -> None:
+    with pytest.raises(ValueError):
+        parse_range("bytes=-10", 0)
@@ -0,0 +1,196 @@
+"""
+🧪 Tests for the generation job queue
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict
+
+import pytest
+
+from convergence.api.jobs import JobManager, JobQueueFullError, JobStatus
+from convergence.core.models import ConversationConfig
+
+
+class Gates:
+    """Holds each fake job until the test releases it"""
+
+    def __init__(self) -> None:
+        self.events: Dict[str, asyncio.Event] = {}
+        self.started = []
+
+    def __getitem__(self, job_id: str) -> asyncio.Event:
+        return self.events.setdefault(job_id, asyncio.Event())
+
+    def release(self, job_id: str) -> None:
+        self[job_id].set()
+
+
+@pytest.fixture
+def gates(monkeypatch: pytest.MonkeyPatch) -> Gates:
+    gates = Gates()
+
+    async def fake_run(self: JobManager, job) -> None:  # type: ignore[no-untyped-def]
+        job.status = JobStatus.RUNNING
+        gates.started.append(job.job_id)
+        await gates[job.job_id].wait()
+        self._finish(job)
+
+    monkeypatch.setattr(JobManager, "_run", fake_run)
+    for name in ("JOB_CAPACITY_MINUTES", "JOB_QUEUE_MINUTES", "JOB_RETENTION_SECONDS"):
+        monkeypatch.delenv(name, raising=False)
+    return gates
+
+
+def _config(duration: int = 1) -> ConversationConfig:
+    return ConversationConfig(prompt="p", duration=duration)
+
+
+def _run(scenario: Callable[[], Awaitable[None]]) -> None:
+    asyncio.run(scenario())
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_jobs_start_up_to_the_worker_count_then_queue(gates: Gates) -> None:
+    async def scenario() -> None:
+        manager = JobManager(workers=2, queue_size=4)
+        jobs = [manager.submit(_config()) for _ in range(4)]
+        await _settle()
+        assert gates.started == [jobs[0].job_id, jobs[1].job_id]
+        assert [job.status for job in jobs[2:]] == [JobStatus.QUEUED, JobStatus.QUEUED]
+
+        # Queued jobs start in submission order as workers free up
+        gates.release(jobs[1].job_id)
+        await manager.wait(jobs[1])
+        await _settle()
+        assert gates.started[-1] == jobs[2].job_id
+        assert jobs[3].status == JobStatus.QUEUED
+
+        for job in jobs:
+            gates.release(job.job_id)
+        for job in jobs:
+            await manager.wait(job)
+        await _settle()
+        assert all(job.status == JobStatus.COMPLETED for job in jobs)
+        assert manager.stats()["running"] == 0
+
+    _run(scenario)
+
+
+def test_full_queue_refuses_submissions(gates: Gates) -> None:
+    async def scenario() -> None:
+        manager = JobManager(workers=1, queue_size=1)
+        manager.submit(_config())
+        manager.submit(_config())
+        with pytest.raises(JobQueueFullError) as error:
+            manager.submit(_config())
+        assert error.value.retry_after >= 1
+        await manager.stop()
+
+    _run(scenario)
+
+
+def test_stop_fails_running_and_queued_jobs(gates: Gates) -> None:
+    async def scenario() -> None:
+        manager = JobManager(workers=1, queue_size=2)
+        running = manager.submit(_config())
+        queued = manager.submit(_config())
+        await _settle()
+        await manager.stop()
+        assert running.status == queued.status == JobStatus.FAILED
+        assert running.error == "Server shutting down"
+
+    _run(scenario)
+
+
+def test_finished_jobs_expire_after_retention(gates: Gates) -> None:
+    async def scenario() -> None:
+        manager = JobManager(workers=1, queue_size=1)
+        job = manager.submit(_config())
+        gates.release(job.job_id)
+        await manager.wait(job)
+        assert manager.get(job.job_id) is job
+
+        job.finished_at = datetime.now() - timedelta(seconds=manager.retention_seconds + 1)
+        manager.submit(_config())
+        assert manager.get(job.job_id) is None
+        await manager.stop()
+
+    _run(scenario)
+
+
+
+def test_capacity_minutes_limit_concurrent_jobs(
+    gates: Gates, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("JOB_CAPACITY_MINUTES", "30")
+
+    async def scenario() -> None:
+        manager = JobManager(workers=4, queue_size=4)
+        first = manager.submit(_config(20))
+        second = manager.submit(_config(20))
+        await _settle()
+        assert gates.started == [first.job_id]
+        assert second.status == JobStatus.QUEUED
+        assert manager.stats()["running_minutes"] == 20
+        assert manager.stats()["queued_minutes"] == 20
+
+        gates.release(first.job_id)
+        await manager.wait(first)
+        await _settle()
+        assert gates.started == [first.job_id, second.job_id]
+        await manager.stop()
+
+    _run(scenario)
+
+
+def test_oversized_job_runs_alone(gates: Gates, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("JOB_CAPACITY_MINUTES", "10")
+
+    async def scenario() -> None:
+        manager = JobManager(workers=4, queue_size=4)
+        big = manager.submit(_config(60))
+        small = manager.submit(_config(1))
+        await _settle()
+        assert gates.started == [big.job_id]
+        assert small.status == JobStatus.QUEUED
+        await manager.stop()
+
+    _run(scenario)
+
+
+def test_queued_minutes_are_bounded(gates: Gates, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("JOB_QUEUE_MINUTES", "30")
+
+    async def scenario() -> None:
+        manager = JobManager(workers=1, queue_size=10)
+        manager.submit(_config(5))
+        manager.submit(_config(20))
+        with pytest.raises(JobQueueFullError):
+            manager.submit(_config(20))
+        # A smaller job still fits in what is left
+        manager.submit(_config(10))
+        await manager.stop()
+
+    _run(scenario)
+
+
+def test_retry_after_grows_with_backlog_and_is_capped(gates: Gates) -> None:
+    async def scenario() -> None:
+        manager = JobManager(workers=1, queue_size=1)
+        empty = manager._estimate_retry_after(1)
+        manager.submit(_config(30))
+        manager.submit(_config(30))
+        with pytest.raises(JobQueueFullError) as error:
+            manager.submit(_config(30))
+        assert error.value.retry_after > empty >= 1
+
+        manager._seconds_per_minute = 1000.0
+        assert manager._estimate_retry_after(30) == 3600
+        await manager.stop()
+
+    _run(scenario)
@@ -0,0 +1,46 @@
+"""
+🧪 Tests for the API key Bloom filter
+"""
+
+import random
+
+import pytest
+
+from convergence.auth.key_filter import KeyFilter
+from convergence.auth.key_store import hash_api_key
+
+
+def _keys(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [hash_api_key(f"sk-convergence-{rng.getrandbits(64):016x}") for _ in range(count)]
+
+
+@pytest.mark.parametrize("count", [1, 10, 1000, 20000])
+@pytest.mark.parametrize("false_positive_rate", [0.001, 0.01, 0.2])
+def test_no_false_negatives(count: int, false_positive_rate: float) -> None:
+    keys = _keys(count, seed=count)
+    key_filter = KeyFilter(keys, false_positive_rate)
+    assert all(key_filter.might_contain(key) for key in keys)
+
+
+def test_false_positive_rate_is_near_target() -> None:
+    key_filter = KeyFilter(_keys(10000, seed=1), 0.01)
+    unknown = _keys(20000, seed=2)
+    rate = sum(key_filter.might_contain(key) for key in unknown) / len(unknown)
+    assert rate < 0.02
+
+
+def test_empty_filter_rejects_everything() -> None:
+    key_filter = KeyFilter([], 0.01)
+    assert key_filter.key_count == 0
+    assert not any(key_filter.might_contain(key) for key in _keys(100, seed=3))
+
+
+def test_size_follows_key_count_and_rate() -> None:
+    small = KeyFilter(_keys(1000, seed=4), 0.01)
+    large = KeyFilter(_keys(10000, seed=4), 0.01)
+    strict = KeyFilter(_keys(1000, seed=4), 0.0001)
+    # About 1.2 bytes per key at 1%
+    assert 1100 < small.size_bytes < 1300
+    assert large.size_bytes > 9 * small.size_bytes
+    assert strict.size_bytes > small.size_bytes
@@ -0,0 +1,102 @@
+"""
+🧪 Tests for API key stores and the key table
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+from convergence.auth import key_store
+from convergence.auth.google_sheets import GoogleSheetsClient
+from convergence.auth.key_store import (
+    KeyStore,
+    KeyTable,
+    SQLiteKeyStore,
+    hash_api_key,
+    sync_key_store,
+)
+from convergence.auth.models import APIKey
+
+
+def _key(api_key: str, **fields: object) -> APIKey:
+    return APIKey(api_key=api_key, client_name="Acme", created_at=datetime(2024, 1, 1), **fields)
+
+
+class FakeStore(KeyStore):
+    name = "fake"
+
+    def __init__(self, api_keys: Optional[List[APIKey]]):
+        self.api_keys = api_keys
+
+    def load_api_keys(self) -> Optional[List[APIKey]]:
+        return self.api_keys
+
+
+def test_sqlite_store_keeps_only_key_hashes(tmp_path: Path) -> None:
+    store = SQLiteKeyStore(str(tmp_path / "keys.sqlite3"))
+    expires = datetime(2030, 6, 1, 12, 0)
+    assert store.replace_all([_key("sk-a", expires_at=expires, rate_limit=5), _key("sk-b")]) == 2
+
+    loaded = {key.api_key: key for key in store.load_api_keys() or []}
+    assert set(loaded) == {hash_api_key("sk-a"), hash_api_key("sk-b")}
+    first = loaded[hash_api_key("sk-a")]
+    assert (first.expires_at, first.rate_limit, first.is_active) == (expires, 5, True)
+    assert b"sk-a" not in (tmp_path / "keys.sqlite3").read_bytes()
+
+
+def test_replace_all_drops_removed_keys(tmp_path: Path) -> None:
+    store = SQLiteKeyStore(str(tmp_path / "keys.sqlite3"))
+    store.replace_all([_key("sk-a"), _key("sk-b")])
+    store.replace_all([_key("sk-b", is_active=False)])
+    loaded = store.load_api_keys() or []
+    assert [(key.api_key, key.is_active) for key in loaded] == [(hash_api_key("sk-b"), False)]
+
+
+def test_sync_copies_the_source(tmp_path: Path) -> None:
+    target = SQLiteKeyStore(str(tmp_path / "keys.sqlite3"))
+    assert sync_key_store(FakeStore([_key("sk-a")]), target) == 1
+    # An unreadable source leaves the local copy alone
+    assert sync_key_store(FakeStore(None), target) is None
+    assert len(target.load_api_keys() or []) == 1
+
+
+def test_key_table_serves_a_hashed_store(tmp_path: Path) -> None:
+    store = SQLiteKeyStore(str(tmp_path / "keys.sqlite3"))
+    store.replace_all([_key("sk-a")])
+    table = KeyTable(store, hashed=True)
+    found = table.get(hash_api_key("sk-a"))
+    assert found is not None and found.client_name == "Acme"
+    assert table.get(hash_api_key("sk-b")) is None
+    assert table.size == 1
+
+
+def test_key_table_keeps_the_previous_index_when_a_refresh_fails() -> None:
+    store = FakeStore([_key("sk-a")])
+    table = KeyTable(store)
+    assert table.refresh(wait=True)
+    store.api_keys = None
+    assert not table.refresh(wait=True)
+    assert table.get(hash_api_key("sk-a")) is not None
+    assert table.might_exist(hash_api_key("sk-a"))
+
+
+def test_sheets_client_lookups_use_the_key_table(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("API_KEY_STORE", raising=False)
+    monkeypatch.setattr(key_store, "_key_table", None)
+    client = GoogleSheetsClient()
+    loads = []
+
+    def load_api_keys() -> List[APIKey]:
+        loads.append(1)
+        return [_key("sk-a"), _key("sk-off", is_active=False)]
+
+    monkeypatch.setattr(client, "load_api_keys", load_api_keys)
+    found = client.get_api_key("sk-a")
+    assert found is not None and found.client_name == "Acme"
+    assert client.validate_api_key("sk-a")
+    assert not client.validate_api_key("sk-off")
+    assert not client.validate_api_key("sk-b")
+    # One load serves every lookup
+    assert len(loads) == 1
@@ -0,0 +1,96 @@
+"""
+🧪 Tests for API key authentication middleware
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from convergence.auth import api_key, key_store, rate_limit
+from convergence.auth.key_store import SQLiteKeyStore
+from convergence.auth.middleware import APIKeyMiddleware
+from convergence.auth.models import APIKey
+from convergence.core import usage
+
+
+@pytest.fixture
+def client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    keys_path = tmp_path / "api_keys.sqlite3"
+    SQLiteKeyStore(str(keys_path)).replace_all(
+        [
+            APIKey(
+                api_key="sk-limited",
+                client_name="Acme",
+                created_at=datetime(2024, 1, 1),
+                rate_limit=2,
+            ),
+            APIKey(
+                api_key="sk-revoked",
+                client_name="Gone",
+                created_at=datetime(2024, 1, 1),
+                is_active=False,
+            ),
+        ]
+    )
+    monkeypatch.setenv("API_KEY_STORE", "sqlite")
+    monkeypatch.setenv("API_KEY_SQLITE_PATH", str(keys_path))
+    monkeypatch.setenv("RATE_LIMIT_STORE", "memory")
+    monkeypatch.setenv("USAGE_SINK", "none")
+    # Fresh singletons built from the settings above
+    monkeypatch.setattr(key_store, "_key_table", None)
+    monkeypatch.setattr(api_key, "_api_key_auth", None)
+    monkeypatch.setattr(rate_limit, "_rate_limiter", None)
+    monkeypatch.setattr(usage, "_usage_meter", None)
+
+    app = FastAPI()
+    app.add_middleware(APIKeyMiddleware)
+
+    @app.get("/health")
+    async def health() -> dict:
+        return {"status": "ok"}
+
+    @app.get("/convergence/whoami")
+    async def whoami(request: Request) -> dict:
+        return {"client_name": request.state.client_name}
+
+    return TestClient(app)
+
+
+def test_public_endpoints_need_no_key(client: TestClient) -> None:
+    assert client.get("/health").status_code == 200
+
+
+def test_missing_key_is_rejected(client: TestClient) -> None:
+    response = client.get("/convergence/whoami")
+    assert response.status_code == 401
+    assert response.json()["error"] == "Missing API key"
+
+
+@pytest.mark.parametrize("key", ["sk-unknown", "sk-revoked"])
+def test_invalid_key_is_rejected(client: TestClient, key: str) -> None:
+    response = client.get("/convergence/whoami", headers={"Authorization": f"Bearer {key}"})
+    assert response.status_code == 401
+    assert response.json()["error"] == "Invalid API key"
+
+
+def test_valid_key_passes_with_client_headers(client: TestClient) -> None:
+    response = client.get("/convergence/whoami", headers={"Authorization": "ApiKey sk-limited"})
+    assert response.status_code == 200
+    assert response.json() == {"client_name": "Acme"}
+    assert response.headers["X-Client-Name"] == "Acme"
+    assert response.headers["X-RateLimit-Limit"] == "2"
+    assert response.headers["X-RateLimit-Remaining"] == "1"
+
+
+def test_requests_over_the_limit_get_429(client: TestClient) -> None:
+    headers = {"Authorization": "Bearer sk-limited"}
+    for _ in range(2):
+        assert client.get("/convergence/whoami", headers=headers).status_code == 200
+    response = client.get("/convergence/whoami", headers=headers)
+    assert response.status_code == 429
+    assert response.json()["error"] == "Rate limit exceeded"
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.headers["X-RateLimit-Remaining"] == "0"
@@ -0,0 +1,115 @@
+"""
+🧪 Tests for outline URL fetching and its revalidating cache
+"""
+
+import asyncio
+from typing import Callable, List, Optional, Tuple
+
+import httpx
+import pytest
+
+from convergence.services import outline_cache
+from convergence.services.outline import OutlineProcessor
+from convergence.services.outline_cache import OutlineCache
+
+URL = "https://example.com/outline.md"
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+class Server:
+    """Scripted responses for the outline URL, recording the requests made"""
+
+    def __init__(self) -> None:
+        self.responses: List[Handler] = []
+        self.requests: List[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return self.responses.pop(0)(request)
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> OutlineCache:
+    # Every lookup is stale, so each fetch goes to the server
+    cache = OutlineCache(max_entries=8, fresh_seconds=0)
+    monkeypatch.setattr(outline_cache, "_outline_cache", cache)
+    return cache
+
+
+def _fetch(server: Server, count: int) -> List[Tuple[Optional[str], Optional[str]]]:
+    async def scenario() -> List[Tuple[Optional[str], Optional[str]]]:
+        processor = OutlineProcessor()
+        processor._async_client = httpx.AsyncClient(transport=httpx.MockTransport(server))
+        try:
+            return [await processor.aprocess_outline(URL) for _ in range(count)]
+        finally:
+            await processor.aclose()
+
+    return asyncio.run(scenario())
+
+
+def _ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, text="- intro\n- outro", headers={"ETag": '"v1"'})
+
+
+def _unreachable(request: httpx.Request) -> httpx.Response:
+    raise httpx.ConnectError("Connection refused", request=request)
+
+
+def test_unchanged_outline_is_revalidated(cache: OutlineCache) -> None:
+    server = Server()
+    server.responses = [
+        _ok,
+        lambda request: httpx.Response(304, headers={"ETag": '"v2"'}),
+        lambda request: httpx.Response(304),
+    ]
+    results = _fetch(server, 3)
+    assert results == [("• intro\n• outro", None)] * 3
+    assert server.requests[1].headers["If-None-Match"] == '"v1"'
+    # The validators sent with a 304 are used for the next revalidation
+    assert server.requests[2].headers["If-None-Match"] == '"v2"'
+    assert cache.stats()["revalidations"] == 2
+
+
+def test_revalidation_extends_freshness() -> None:
+    cache = OutlineCache(max_entries=8, fresh_seconds=60)
+    cache.put(URL, "outline", '"v1"', None)
+    cache._entries[URL] = cache._entries[URL]._replace(validated_at=0.0)
+    assert cache.lookup(URL)[1] is False
+    cache.revalidated(URL, '"v2"', "Mon, 01 Jan 2024 00:00:00 GMT")
+    entry, fresh = cache.lookup(URL)
+    assert fresh
+    assert entry is not None and entry.etag == '"v2"'
+    assert cache.conditional_headers(entry)["If-Modified-Since"].startswith("Mon")
+
+
+@pytest.mark.parametrize(
+    "failure",
+    [lambda request: httpx.Response(503), _unreachable],
+    ids=["server-error", "unreachable"],
+)
+def test_stale_outline_is_served_when_the_server_fails(
+    cache: OutlineCache, failure: Handler
+) -> None:
+    server = Server()
+    server.responses = [_ok, failure]
+    assert _fetch(server, 2)[1] == ("• intro\n• outro", None)
+
+
+@pytest.mark.parametrize("status_code", [404, 410])
+def test_deleted_outline_is_evicted(cache: OutlineCache, status_code: int) -> None:
+    server = Server()
+    server.responses = [_ok, lambda request: httpx.Response(status_code), _ok]
+    results = _fetch(server, 3)
+    content, error = results[1]
+    assert content is None and error is not None
+    assert "If-None-Match" not in server.requests[2].headers
+    assert results[2] == ("• intro\n• outro", None)
+
+
+def test_client_errors_are_not_hidden_by_the_cache(cache: OutlineCache) -> None:
+    server = Server()
+    server.responses = [_ok, lambda request: httpx.Response(403)]
+    content, error = _fetch(server, 2)[1]
+    assert content is None and error is not None
@@ -0,0 +1,102 @@
+"""
+🧪 Tests for progress events and their Server-Sent Events stream
+"""
+
+import asyncio
+import threading
+from typing import List
+
+import pytest
+
+from convergence.api import routes
+from convergence.core.progress import ProgressBus, emit_progress, progress_scope
+
+
+async def _collect(bus: ProgressBus) -> List[str]:
+    return [event.event async for event in bus.subscribe()]
+
+
+def test_late_subscribers_replay_the_history() -> None:
+    async def scenario() -> None:
+        bus = ProgressBus()
+        bus.publish("phase", phase="transcript")
+        bus.publish("transcript_segment", index=1, total=2)
+        bus.close()
+        events = [event async for event in bus.subscribe()]
+        assert [event.event for event in events] == ["phase", "transcript_segment"]
+        assert [event.seq for event in events] == [1, 2]
+        assert events[1].data == {"index": 1, "total": 2}
+
+    asyncio.run(scenario())
+
+
+def test_subscribers_receive_live_events_until_closed() -> None:
+    async def scenario() -> None:
+        bus = ProgressBus()
+        bus.publish("phase", phase="audio")
+        subscriber = asyncio.ensure_future(_collect(bus))
+        await asyncio.sleep(0)
+        bus.publish("audio_segment", index=1, total=1)
+        # Events from worker threads reach subscribers on the bus's loop
+        thread = threading.Thread(target=bus.publish, args=("bytes_written",))
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0)
+        bus.close()
+        bus.publish("ignored")
+        assert await subscriber == ["phase", "audio_segment", "bytes_written"]
+
+    asyncio.run(scenario())
+
+
+def test_history_is_bounded() -> None:
+    async def scenario() -> None:
+        bus = ProgressBus(history_size=2)
+        for index in range(5):
+            bus.publish("audio_segment", index=index)
+        bus.close()
+        assert [event.seq async for event in bus.subscribe()] == [4, 5]
+
+    asyncio.run(scenario())
+
+
+def test_emit_progress_targets_the_scoped_bus() -> None:
+    async def scenario() -> None:
+        bus = ProgressBus()
+        emit_progress("outside")
+        with progress_scope(bus):
+            emit_progress("phase", phase="saving")
+        bus.close()
+        assert await _collect(bus) == ["phase"]
+
+    asyncio.run(scenario())
+
+
+class _Job:
+    def __init__(self, events: ProgressBus):
+        self.events = events
+
+
+class _Manager:
+    def __init__(self, job: _Job):
+        self.job = job
+
+    def get(self, job_id: str) -> _Job:
+        return self.job
+
+
+@pytest.mark.parametrize("last_event_id, expected", [(None, ["1", "2", "3"]), (2, ["3"])])
+def test_event_stream_skips_events_before_last_event_id(
+    monkeypatch: pytest.MonkeyPatch, last_event_id: object, expected: List[str]
+) -> None:
+    async def scenario() -> List[str]:
+        bus = ProgressBus()
+        for index in range(3):
+            bus.publish("audio_segment", index=index, total=3)
+        bus.close()
+        monkeypatch.setattr(routes, "get_job_manager", lambda: _Manager(_Job(bus)))
+        response = await routes.stream_job_events("job", last_event_id=last_event_id)
+        body = "".join([chunk async for chunk in response.body_iterator])
+        return [line[len("id: "):] for line in body.splitlines() if line.startswith("id: ")]
+
+    assert asyncio.run(scenario()) == expected
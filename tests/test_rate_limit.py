@@ -0,0 +1,104 @@
+"""
+🧪 Tests for the sliding-window rate limiter
+"""
+
+from typing import Tuple
+
+from convergence.auth.rate_limit import MemoryRateLimitStore, RateLimitResult, _sliding_window
+
+WINDOW = 60
+LIMIT = 10
+
+
+def _hits(
+    state: Tuple[int, int, int], count: int, now: float
+) -> Tuple[Tuple[int, int, int], RateLimitResult]:
+    result = None
+    for _ in range(count):
+        state, result = _sliding_window(state, LIMIT, WINDOW, now)
+    assert result is not None
+    return state, result
+
+
+def test_first_hit_starts_a_window() -> None:
+    state, result = _sliding_window((0, 0, 0), LIMIT, WINDOW, 125.0)
+    assert state == (120, 1, 0)
+    assert result == RateLimitResult(True, LIMIT, LIMIT - 1, 55, 0)
+
+
+def test_limit_within_one_window() -> None:
+    state, result = _hits((0, 0, 0), LIMIT, 120.0)
+    assert result.allowed and result.remaining == 0
+
+    state, result = _sliding_window(state, LIMIT, WINDOW, 130.0)
+    assert not result.allowed
+    assert state == (120, LIMIT, 0)
+    # After the reset at 180 the full window still counts until a tenth of it has slid out
+    assert result.reset_seconds == 50
+    assert result.retry_after == 56
+
+    _, result = _sliding_window(state, LIMIT, WINDOW, 185.0)
+    assert not result.allowed
+    _, result = _sliding_window(state, LIMIT, WINDOW, 186.0)
+    assert result.allowed
+
+
+def test_limit_of_one_waits_a_full_window_past_the_reset() -> None:
+    state, _ = _sliding_window((0, 0, 0), 1, WINDOW, 120.0)
+    state, result = _sliding_window(state, 1, WINDOW, 130.0)
+    assert not result.allowed
+    assert result.retry_after == result.reset_seconds + WINDOW == 110
+
+    _, result = _sliding_window(state, 1, WINDOW, 239.0)
+    assert not result.allowed
+    _, result = _sliding_window(state, 1, WINDOW, 240.0)
+    assert result.allowed
+
+
+def test_rollover_weights_the_previous_window() -> None:
+    state, _ = _hits((0, 0, 0), LIMIT, 120.0)
+
+    # A quarter into the next window, 7.5 of the previous 10 hits still count
+    state, result = _sliding_window(state, LIMIT, WINDOW, 195.0)
+    assert state == (180, 1, LIMIT)
+    assert result.allowed and result.remaining == 1
+    assert result.reset_seconds == 45
+
+    state, result = _sliding_window(state, LIMIT, WINDOW, 195.0)
+    assert result.allowed and result.remaining == 0
+
+    state, result = _sliding_window(state, LIMIT, WINDOW, 195.0)
+    assert not result.allowed
+    # At 30% into the window the estimate drops to 7 + 2 hits, leaving room for one more
+    assert result.retry_after == 3
+
+    _, result = _sliding_window(state, LIMIT, WINDOW, 195.0 + result.retry_after)
+    assert result.allowed
+
+
+def test_rollover_past_an_idle_window_forgets_old_hits() -> None:
+    state, _ = _hits((0, 0, 0), LIMIT, 120.0)
+    state, result = _sliding_window(state, LIMIT, WINDOW, 245.0)
+    assert state == (240, 1, 0)
+    assert result.remaining == LIMIT - 1
+
+
+def test_retry_after_at_the_end_of_a_window() -> None:
+    state, _ = _hits((0, 0, 0), LIMIT, 120.0)
+    # Just before the end of the next window only a sliver of the previous one counts
+    state, result = _hits(state, LIMIT, 239.0)
+    assert not result.allowed
+    assert state == (180, LIMIT - 1, LIMIT)
+    # At the reset the 9 hits become the previous window, leaving room for one more
+    assert result.retry_after == result.reset_seconds == 1
+
+    _, result = _sliding_window(state, LIMIT, WINDOW, 239.0 + result.retry_after)
+    assert result.allowed
+
+
+def test_memory_store_keeps_keys_apart() -> None:
+    store = MemoryRateLimitStore()
+    for _ in range(3):
+        assert store.hit("a", 3, WINDOW).allowed
+    assert not store.hit("a", 3, WINDOW).allowed
+    assert store.hit("b", 3, WINDOW).allowed
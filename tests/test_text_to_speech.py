@@ -0,0 +1,201 @@
+"""
+🧪 Tests for text-to-speech rendering
+"""
+
+import asyncio
+import io
+import random
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple
+
+import pytest
+
+from convergence.ai import text_to_speech
+from convergence.ai.text_to_speech import (
+    iter_items_audio,
+    text_to_audio_async,
+    write_audio_segments,
+)
+from convergence.ai.tts_cache import TTSCache
+from convergence.core.models import TranscriptItem
+from convergence.utils.wav import WAV_HEADER_SIZE, parse_wav
+
+
+class FakeSpeechResponse:
+    def __init__(self, chunks: List[bytes]):
+        self.chunks = chunks
+
+    async def aiter_bytes(self) -> AsyncIterator[bytes]:
+        async def chunks() -> AsyncIterator[bytes]:
+            for chunk in self.chunks:
+                yield chunk
+
+        return chunks()
+
+
+class FakeAsyncOpenAI:
+    """Stands in for the pooled AsyncOpenAI client's speech endpoint"""
+
+    def __init__(self, error: Optional[Exception] = None):
+        self.error = error
+        self.requests: List[dict] = []
+        self.audio = SimpleNamespace(speech=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs: Any) -> FakeSpeechResponse:
+        self.requests.append(kwargs)
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        return FakeSpeechResponse([b"RIFF", b"-audio-", kwargs["input"].encode()])
+
+
+@pytest.fixture
+def tts_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> TTSCache:
+    monkeypatch.setenv("TTS_CACHE_ENABLED", "true")
+    cache = TTSCache(cache_dir=str(tmp_path))
+    monkeypatch.setattr(text_to_speech, "get_tts_cache", lambda: cache)
+    return cache
+
+
+def _use_client(monkeypatch: pytest.MonkeyPatch, client: FakeAsyncOpenAI) -> None:
+    monkeypatch.setattr(text_to_speech, "get_async_openai_client", lambda key: client)
+
+
+def test_renders_with_the_async_client(
+    monkeypatch: pytest.MonkeyPatch, tts_cache: TTSCache
+) -> None:
+    client = FakeAsyncOpenAI()
+    _use_client(monkeypatch, client)
+    audio, error = asyncio.run(text_to_audio_async("hello", "sk-test", "nova"))
+    assert error is None
+    assert audio == b"RIFF-audio-hello"
+    assert client.requests[0]["voice"] == "nova"
+    assert client.requests[0]["response_format"] == "wav"
+
+
+def test_second_render_is_served_from_the_cache(
+    monkeypatch: pytest.MonkeyPatch, tts_cache: TTSCache
+) -> None:
+    client = FakeAsyncOpenAI()
+    _use_client(monkeypatch, client)
+    first = asyncio.run(text_to_audio_async("hello", "sk-test", "nova"))
+    second = asyncio.run(text_to_audio_async("hello", "sk-test", "nova"))
+    assert first == second
+    assert len(client.requests) == 1
+    # A different voice is different audio
+    asyncio.run(text_to_audio_async("hello", "sk-test", "onyx"))
+    assert len(client.requests) == 2
+
+
+def test_errors_are_returned_not_raised(
+    monkeypatch: pytest.MonkeyPatch, tts_cache: TTSCache
+) -> None:
+    _use_client(monkeypatch, FakeAsyncOpenAI(error=RuntimeError("rate limited")))
+    audio, error = asyncio.run(text_to_audio_async("hello", "sk-test", "nova"))
+    assert audio is None
+    assert error == "rate limited"
+    assert tts_cache.stats()["entries"] == 0
+
+
+def _item(index: int) -> TranscriptItem:
+    return TranscriptItem(
+        timestamp="2025-07-07T09:00:00",
+        name="Alice" if index % 2 else "Bob",
+        gender="female" if index % 2 else "male",
+        role="Speaker",
+        message=f"message {index}",
+    )
+
+
+async def _items(count: int) -> AsyncIterator[TranscriptItem]:
+    for index in range(count):
+        yield _item(index)
+
+
+class FakeTTS:
+    """Stands in for text_to_audio_async: random latency, tracks concurrency"""
+
+    def __init__(self, make_wav: Callable[..., bytes], fail_on: Optional[str] = None):
+        self.make_wav = make_wav
+        self.fail_on = fail_on
+        self.active = 0
+        self.max_active = 0
+        self.voices: List[Tuple[str, str]] = []
+        self.rng = random.Random(0)
+
+    async def __call__(
+        self, message: str, openai_api_key: str, voice_id: str, **kwargs: str
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        self.voices.append((message, voice_id))
+        try:
+            await asyncio.sleep(self.rng.uniform(0, 0.01))
+            if message == self.fail_on:
+                return None, "TTS failed"
+            index = int(message.split()[-1])
+            return self.make_wav(bytes([index, index])), None
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def fake_tts(monkeypatch: pytest.MonkeyPatch, make_wav: Callable[..., bytes]) -> FakeTTS:
+    fake = FakeTTS(make_wav)
+    monkeypatch.setattr(text_to_speech, "text_to_audio_async", fake)
+    return fake
+
+
+async def _collect(count: int, concurrency: int) -> List[bytes]:
+    return [
+        segment
+        async for segment in iter_items_audio(_items(count), "sk-test", max_concurrency=concurrency)
+    ]
+
+
+def test_segments_come_back_in_transcript_order(fake_tts: FakeTTS) -> None:
+    segments = asyncio.run(_collect(20, 4))
+    payloads = [bytes(parse_wav(segment)[1]) for segment in segments]
+    assert payloads == [bytes([i, i]) for i in range(20)]
+    assert 1 < fake_tts.max_active <= 4
+
+
+def test_concurrency_of_one_is_sequential(fake_tts: FakeTTS) -> None:
+    asyncio.run(_collect(5, 1))
+    assert fake_tts.max_active == 1
+
+
+def test_each_speaker_keeps_one_voice(fake_tts: FakeTTS) -> None:
+    asyncio.run(_collect(10, 4))
+    voices = {}
+    for message, voice_id in fake_tts.voices:
+        speaker = "Alice" if int(message.split()[-1]) % 2 else "Bob"
+        assert voices.setdefault(speaker, voice_id) == voice_id
+    assert len(voices) == 2
+
+
+def test_failed_segment_raises(fake_tts: FakeTTS) -> None:
+    fake_tts.fail_on = "message 3"
+    with pytest.raises(RuntimeError, match="TTS failed"):
+        asyncio.run(_collect(10, 3))
+
+
+def test_write_audio_segments_builds_one_wav(fake_tts: FakeTTS) -> None:
+    stream = io.BytesIO()
+    bytes_written, error = asyncio.run(
+        write_audio_segments(iter_items_audio(_items(6), "sk-test", max_concurrency=3), stream)
+    )
+    assert error is None
+    assert bytes_written == len(stream.getvalue()) == WAV_HEADER_SIZE + 12
+    _, payload = parse_wav(stream.getvalue())
+    assert bytes(payload) == b"".join(bytes([i, i]) for i in range(6))
+
+
+def test_write_audio_segments_reports_errors(fake_tts: FakeTTS) -> None:
+    fake_tts.fail_on = "message 2"
+    bytes_written, error = asyncio.run(
+        write_audio_segments(iter_items_audio(_items(4), "sk-test"), io.BytesIO())
+    )
+    assert bytes_written is None
+    assert error == "TTS failed"
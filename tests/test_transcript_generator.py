@@ -0,0 +1,133 @@
+"""
+🧪 Tests for block-wise transcript generation
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+from convergence.ai import transcript_generator
+from convergence.ai.transcript_generator import _parse_segment_block, iter_transcript_items
+from convergence.core.models import ConversationConfig, TranscriptItem
+
+
+def _raw_item(index: int) -> dict:
+    return {"name": "Alice", "gender": "female", "role": "Host", "message": f"turn {index}"}
+
+
+class TestParseSegmentBlock:
+    def test_items_object(self) -> None:
+        content = json.dumps({"items": [_raw_item(0), _raw_item(1)]})
+        items = _parse_segment_block(content, 2)
+        assert [item.message for item in items] == ["turn 0", "turn 1"]
+
+    def test_bare_list(self) -> None:
+        items = _parse_segment_block(json.dumps([_raw_item(0), _raw_item(1)]), 2)
+        assert len(items) == 2
+
+    def test_single_object(self) -> None:
+        items = _parse_segment_block(json.dumps(_raw_item(7)), 1)
+        assert [item.message for item in items] == ["turn 7"]
+
+    def test_extra_items_are_dropped(self) -> None:
+        content = json.dumps({"items": [_raw_item(i) for i in range(4)]})
+        assert len(_parse_segment_block(content, 3)) == 3
+
+    def test_too_few_items(self) -> None:
+        with pytest.raises(ValueError, match="Expected 3 transcript items, got 2"):
+            _parse_segment_block(json.dumps({"items": [_raw_item(0), _raw_item(1)]}), 3)
+
+    def test_single_object_for_a_block(self) -> None:
+        with pytest.raises(ValueError):
+            _parse_segment_block(json.dumps(_raw_item(0)), 2)
+
+    @pytest.mark.parametrize("content", ["not json", "{}", json.dumps({"items": [{"name": 1}]})])
+    def test_invalid_content(self, content: str) -> None:
+        with pytest.raises(ValueError):
+            _parse_segment_block(content, 1)
+
+
+class FakeChat:
+    """Scripted chat completions: each reply is a function of the requested block size"""
+
+    def __init__(self, replies: List[Any]):
+        self.replies = replies
+        self.block_sizes: List[int] = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, messages: List[dict], **kwargs: Any) -> Any:
+        prompt = messages[-1]["content"]
+        block_size = 1
+        if "array of exactly" in prompt:
+            block_size = int(prompt.split("array of exactly ")[1].split()[0])
+        self.block_sizes.append(block_size)
+        reply = self.replies.pop(0) if self.replies else None
+        if isinstance(reply, Exception):
+            raise reply
+        if reply is None:
+            reply = {"items": [_raw_item(i) for i in range(block_size)]}
+        content = reply if isinstance(reply, str) else json.dumps(reply)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+async def _no_sleep(seconds: float) -> None:
+    return None
+
+
+def _generate(
+    monkeypatch: pytest.MonkeyPatch, fake: FakeChat, batch_size: int, retries: int = 3
+) -> List[TranscriptItem]:
+    monkeypatch.setattr(transcript_generator, "get_async_openai_client", lambda key: fake)
+    monkeypatch.setattr(transcript_generator.asyncio, "sleep", _no_sleep)
+    # Two minutes: four turns
+    config = ConversationConfig(
+        prompt="p", duration=2, transcript_batch_size=batch_size, segment_retries=retries
+    )
+
+    async def collect() -> List[TranscriptItem]:
+        return [item async for item in iter_transcript_items(config)]
+
+    return asyncio.run(collect())
+
+
+def test_unparseable_block_falls_back_to_half_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = FakeChat([{"items": [_raw_item(0)]}])
+    items = _generate(monkeypatch, fake, batch_size=4)
+    assert len(items) == 4
+    assert fake.block_sizes == [4, 2, 2]
+
+
+def test_malformed_single_turn_is_retried(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = FakeChat(["not json", _raw_item(0)])
+    fake.replies += [_raw_item(i) for i in range(1, 4)]
+    items = _generate(monkeypatch, fake, batch_size=1)
+    assert [item.message for item in items] == [f"turn {i}" for i in range(4)]
+    assert fake.block_sizes == [1] * 5
+
+
+def test_retries_are_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = FakeChat(["not json", RuntimeError("upstream down"), "{}"])
+    with pytest.raises(RuntimeError):
+        _generate(monkeypatch, fake, batch_size=1, retries=3)
+    assert len(fake.block_sizes) == 3
+
+
+def test_batch_size_defaults_from_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("TRANSCRIPT_BATCH_SIZE", "5")
+    assert ConversationConfig(prompt="p").transcript_batch_size == 5
+    monkeypatch.setenv("TRANSCRIPT_BATCH_SIZE", "50")
+    with pytest.raises(ValueError):
+        ConversationConfig(prompt="p")
+
+
+def test_batch_size_is_accepted_by_the_api(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("TRANSCRIPT_BATCH_SIZE", raising=False)
+    from convergence.api.routes import GenerateAudioRequest, _build_config
+
+    request = GenerateAudioRequest(prompt="p", transcript_batch_size=6)
+    assert _build_config(request).transcript_batch_size == 6
+    assert _build_config(GenerateAudioRequest(prompt="p")).transcript_batch_size == 1
@@ -0,0 +1,114 @@
+"""
+🧪 Tests for per-key usage metering
+"""
+
+import asyncio
+import json
+import sqlite3
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from convergence.core import usage
+from convergence.core.usage import (
+    JSONLUsageSink,
+    SQLiteUsageSink,
+    UsageKey,
+    UsageMeter,
+    UsageRecord,
+    UsageSink,
+    record_usage,
+    usage_scope,
+)
+
+
+class MemorySink(UsageSink):
+    def __init__(self) -> None:
+        self.batches: List[List[UsageRecord]] = []
+        self.fail = False
+
+    def write(self, records: List[UsageRecord]) -> None:
+        if self.fail:
+            raise OSError("disk full")
+        self.batches.append(records)
+
+
+def test_flush_aggregates_per_key() -> None:
+    sink = MemorySink()
+    meter = UsageMeter(sink)
+    meter.record("a", "Acme", requests=1)
+    meter.record("a", "Acme", minutes=1.5, tts_characters=100)
+    meter.record("b", "Beta", requests=2)
+
+    assert meter.flush() == 2
+    records = {record.key_hash: record for record in sink.batches[0]}
+    assert records["a"].requests == 1
+    assert records["a"].minutes == 1.5
+    assert records["a"].tts_characters == 100
+    assert records["b"].requests == 2
+    # Nothing new to write
+    assert meter.flush() == 0
+
+
+def test_failed_flush_is_merged_back() -> None:
+    sink = MemorySink()
+    meter = UsageMeter(sink)
+    meter.record("a", "Acme", requests=1)
+    sink.fail = True
+    assert meter.flush() == 0
+    assert meter.stats()["failed_flushes"] == 1
+
+    meter.record("a", "Acme", requests=2)
+    sink.fail = False
+    assert meter.flush() == 1
+    (record,) = sink.batches[0]
+    assert record.requests == 3
+    # The retried batch keeps the period it started in
+    assert record.period_start < record.period_end
+
+
+def test_stop_writes_what_is_left() -> None:
+    sink = MemorySink()
+    meter = UsageMeter(sink)
+
+    async def scenario() -> None:
+        meter.start()
+        meter.record("a", "Acme", requests=1)
+        await meter.stop()
+
+    asyncio.run(scenario())
+    assert [record.requests for record in sink.batches[0]] == [1]
+
+
+def test_sqlite_sink_adds_to_daily_totals(tmp_path: Path) -> None:
+    path = tmp_path / "usage.sqlite3"
+    meter = UsageMeter(SQLiteUsageSink(str(path)))
+    for _ in range(2):
+        meter.record("a", "Acme", requests=1, minutes=0.5)
+        meter.flush()
+
+    rows = sqlite3.connect(str(path)).execute("SELECT key_hash, requests, minutes FROM usage")
+    assert rows.fetchall() == [("a", 2, 1.0)]
+
+
+def test_jsonl_sink_appends_records(tmp_path: Path) -> None:
+    path = tmp_path / "usage.jsonl"
+    meter = UsageMeter(JSONLUsageSink(str(path)))
+    meter.record("a", "Acme", requests=1)
+    meter.flush()
+    meter.record("a", "Acme", requests=4)
+    meter.flush()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["requests"] for line in lines] == [1, 4]
+
+
+def test_record_usage_bills_the_scoped_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    sink = MemorySink()
+    monkeypatch.setattr(usage, "_usage_meter", UsageMeter(sink))
+    record_usage(requests=1)
+    with usage_scope(UsageKey("a", "Acme")):
+        record_usage(requests=1, minutes=2.0)
+    usage.get_usage_meter().flush()
+    assert [(record.key_hash, record.minutes) for record in sink.batches[0]] == [("a", 2.0)]
@@ -0,0 +1,146 @@
+"""
+🧪 Tests for WAV parsing and streaming assembly
+"""
+
+import io
+import struct
+from typing import Callable
+
+import pytest
+
+from convergence.utils.wav import (
+    STREAMING_CHUNK_SIZE,
+    WAV_HEADER_SIZE,
+    StreamingWavWriter,
+    WavFormat,
+    WavFormatError,
+    build_streaming_wav_header,
+    build_wav_header,
+    parse_wav,
+)
+
+PCM_16_MONO = WavFormat(1, 1, 24000, 16)
+
+
+class TestParseWav:
+    def test_canonical_layout(self, make_wav: Callable[..., bytes]) -> None:
+        wav_format, payload = parse_wav(make_wav(b"\x01\x02" * 8))
+        assert wav_format == PCM_16_MONO
+        assert bytes(payload) == b"\x01\x02" * 8
+
+    def test_skips_chunks_before_fmt_and_data(self, make_wav: Callable[..., bytes]) -> None:
+        data = make_wav(
+            b"\x05\x06" * 4,
+            before_fmt=[(b"JUNK", b"\0" * 28)],
+            before_data=[(b"LIST", b"INFOISFT\x05\0\0\0Lavf\0"), (b"fact", b"\x08\0\0\0")],
+        )
+        wav_format, payload = parse_wav(data)
+        assert wav_format == PCM_16_MONO
+        assert bytes(payload) == b"\x05\x06" * 4
+
+    def test_odd_sized_chunk_is_padded(self, make_wav: Callable[..., bytes]) -> None:
+        data = make_wav(b"\x07\x08" * 2, before_data=[(b"LIST", b"abc")])
+        _, payload = parse_wav(data)
+        assert bytes(payload) == b"\x07\x08" * 2
+
+    def test_extended_fmt_chunk(self, make_wav: Callable[..., bytes]) -> None:
+        # WAVEFORMATEX: an 18-byte fmt chunk with a cbSize of 0
+        data = make_wav(b"\0\0" * 4, sample_rate=44100, channels=2, fmt_extra=b"\0\0")
+        wav_format, payload = parse_wav(data)
+        assert wav_format == WavFormat(1, 2, 44100, 16)
+        assert len(payload) == 8
+
+    def test_streaming_data_size_is_clamped(self, make_wav: Callable[..., bytes]) -> None:
+        data = make_wav(b"\x09\x0a" * 6, data_size=STREAMING_CHUNK_SIZE)
+        _, payload = parse_wav(data)
+        assert bytes(payload) == b"\x09\x0a" * 6
+
+    def test_payload_is_a_view(self, make_wav: Callable[..., bytes]) -> None:
+        data = bytearray(make_wav(b"\0\0"))
+        _, payload = parse_wav(data)
+        data[-1] = 0xFF
+        assert payload[-1] == 0xFF
+
+    def test_rejects_non_wav(self) -> None:
+        with pytest.raises(WavFormatError):
+            parse_wav(b"ID3\x04" + b"\0" * 40)
+
+    def test_rejects_data_before_fmt(self) -> None:
+        body = b"WAVE" + b"data" + struct.pack("<I", 2) + b"\0\0"
+        with pytest.raises(WavFormatError):
+            parse_wav(b"RIFF" + struct.pack("<I", len(body)) + body)
+
+    def test_rejects_missing_data_chunk(self, make_wav: Callable[..., bytes]) -> None:
+        data = make_wav(b"")
+        with pytest.raises(WavFormatError):
+            parse_wav(data[: data.index(b"data")])
+
+    def test_rejects_truncated_fmt_chunk(self) -> None:
+        body = b"WAVE" + b"fmt " + struct.pack("<I", 16) + b"\x01\0\x01\0"
+        with pytest.raises(WavFormatError):
+            parse_wav(b"RIFF" + struct.pack("<I", len(body)) + body)
+
+    def test_header_round_trips(self) -> None:
+        header = build_wav_header(PCM_16_MONO, 100)
+        assert len(header) == WAV_HEADER_SIZE
+        wav_format, payload = parse_wav(header + b"\0" * 100)
+        assert wav_format == PCM_16_MONO
+        assert len(payload) == 100
+
+
+class TestStreamingHeader:
+    def test_lengths_are_open_ended(self) -> None:
+        header = build_streaming_wav_header(PCM_16_MONO)
+        assert len(header) == WAV_HEADER_SIZE
+        riff_size = struct.unpack_from("<I", header, 4)[0]
+        data_size = struct.unpack_from("<I", header, WAV_HEADER_SIZE - 4)[0]
+        assert riff_size == data_size == STREAMING_CHUNK_SIZE == 0xFFFFFFFF
+
+    def test_parses_with_partial_payload(self) -> None:
+        header = build_streaming_wav_header(PCM_16_MONO)
+        wav_format, payload = parse_wav(header + b"\x01\x02" * 3)
+        assert wav_format == PCM_16_MONO
+        assert bytes(payload) == b"\x01\x02" * 3
+
+
+class TestStreamingWavWriter:
+    def test_concatenates_payloads_and_patches_sizes(self, make_wav: Callable[..., bytes]) -> None:
+        stream = io.BytesIO()
+        with StreamingWavWriter(stream) as writer:
+            writer.write_segment(make_wav(b"\x01\x01" * 10))
+            writer.write_segment(make_wav(b"\x02\x02" * 5, before_data=[(b"LIST", b"abc")]))
+            writer.write_segment(b"")
+
+        data = stream.getvalue()
+        assert writer.bytes_written == len(data) == WAV_HEADER_SIZE + 30
+        wav_format, payload = parse_wav(data)
+        assert wav_format == PCM_16_MONO
+        assert bytes(payload) == b"\x01\x01" * 10 + b"\x02\x02" * 5
+        assert struct.unpack_from("<I", data, 4)[0] == len(data) - 8
+
+    def test_header_is_written_at_the_stream_offset(self, make_wav: Callable[..., bytes]) -> None:
+        stream = io.BytesIO()
+        stream.write(b"prefix")
+        with StreamingWavWriter(stream) as writer:
+            writer.write_segment(make_wav(b"\0\0" * 3))
+        _, payload = parse_wav(stream.getvalue()[6:])
+        assert len(payload) == 6
+
+    def test_rejects_mismatched_formats(self, make_wav: Callable[..., bytes]) -> None:
+        writer = StreamingWavWriter(io.BytesIO())
+        writer.write_segment(make_wav(b"\0\0"))
+        with pytest.raises(WavFormatError):
+            writer.write_segment(make_wav(b"\0\0", sample_rate=44100))
+
+    def test_rejects_mixing_wav_and_raw(self, make_wav: Callable[..., bytes]) -> None:
+        writer = StreamingWavWriter(io.BytesIO())
+        writer.write_segment(make_wav(b"\0\0"))
+        with pytest.raises(WavFormatError):
+            writer.write_segment(b"\xff\xfb\x90\x00")
+
+    def test_raw_segments_pass_through(self) -> None:
+        stream = io.BytesIO()
+        with StreamingWavWriter(stream) as writer:
+            writer.write_segment(b"\xff\xfb")
+            writer.write_segment(b"\x90\x00")
+        assert stream.getvalue() == b"\xff\xfb\x90\x00"